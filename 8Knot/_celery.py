@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from dash import CeleryManager
 import os
 
@@ -17,4 +18,87 @@ celery_app = Celery(
 
 celery_app.conf.update(task_time_limit=84600, task_acks_late=True, task_track_started=True)
 
+"""QUERY QUEUES"""
+# queries of small selections, served first by their own workers ('worker-query').
+INTERACTIVE_QUEUE = "data"
+
+# queries of large selections and maintenance tasks (warming, refreshes), served by 'worker-bulk',
+# so that they can't hold up the interactive queue.
+BULK_QUEUE = "data-bulk"
+
+# selections of more repos than this are queried on the bulk queue.
+BULK_QUERY_THRESHOLD = int(os.getenv("BULK_QUERY_THRESHOLD", "100"))
+
+# repos per query task on the bulk queue.
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "100"))
+
+# Redis has no native priorities, Celery's broker keeps a list per priority ('data-bulk', 'data-bulk:1', ...)
+# and workers always take from the lowest priority number first. tasks are sent with the index of their
+# chunk as the priority, so every selection's first chunks run before the later chunks of larger selections.
+# prefetching a single task keeps a worker from holding tasks that arrive before higher priority ones.
+celery_app.conf.update(
+    broker_transport_options={"priority_steps": list(range(10)), "sep": ":"},
+    worker_prefetch_multiplier=1,
+)
+
+# run tasks in the process that sends them instead of on workers, e.g. for load tests
+# without worker containers. results are still stored so that callbacks can poll them.
+if os.getenv("CELERY_EAGER", "False") == "True":
+    celery_app.conf.update(task_always_eager=True, task_store_eager_result=True)
+
+# tasks of the query workers. query workers start from this module ('celery -A _celery:celery_app')
+# instead of 'app', so they don't load the Dash pages or the search index.
+celery_app.conf.update(
+    include=[
+        "queries.affiliation_query",
+        "queries.commit_activity_query",
+        "queries.contributors_query",
+        "queries.email_domains_query",
+        "queries.issue_assignee_query",
+        "queries.issues_query",
+        "queries.pr_assignee_query",
+        "queries.prs_query",
+        "queries.user_groups_query",
+        "queries.materialized_views",
+        "queries.multiselect_index",
+        "queries.cache_warming",
+    ]
+)
+
+
+"""SCHEDULE PERIODIC TASKS, RUN BY 'celery beat'"""
+# seconds between refreshes of the materialized views queries read from, 0 disables.
+MV_REFRESH_INTERVAL = int(os.getenv("MV_REFRESH_INTERVAL", "86400"))
+
+# seconds between updates of the cached search bar options with repos added to Augur, 0 disables.
+MULTISELECT_REFRESH_INTERVAL = int(os.getenv("MULTISELECT_REFRESH_INTERVAL", "600"))
+
+# hours of the day (crontab syntax, e.g. '2-4', in UTC) in which the data of popular repos is
+# queried ahead of users, off-peak. empty disables.
+WARM_CACHE_HOURS = os.getenv("WARM_CACHE_HOURS", "3")
+
+celery_app.conf.beat_schedule = {}
+
+if MV_REFRESH_INTERVAL > 0:
+    celery_app.conf.beat_schedule["refresh-materialized-views"] = {
+        "task": "queries.materialized_views.refresh_materialized_views",
+        "schedule": MV_REFRESH_INTERVAL,
+        # query workers have the database connection
+        "options": {"queue": BULK_QUEUE},
+    }
+
+if MULTISELECT_REFRESH_INTERVAL > 0:
+    celery_app.conf.beat_schedule["refresh-multiselect-index"] = {
+        "task": "queries.multiselect_index.refresh_multiselect_index",
+        "schedule": MULTISELECT_REFRESH_INTERVAL,
+        "options": {"queue": BULK_QUEUE},
+    }
+
+if WARM_CACHE_HOURS:
+    celery_app.conf.beat_schedule["warm-cache"] = {
+        "task": "queries.cache_warming.warm_cache",
+        "schedule": crontab(minute=0, hour=WARM_CACHE_HOURS),
+        "options": {"queue": BULK_QUEUE},
+    }
+
 celery_manager = CeleryManager(celery_app=celery_app)
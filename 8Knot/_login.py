@@ -7,6 +7,7 @@ from flask_login import (
     UserMixin,
 )
 import redis
+from cache_manager.redis_clients import get_users_client
 from flask import url_for, redirect, abort, session, request, flash, current_app
 import logging
 import json
@@ -15,6 +16,66 @@ import uuid
 from urllib.parse import urlencode
 import requests
 import json
+import time
+import threading
+
+# seconds a process trusts a user it loaded from the users cache before loading it again.
+# logouts are broadcast on LOGOUT_CHANNEL, so the TTL only bounds how long a session
+# deleted some other way (e.g. expired in Redis) stays valid in a process.
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# channel on redis-users that logged out user IDs are published on.
+LOGOUT_CHANNEL = "user_logout"
+
+# user ID -> monotonic time until which the user is known to be logged in.
+_known_users = {}
+
+# set while the listener is subscribed to LOGOUT_CHANNEL, users are only kept in
+# _known_users if every logout published after they were loaded reaches this process.
+_subscribed = threading.Event()
+
+_listener_lock = threading.Lock()
+_listener = None
+
+
+def _listen_for_logouts():
+    """
+    Drops users from _known_users when any process publishes their logout.
+    Resubscribes if the connection drops or anything else fails, and forgets every
+    user while unsubscribed because logouts published in the meantime are lost.
+    """
+    while True:
+        pubsub = None
+        try:
+            pubsub = get_users_client().pubsub()
+            pubsub.subscribe(LOGOUT_CHANNEL)
+            for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    # logouts published from now on reach this process.
+                    _subscribed.set()
+                elif message["type"] == "message":
+                    _known_users.pop(message["data"].decode(), None)
+        except redis.exceptions.ConnectionError:
+            logging.error("LOGOUT_LISTENER: Could not connect to users-cache.")
+        except Exception:
+            # the thread must not end, logouts would stop reaching this process.
+            logging.exception("LOGOUT_LISTENER: Failed, resubscribing.")
+        finally:
+            _subscribed.clear()
+            if pubsub is not None:
+                pubsub.close()
+        _known_users.clear()
+        time.sleep(5.0)
+
+
+def _start_logout_listener():
+    # started when each worker process configures its server rather than at import,
+    # so that every forked worker process has its own listener thread.
+    global _listener
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen_for_logouts, name="logout-listener", daemon=True)
+            _listener.start()
 
 
 def configure_server_login(server):
@@ -41,6 +102,10 @@ def configure_server_login(server):
         }
     }
 
+    # subscribe to logouts before the first user is loaded.
+    if USER_CACHE_TTL > 0:
+        _start_logout_listener()
+
     # create flask-login object
     login = LoginManager(server)
     login.login_view = "/"
@@ -66,20 +131,33 @@ def configure_server_login(server):
         Returns:
             User | None: User object if user ID in session, None otherwise.
         """
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-        )
+        # most requests of a logged-in user are answered from memory.
+        if _known_users.get(id, 0.0) > time.monotonic():
+            return User(id)
+
+        if USER_CACHE_TTL > 0:
+            # restarts the listener if its thread died.
+            _start_logout_listener()
+
+        # a logout after the lookup below is only seen if the listener is already subscribed.
+        subscribed = _subscribed.is_set()
+
+        users_cache = get_users_client()
         try:
-            users_cache.ping()
+            # return the JSON of a user that was set in the Redis instance
+            user = users_cache.get(id)
         except redis.exceptions.ConnectionError:
             logging.error("LOAD_USER: Could not connect to users-cache.")
             return None
 
-        # return the JSON of a user that was set in the Redis instance
-        if users_cache.exists(id):
-            usn = json.loads(users_cache.get(id))["username"]
+        if user is not None:
+            if USER_CACHE_TTL > 0 and subscribed:
+                now = time.monotonic()
+                # forget expired users now and then, so users that don't come back don't accumulate.
+                if len(_known_users) > 10000:
+                    for k in [k for k, t in _known_users.items() if t < now]:
+                        _known_users.pop(k, None)
+                _known_users[id] = now + USER_CACHE_TTL
             return User(id)
         return None
 
@@ -96,20 +174,17 @@ def configure_server_login(server):
             None
 
         """
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-        )
-        try:
-            users_cache.ping()
-        except redis.exceptions.ConnectionError:
-            logging.error("LOGOUT: Could not connect to users-cache.")
-            return redirect("/")
-
         if current_user.is_authenticated:
             c_id = current_user.get_id()
-            users_cache.delete(c_id)
+            try:
+                users_cache = get_users_client()
+                users_cache.delete(c_id)
+                # every process drops the user from its in-memory users.
+                users_cache.publish(LOGOUT_CHANNEL, c_id)
+            except redis.exceptions.ConnectionError:
+                logging.error("LOGOUT: Could not connect to users-cache.")
+                return redirect("/")
+            _known_users.pop(c_id, None)
             logout_user()
             logging.warning(f"USER {c_id} LOGGED OUT")
         else:
@@ -127,17 +202,6 @@ def configure_server_login(server):
         Returns:
             None
         """
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-        )
-        try:
-            users_cache.ping()
-        except redis.exceptions.ConnectionError:
-            logging.error("LOGIN: Could not connect to users-cache.")
-            return redirect("/")
-
         provider = os.environ.get("OAUTH_CLIENT_NAME")
 
         if not current_user.is_anonymous:
@@ -174,17 +238,6 @@ def configure_server_login(server):
         Returns:
             None
         """
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-        )
-        try:
-            users_cache.ping()
-        except redis.exceptions.ConnectionError:
-            logging.error("AUTHORIZE: Could not connect to users-cache.")
-            return redirect("/")
-
         provider = os.environ.get("OAUTH_CLIENT_NAME")
 
         if not current_user.is_anonymous:
@@ -253,7 +306,11 @@ def configure_server_login(server):
             "refresh_token": oauth2_refresh,
             "expiration": oauth2_token_expires,
         }
-        users_cache.set(id_number, json.dumps(serverside_user_data))
+        try:
+            get_users_client().set(id_number, json.dumps(serverside_user_data))
+        except redis.exceptions.ConnectionError:
+            logging.error("AUTHORIZE: Could not connect to users-cache.")
+            return redirect("/")
 
         login_user(User(id_number))
         logging.warning("User logged in")
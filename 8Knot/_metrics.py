@@ -0,0 +1,30 @@
+from flask import Response
+import redis
+import logging
+from metrics_manager.metrics import render_metrics
+
+
+def configure_server_metrics(server):
+    """
+        Configures Dash (Flask) server- makes metrics route available.
+
+        '/metrics' serves the metrics written by the app-server and by
+        every Celery worker, so it's the only target that has to be scraped.
+    Args:
+        server (Flask.server): Flask application server
+
+    Returns:
+        Flask.server: Server with '/metrics' route
+    """
+
+    @server.route("/metrics")
+    def metrics():
+        try:
+            page = render_metrics()
+        except redis.exceptions.RedisError as err:
+            logging.error(f"METRICS - COULDN'T READ FROM REDIS: {err}")
+            return Response("metrics unavailable\n", status=503, mimetype="text/plain")
+
+        return Response(page, mimetype="text/plain; version=0.0.4")
+
+    return server
@@ -21,6 +21,7 @@ import dash_bootstrap_components as dbc
 import dash_bootstrap_templates as dbt
 from db_manager.augur_manager import AugurManager
 import _login
+import _metrics
 from _celery import celery_app, celery_manager
 
 logging.basicConfig(format="%(asctime)s %(levelname)-8s %(message)s", level=logging.INFO)
@@ -82,6 +83,9 @@ app = dash.Dash(
 server = app.server
 server = _login.configure_server_login(server)
 
+"""CONFIGURE METRICS ENDPOINT"""
+server = _metrics.configure_server_metrics(server)
+
 
 """DASH PAGES LAYOUT"""
 # layout of the app stored in the app_layout file, must be imported after the app is initiated
@@ -0,0 +1,3 @@
+"""
+    Empty file that lets us import this folder as a module.
+"""
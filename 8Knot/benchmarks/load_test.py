@@ -0,0 +1,322 @@
+"""
+Load test of a running 8Knot instance through its Dash callback endpoints.
+
+Each simulated user does what the browser does after a search: it resolves a
+selection to repo ids, starts the queries, then requests every background
+visualization callback of a page and polls them until they're done. Users run
+concurrently and repeat --iterations times. Reported per search:
+
+    first graph    time until the first visualization returns a figure
+    all graphs     time until every visualization of the page is done
+    data ready     time until 'wait_queries' reports the queries as done
+
+Only HTTP is used, so the instance can be local (docker-compose.loadtest.yml)
+or remote. Run from the 8Knot directory:
+
+    python -m benchmarks.load_test --url http://localhost:8080 --users 20 --iterations 3
+    python -m benchmarks.load_test --page /chaoss --term loadtest-org --select 2
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import statistics
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+# id of the component holding the selected repo ids, input of the visualizations.
+REPO_CHOICES = "repo-choices"
+
+# ids of the Dash pages callback that renders a page's layout.
+PAGES_CONTENT = "_pages_content"
+PAGES_LOCATION = "_pages_location"
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def _component_values(layout, values=None):
+    # {id: {prop: value}} of every component with an id in a layout tree
+    values = {} if values is None else values
+    if isinstance(layout, list):
+        for child in layout:
+            _component_values(child, values)
+    elif isinstance(layout, dict) and "props" in layout:
+        props = layout["props"]
+        if isinstance(props.get("id"), str):
+            values[props["id"]] = props
+        for prop in props.values():
+            if isinstance(prop, (dict, list)):
+                _component_values(prop, values)
+    return values
+
+
+class DashClient:
+    """
+    Calls Dash callbacks over HTTP the way the renderer does.
+
+    Args:
+    -----
+        url (str): base url of the app.
+        poll_interval (float): seconds between polls of background callbacks.
+    """
+
+    def __init__(self, url, poll_interval):
+        self.url = url.rstrip("/")
+        self.poll_interval = poll_interval
+        self.session = requests.Session()
+
+    def dependencies(self):
+        return self.session.get(f"{self.url}/_dash-dependencies").json()
+
+    def call(self, spec, values, changed):
+        """
+        Calls a callback and waits for its result, polling if it's a background callback.
+
+        Args:
+        -----
+            spec (dict): callback from _dash-dependencies.
+            values (dict{str: object}): 'id.property' -> value of the inputs and states.
+            changed (str): 'id.property' of the input that triggered the callback.
+
+        Returns:
+        --------
+            dict | None: {id: {prop: value}} of the outputs, None if the callback didn't update.
+        """
+
+        def deps(items):
+            return [{**d, "value": values.get(f"{d['id']}.{d['property']}")} for d in items]
+
+        body = {
+            "output": spec["output"],
+            "inputs": deps(spec["inputs"]),
+            "state": deps(spec["state"]),
+            "changedPropIds": [changed],
+        }
+
+        params = {}
+        while True:
+            res = self.session.post(f"{self.url}/_dash-update-component", params=params, json=body)
+            if res.status_code == 204:
+                return None
+            res.raise_for_status()
+            data = res.json()
+
+            if "response" in data:
+                if data.get("multi"):
+                    return data["response"]
+                output = spec["output"]
+                return {output[: output.rindex(".")]: data["response"]["props"]}
+
+            params = {
+                "cacheKey": data.get("cacheKey", params.get("cacheKey")),
+                "job": data.get("job", params.get("job")),
+            }
+            time.sleep(self.poll_interval)
+
+    def layout(self, specs, page):
+        # page layout as rendered by the pages callback: {id: {prop: value}}
+        spec = next(s for s in specs if f"{PAGES_CONTENT}.children" in s["output"])
+        out = self.call(
+            spec,
+            {f"{PAGES_LOCATION}.pathname": page, f"{PAGES_LOCATION}.search": ""},
+            f"{PAGES_LOCATION}.pathname",
+        )
+        return _component_values(out[PAGES_CONTENT]["children"])
+
+
+def _find(specs, output):
+    return next(s for s in specs if output in s["output"])
+
+
+def page_callbacks(specs, components):
+    """
+    Selects the background callbacks of a page's visualizations: every
+    background callback that takes the repo selection and otherwise
+    only depends on components of the page.
+
+    Args:
+    -----
+        specs ([dict]): callbacks from _dash-dependencies.
+        components (dict): components of the page.
+
+    Returns:
+    --------
+        [dict]: callbacks.
+    """
+    known = set(components) | {REPO_CHOICES}
+    return [
+        s
+        for s in specs
+        if s.get("long")
+        and any(d["id"] == REPO_CHOICES for d in s["inputs"])
+        and all(d["id"] in known for d in s["inputs"] + s["state"])
+    ]
+
+
+class Result:
+    """Timings of one simulated search, in seconds from the click on 'search'."""
+
+    def __init__(self):
+        self.first_graph = None
+        self.all_graphs = None
+        self.data_ready = None
+        self.updated = 0
+        self.skipped = 0
+        self.errors = []
+
+
+def run_search(client, specs, components, vizs, selection):
+    """
+    Simulates a user searching for a selection and waiting for a page's visualizations.
+
+    Args:
+    -----
+        client (DashClient): client of the user.
+        specs ([dict]): callbacks from _dash-dependencies.
+        components (dict): components of the page.
+        vizs ([dict]): visualization callbacks of the page.
+        selection ([int | str]): values selected in the search bar.
+
+    Returns:
+    --------
+        Result: timings of the search.
+    """
+    result = Result()
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    out = client.call(
+        _find(specs, f"{REPO_CHOICES}.data"),
+        {"search.n_clicks": 1, "projects.value": selection},
+        "search.n_clicks",
+    )
+    repo_ids = out[REPO_CHOICES]["data"]
+
+    job_ids = client.call(_find(specs, "job-ids.data"), {f"{REPO_CHOICES}.data": repo_ids}, f"{REPO_CHOICES}.data")
+
+    def wait_queries():
+        try:
+            client.call(
+                _find(specs, "data-badge.children"), {"job-ids.data": job_ids["job-ids"]["data"]}, "job-ids.data"
+            )
+            result.data_ready = time.perf_counter() - start
+        except (requests.RequestException, ValueError) as err:
+            result.errors.append(f"wait_queries: {err}")
+
+    def viz(spec):
+        values = {f"{cid}.{prop}": v for cid, props in components.items() for prop, v in props.items()}
+        values[f"{REPO_CHOICES}.data"] = repo_ids
+        try:
+            updated = client.call(spec, values, f"{REPO_CHOICES}.data") is not None
+        except (requests.RequestException, ValueError) as err:
+            result.errors.append(f"{spec['output']}: {err}")
+            return
+
+        with lock:
+            if updated:
+                result.updated += 1
+                if result.first_graph is None:
+                    result.first_graph = time.perf_counter() - start
+            else:
+                # another request with the same inputs took the result, as with two browser tabs.
+                result.skipped += 1
+
+    # the browser sends all of these at once after 'repo-choices' changes.
+    threads = [threading.Thread(target=wait_queries)] + [threading.Thread(target=viz, args=(s,)) for s in vizs]
+    for t in threads:
+        t.start()
+    for t in threads[1:]:
+        t.join()
+    result.all_graphs = time.perf_counter() - start
+    threads[0].join()
+
+    return result
+
+
+def _selections(client, specs, term, k, values):
+    # candidate selections: explicit values, or options the search bar offers for the term
+    if values:
+        return [values]
+
+    out = client.call(
+        _find(specs, "projects.data"), {"projects.searchValue": term, "projects.value": []}, "projects.searchValue"
+    )
+    options = [o["value"] for o in (out or {}).get("projects", {}).get("data", [])]
+    if not options:
+        sys.exit(f"no search bar options match '{term}'")
+    return [options[i : i + k] for i in range(0, len(options), k)]
+
+
+def _report(name, values):
+    if not values:
+        return f"{name:<12} n=0"
+    return (
+        f"{name:<12} n={len(values):<4} p50 {_percentile(values, 50):7.2f}s  p95 {_percentile(values, 95):7.2f}s"
+        f"  p99 {_percentile(values, 99):7.2f}s  max {max(values):7.2f}s  mean {statistics.mean(values):7.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test 8Knot's callback endpoints with simulated users.")
+    parser.add_argument("--url", default="http://localhost:8080", help="base url of the app")
+    parser.add_argument("--users", type=int, default=10, help="concurrent users")
+    parser.add_argument("--iterations", type=int, default=1, help="searches per user")
+    parser.add_argument("--page", default="/contributions", help="page whose visualizations are loaded")
+    parser.add_argument("--term", default="loadtest", help="search bar text the selections are picked from")
+    parser.add_argument("--select", type=int, default=1, help="repos/orgs per selection")
+    parser.add_argument("--values", help="JSON list of search bar values to use for every search instead")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between polls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write every search's timings to this file")
+    args = parser.parse_args()
+
+    client = DashClient(args.url, args.poll_interval)
+    specs = client.dependencies()
+    components = client.layout(specs, args.page)
+    vizs = page_callbacks(specs, components)
+    selections = _selections(client, specs, args.term, args.select, args.values and json.loads(args.values))
+    print(f"{args.page}: {len(vizs)} visualizations, {len(selections)} selections", file=sys.stderr)
+
+    rng = random.Random(args.seed)
+    picks = [[rng.choice(selections) for _ in range(args.iterations)] for _ in range(args.users)]
+
+    def user(i):
+        c = DashClient(args.url, args.poll_interval)
+        results = []
+        for selection in picks[i]:
+            try:
+                results.append(run_search(c, specs, components, vizs, selection))
+            except (requests.RequestException, ValueError, KeyError, TypeError) as err:
+                r = Result()
+                r.errors.append(f"search: {err}")
+                results.append(r)
+        return results
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        results = [r for rs in pool.map(user, range(args.users)) for r in rs]
+    elapsed = time.perf_counter() - start
+
+    errors = [e for r in results for e in r.errors]
+    print(f"{len(results)} searches by {args.users} users in {elapsed:.1f}s, {len(errors)} errors")
+    print(_report("first graph", [r.first_graph for r in results if r.first_graph is not None]))
+    print(_report("all graphs", [r.all_graphs for r in results if not r.errors]))
+    print(_report("data ready", [r.data_ready for r in results if r.data_ready is not None]))
+    print(f"figures returned {sum(r.updated for r in results)}, skipped {sum(r.skipped for r in results)}")
+    for e in errors[:10]:
+        print(f"  {e}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([{k: v for k, v in vars(r).items()} for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
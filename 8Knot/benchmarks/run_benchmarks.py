@@ -0,0 +1,246 @@
+"""
+Benchmarks the 'process_data' and 'create_figure' functions of every visualization
+on synthetic data, without a database, Redis or Celery workers.
+
+Each visualization's callback is run with the default values of its inputs from
+the page layout, and with 'wait_for_data' replaced by synthetic frames of the
+queries the visualization reads ('wait_for_joined_data' by joined frames).
+'process_data' and 'create_figure' are timed (best of --repeat runs) and their peak Python memory is measured with tracemalloc
+in one extra run, because tracing allocations slows the code down.
+
+Run from the 8Knot directory:
+
+    python -m benchmarks.run_benchmarks --repos 20 --years 5 --events 2000
+    python -m benchmarks.run_benchmarks --viz contrib-drive-repeat --repeat 5 --csv results.csv
+"""
+import re
+import sys
+import csv
+import time
+import glob
+import types
+import argparse
+import importlib
+import tracemalloc
+from celery import Celery
+
+
+def install_offline_app():
+    """
+    Registers a stand-in for the 'app' module before any page is imported.
+
+    Importing 'app' connects to Augur, while query modules only need its
+    'celery_app' to declare their tasks. Tasks are never sent in the benchmarks,
+    so an in-memory broker is enough.
+    """
+    offline = types.ModuleType("app")
+    offline.celery_app = Celery("benchmarks", broker="memory://", backend="cache+memory://")
+    offline.augur = None
+    sys.modules["app"] = offline
+
+
+# visualization callbacks are run with these inputs instead of layout defaults.
+INPUT_OVERRIDES = {
+    "repo-choices": None,  # replaced with the synthetic repo ids
+}
+
+
+class _Phase:
+    """
+    Wraps a module function to record its time and peak memory.
+
+    Args:
+    -----
+        f (function): process_data or create_figure of a visualization.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.seconds = []
+        self.peak = None
+        self.trace = False
+
+    def __call__(self, *args, **kwargs):
+        if self.trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            out = self.f(*args, **kwargs)
+            self.peak = tracemalloc.get_traced_memory()[1] - base
+            return out
+
+        start = time.perf_counter()
+        out = self.f(*args, **kwargs)
+        self.seconds.append(time.perf_counter() - start)
+        return out
+
+
+def find_visualizations(pattern):
+    """
+    Imports the visualization modules whose VIZ_ID matches pattern.
+
+    Args:
+    -----
+        pattern (str): regular expression matched against '<PAGE>-<VIZ_ID>'.
+
+    Returns:
+    --------
+        [module]: visualization modules.
+    """
+    modules = []
+    for path in sorted(glob.glob("pages/*/visualizations/*.py")):
+        if path.endswith("__init__.py"):
+            continue
+        module = importlib.import_module(path[:-3].replace("/", "."))
+        if not hasattr(module, "VIZ_ID") or not re.search(pattern, f"{module.PAGE}-{module.VIZ_ID}"):
+            continue
+        modules.append(module)
+    return modules
+
+
+def _callback_of(module):
+    # the figure callback is the one wrapped with 'observe_callback'
+    for obj in vars(module).values():
+        if callable(obj) and getattr(obj, "__module__", None) == module.__name__ and hasattr(obj, "__wrapped__"):
+            return obj.__wrapped__
+    return None
+
+
+def _queries_of(module):
+    # names of the query tasks passed to 'wait_for_data' and 'wait_for_joined_data'
+    with open(module.__file__) as f:
+        aliases = re.findall(r"wait_for_(?:joined_)?data\(\s*func=(\w+),(?:\s*dimension=(\w+),)?", f.read())
+    return sorted({getattr(module, a).__name__ for pair in aliases for a in pair if a})
+
+
+def _callback_args(module, repo_ids):
+    # values of the figure callback's inputs and states, in callback order
+    from dash._callback import GLOBAL_CALLBACK_LIST
+
+    figure = f"{module.PAGE}-{module.VIZ_ID}.figure"
+    spec = next(c for c in GLOBAL_CALLBACK_LIST if figure in c["output"] and c.get("long") is not None)
+
+    components = {}
+    for obj in vars(module).values():
+        if hasattr(obj, "_traverse"):
+            for c in [obj, *obj._traverse()]:
+                if getattr(c, "id", None) is not None:
+                    components[c.id] = c
+
+    args = []
+    for dep in spec["inputs"] + spec["state"]:
+        if dep["id"] == "repo-choices":
+            args.append(repo_ids)
+        else:
+            args.append(getattr(components[dep["id"]], dep["property"], None))
+    return args
+
+
+def run_visualization(module, frames, repo_ids, repeat):
+    """
+    Runs a visualization's callback on synthetic data.
+
+    Args:
+    -----
+        module (module): visualization module.
+        frames (dict{str: pd.DataFrame}): synthetic frame of each query.
+        repo_ids ([int]): repo ids in the frames.
+        repeat (int): timed runs.
+
+    Returns:
+    --------
+        dict: result row of the visualization.
+    """
+    row = {"viz": f"{module.PAGE}-{module.VIZ_ID}"}
+
+    queries = _queries_of(module)
+    row.update(query="+".join(queries), rows=max(len(frames[q]) for q in queries))
+
+    def wait_for_data(func, **kwargs):
+        return frames[func.__name__].copy()
+
+    def wait_for_joined_data(func, dimension, on, **kwargs):
+        # joined like 'wait_for_joined_data' does
+        return wait_for_data(func).merge(frames[dimension.__name__].drop_duplicates(subset=on), on=on, how="inner")
+
+    callback = _callback_of(module)
+    args = _callback_args(module, repo_ids)
+
+    # stand-ins of the wait functions the module imported
+    waits = {"wait_for_data": wait_for_data, "wait_for_joined_data": wait_for_joined_data}
+    originals = {name: getattr(module, name) for name in waits if hasattr(module, name)}
+
+    process_data, create_figure = module.process_data, module.create_figure
+    pd_phase, cf_phase = _Phase(process_data), _Phase(create_figure)
+    module.process_data, module.create_figure = pd_phase, cf_phase
+    for name in originals:
+        setattr(module, name, waits[name])
+
+    try:
+        for _ in range(repeat):
+            callback(lambda fig: None, *args)
+
+        tracemalloc.start()
+        pd_phase.trace = cf_phase.trace = True
+        callback(lambda fig: None, *args)
+        tracemalloc.stop()
+
+        row["status"] = "ok" if pd_phase.seconds and cf_phase.seconds else "no figure"
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        row["status"] = f"error: {type(e).__name__}: {e}"
+    finally:
+        module.process_data, module.create_figure = process_data, create_figure
+        for name, original in originals.items():
+            setattr(module, name, original)
+
+    for name, phase in (("process_data", pd_phase), ("create_figure", cf_phase)):
+        row[f"{name}_s"] = round(min(phase.seconds), 4) if phase.seconds else None
+        row[f"{name}_peak_mb"] = round(phase.peak / 2**20, 2) if phase.peak is not None else None
+
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark visualizations on synthetic Augur-shaped data.")
+    parser.add_argument("--repos", type=int, default=10, help="repos in the selection")
+    parser.add_argument("--years", type=int, default=3, help="years of history per repo")
+    parser.add_argument("--events", type=int, default=1000, help="rows per repo per year, per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per visualization, best is reported")
+    parser.add_argument("--viz", default=".", help="regex of '<PAGE>-<VIZ_ID>' to run")
+    parser.add_argument("--csv", help="also write results to this file")
+    args = parser.parse_args()
+
+    install_offline_app()
+    from benchmarks.synthetic_data import generate
+
+    modules = find_visualizations(args.viz)
+
+    frames = {}
+    for q in sorted({q for m in modules for q in _queries_of(m)}):
+        start = time.perf_counter()
+        frames[q] = generate(q, repos=args.repos, years=args.years, events=args.events, seed=args.seed)
+        print(f"generated {q}: {len(frames[q])} rows in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    repo_ids = [r * 10 for r in range(1, args.repos + 1)]
+
+    rows = []
+    for module in modules:
+        row = run_visualization(module, frames, repo_ids, args.repeat)
+        rows.append(row)
+        print(
+            f"{row['viz']:<50} {row['rows']:>9} rows"
+            f"  process_data {row['process_data_s']}s / {row['process_data_peak_mb']}MB"
+            f"  create_figure {row['create_figure_s']}s / {row['create_figure_peak_mb']}MB"
+            f"  {row['status']}"
+        )
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+import datetime as dt
+import importlib
+import numpy as np
+import pandas as pd
+from cache_manager import blobs
+from queries.contributor_lifecycle_query import contributor_lifecycle_query
+from queries.contributor_sketches_query import contributor_sketches_query
+from queries.top_contributors_query import top_contributors_query
+
+"""
+Synthetic, Augur-shaped data for the benchmarks.
+
+Each generator returns a frame with the columns and dtypes that the visualizations
+get from 'wait_for_data' for the matching query, i.e. after the query's pandas
+updates and the feather round trip through Redis. Values are random but follow
+the shapes that matter for performance: a few contributors do most of the work,
+most issues/PRs get closed, and every repo spans the requested number of years.
+"""
+
+# raw action names of explorer_contributor_actions and the labels contributors_query renames them to.
+ACTIONS = {
+    "commit": "Commit",
+    "issue_opened": "Issue Opened",
+    "issue_closed": "Issue Closed",
+    "issue_comment": "Issue Comment",
+    "pull_request_open": "PR Opened",
+    "pull_request_closed": "PR Closed",
+    "pull_request_merged": "PR Merged",
+    "pull_request_comment": "PR Comment",
+    "pull_request_review_COMMENTED": "PR Review",
+    "pull_request_review_APPROVED": "PR Review",
+}
+
+# relative frequency of the actions above.
+ACTION_WEIGHTS = [0.35, 0.08, 0.06, 0.15, 0.08, 0.02, 0.06, 0.12, 0.05, 0.03]
+
+DOMAINS = ["gmail.com", "redhat.com", "users.noreply.github.com", "ibm.com", "microsoft.com", "apache.org"]
+
+COMPANIES = ["Red Hat", "@redhat", "IBM", "Microsoft", "Google", "Apache Software Foundation", None, None]
+
+
+class _Shape:
+    """
+    Scale of the generated data and the random state shared by the generators.
+
+    Args:
+    -----
+        repos (int): number of repos.
+        years (int): years of history of each repo.
+        events (int): rows per repo per year.
+        seed (int): seed of the random generator.
+    """
+
+    def __init__(self, repos, years, events, seed):
+        self.rng = np.random.default_rng(seed)
+        self.repo_ids = np.arange(1, repos + 1) * 10
+        self.n = repos * years * events
+        self.years = years
+
+        # contributors per repo grows with activity, most contribute rarely.
+        self.contributors = max(10, events // 5)
+
+    def repos(self):
+        return self.rng.choice(self.repo_ids, self.n)
+
+    def timestamps(self, n=None):
+        # uniform over the history, ending yesterday (queries drop today's rows).
+        n = self.n if n is None else n
+        end = pd.Timestamp(dt.date.today()) - pd.Timedelta(days=1)
+        start = end - pd.DateOffset(years=self.years)
+        span = (end - start).total_seconds()
+        return start + pd.to_timedelta(self.rng.random(n) * span, unit="s")
+
+    def contributor_ids(self, n=None):
+        # zipf: a few contributors do most of the work.
+        n = self.n if n is None else n
+        return (self.rng.zipf(1.6, n) - 1) % self.contributors
+
+    def closed_after(self, created, closed_fraction):
+        # time to close is long tailed, from hours to years.
+        delay = pd.to_timedelta(self.rng.lognormal(mean=12, sigma=2, size=len(created)), unit="s")
+        closed = pd.Series(created + delay)
+        closed[self.rng.random(len(created)) > closed_fraction] = pd.NaT
+        return closed
+
+
+def _cntrb_uuid(idx):
+    # Augur contributor ids are uuids that start with a platform prefix.
+    return pd.Series(idx).map(lambda i: f"01000000-0000-0000-0000-{i:012d}")
+
+
+def _dates(ts):
+    # queries store 'created' as dates, i.e. timestamps at midnight UTC.
+    return pd.Series(ts).dt.tz_localize("UTC").dt.floor("D")
+
+
+def commits(shape):
+    """Frame of 'commit_activity_query': one row per commit, 'id' is dropped per repo."""
+    ts = shape.timestamps()
+    authors = shape.contributor_ids()
+    domains = np.array(DOMAINS)[authors % len(DOMAINS)]
+
+    # most commits are committed by their author at the time they're authored.
+    committed = pd.Series(ts)
+    authored = committed - pd.to_timedelta(shape.rng.random(shape.n) * 7, unit="D")
+    same = shape.rng.random(shape.n) < 0.7
+
+    return pd.DataFrame(
+        {
+            "commits": [f"{i:040x}" for i in range(shape.n)],
+            "author_email": [f"dev{a}@{d}" for a, d in zip(authors, domains)],
+            "author_domain": domains,
+            "date": pd.Series(ts).dt.strftime("%Y-%m-%d"),
+            "author_timestamp": _dates(ts),
+            # weekday 0 is Sunday, -1 where the author time is the committer time.
+            "author_hour": np.where(same, -1, authored.dt.hour).astype("int8"),
+            "author_weekday": np.where(same, -1, (authored.dt.dayofweek + 1) % 7).astype("int8"),
+            "committer_hour": committed.dt.hour.astype("int8"),
+            "committer_weekday": ((committed.dt.dayofweek + 1) % 7).astype("int8"),
+        }
+    )
+
+
+def _actions(shape):
+    repos = shape.repos()
+    cntrb = shape.contributor_ids()
+    ts = shape.timestamps()
+    action = shape.rng.choice(list(ACTIONS.keys()), shape.n, p=ACTION_WEIGHTS)
+
+    df = pd.DataFrame({"id": repos, "cntrb_idx": cntrb, "ts": ts, "action": action})
+
+    # row_number() over (partition by contributor, repo order by created desc)
+    df["rank"] = df.groupby(["cntrb_idx", "id"])["ts"].rank(method="first", ascending=False).astype(int)
+    return df
+
+
+def contributors(shape):
+    """Frame of 'contributors_query': one row per contributor action."""
+    df = _actions(shape)
+
+    return pd.DataFrame(
+        {
+            "id": df["id"],
+            "repo_name": "repo-" + df["id"].astype(str),
+            "cntrb_id": _cntrb_uuid(df["cntrb_idx"]),
+            "created_at": _dates(df["ts"]),
+            "login": "login" + df["cntrb_idx"].astype(str),
+            "Action": df["action"].map(ACTIONS),
+            "rank": df["rank"],
+        }
+    )
+
+
+def contributor_lifecycle(shape):
+    """Frame of 'contributor_lifecycle_query': summary of each contributor of each repo, 'id' is dropped per repo."""
+    return contributor_lifecycle_query(contributors(shape)).drop(columns=["id"])
+
+
+def contributor_sketches(shape):
+    """Frame of 'contributor_sketches_query': actions and contributor sketch of each repo, month and action."""
+    return contributor_sketches_query(contributors(shape)).drop(columns=["id"])
+
+
+def top_contributors(shape):
+    """Frame of 'top_contributors_query': top contributors and remainder of each repo, month and action."""
+    return top_contributors_query(contributors(shape)).drop(columns=["id"])
+
+
+def affiliation(shape):
+    """Frame of 'affiliation_query': company of each contributor of each repo, 'id' is dropped per repo."""
+    idx = pd.Series(np.tile(np.arange(shape.contributors), len(shape.repo_ids)))
+
+    return pd.DataFrame(
+        {
+            "cntrb_id": _cntrb_uuid(idx),
+            "cntrb_company": np.array(COMPANIES, dtype=object)[idx % len(COMPANIES)],
+        }
+    )
+
+
+def email_domains(shape):
+    """Frame of 'email_domains_query': emails of each contributor of each repo, 'id' is dropped per repo."""
+    idx = pd.Series(np.tile(np.arange(shape.contributors), len(shape.repo_ids)))
+
+    # one or two emails per contributor
+    emails = [
+        [f"dev{i}@{DOMAINS[i % len(DOMAINS)]}", f"dev{i}@{DOMAINS[(i + 1) % len(DOMAINS)]}"]
+        if i % 3 == 0
+        else [f"dev{i}@{DOMAINS[i % len(DOMAINS)]}"]
+        for i in idx
+    ]
+
+    df = pd.DataFrame({"cntrb_id": _cntrb_uuid(idx), "email": emails}).explode("email", ignore_index=True)
+    df["domain"] = df["email"].str.split("@").str[-1]
+    return df
+
+
+def prs(shape):
+    """Frame of 'prs_query': one row per pull request."""
+    repos = shape.repos()
+    ts = shape.timestamps()
+    closed = shape.closed_after(ts, closed_fraction=0.85)
+
+    # most closed PRs are merged, at the time they're closed.
+    merged = closed.copy()
+    merged[shape.rng.random(shape.n) > 0.7] = pd.NaT
+
+    return pd.DataFrame(
+        {
+            "id": repos,
+            "repo_name": pd.Series(repos).map(lambda r: f"repo-{r}"),
+            "pull_request": np.arange(shape.n),
+            "pr_src_number": np.arange(shape.n) % 5000,
+            "created": _dates(ts),
+            "closed": closed,
+            "merged": merged,
+        }
+    )
+
+
+def issues(shape):
+    """Frame of 'issues_query': one row per issue that isn't a PR."""
+    repos = shape.repos()
+    ts = shape.timestamps()
+
+    return pd.DataFrame(
+        {
+            "id": repos,
+            "repo_name": pd.Series(repos).map(lambda r: f"repo-{r}"),
+            "issue": np.arange(shape.n),
+            "issue_number": np.arange(shape.n) % 5000,
+            "gh_issue": np.arange(shape.n) + 10**9,
+            "created": _dates(ts),
+            "closed": shape.closed_after(ts, closed_fraction=0.75),
+        }
+    )
+
+
+def _assignments(shape, key):
+    # one row per assignment event, items without events have one row with no action.
+    repos = shape.repos()
+    ts = shape.timestamps()
+    closed = shape.closed_after(ts, closed_fraction=0.8)
+    events = shape.rng.choice([0, 1, 2], shape.n, p=[0.5, 0.35, 0.15])
+
+    item = np.repeat(np.arange(shape.n), np.maximum(events, 1))
+    has_event = np.repeat(events > 0, np.maximum(events, 1))
+
+    # second event of an item unassigns the first.
+    nth = pd.Series(item).groupby(item).cumcount().to_numpy()
+    action = np.where(nth == 0, "assigned", "unassigned").astype(object)
+    action[~has_event] = None
+
+    assign_date = pd.Series(ts[item]) + pd.to_timedelta(shape.rng.random(len(item)) * 30, unit="D")
+    assign_date[~has_event] = pd.NaT
+
+    assignee = _cntrb_uuid(shape.contributor_ids(len(item))).str[:13].astype(object)
+    assignee[~has_event] = "None"
+
+    return pd.DataFrame(
+        {
+            key: item,
+            "id": repos[item],
+            "created": _dates(ts[item]),
+            "closed": closed.to_numpy()[item],
+            "assign_date": assign_date,
+            "assignment_action": action,
+            "assignee": assignee,
+        }
+    )
+
+
+def issue_assignee(shape):
+    """Frame of 'issue_assignee_query': issues joined with their assignment events."""
+    return _assignments(shape, "issue_id")
+
+
+def pr_assignee(shape):
+    """Frame of 'pr_assignee_query': PRs joined with their assignment events."""
+    return _assignments(shape, "pull_request_id")
+
+
+# query task name -> generator of the query's frame.
+GENERATORS = {
+    "commit_activity_query": commits,
+    "contributors_query": contributors,
+    "contributor_lifecycle_query": contributor_lifecycle,
+    "contributor_sketches_query": contributor_sketches,
+    "top_contributors_query": top_contributors,
+    "affiliation_query": affiliation,
+    "email_domains_query": email_domains,
+    "prs_query": prs,
+    "issues_query": issues,
+    "issue_assignee_query": issue_assignee,
+    "pr_assignee_query": pr_assignee,
+}
+
+
+def generate(query, repos=10, years=3, events=1000, seed=0):
+    """
+    Generates the frame that a visualization gets for a query.
+
+    Args:
+    -----
+        query (str): name of the query task, key of GENERATORS.
+        repos (int): number of repos in the selection.
+        years (int): years of history of each repo.
+        events (int): rows per repo per year.
+        seed (int): seed, same arguments give the same frame.
+
+    Returns:
+    --------
+        pd.DataFrame: synthetic data.
+    """
+    df = GENERATORS[query](_Shape(repos, years, events, seed))
+
+    # round trip through the query's typed blob, as the data in the cache.
+    schema = importlib.import_module(f"queries.{query}").SCHEMA
+    return blobs.to_frame(blobs.read_table(blobs.to_blob(df, schema)))
@@ -0,0 +1,169 @@
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+"""
+Typed Arrow blobs of query data.
+
+Query tasks declare the types of their time and repeated-string columns, and
+their frames are written to feather blobs with these types instead of the types
+pandas infers:
+
+    TIMESTAMP   time columns, microseconds since the epoch in UTC. They're
+                read as datetime64[ns, UTC] without parsing, so the visualizations'
+                pd.to_datetime(..., utc=True) doesn't have to do any work.
+                Dates are stored as timestamps at midnight UTC.
+    DICTIONARY  repeated strings (actions, logins, repo names, contributor ids),
+                stored once per blob and referred to by int32 codes.
+
+Readers get the codes back as strings that share one str object per distinct
+value, so visualizations see the same object columns as before.
+
+Contributor ids are dictionary encoded like the other strings rather than stored
+as binary UUIDs or kept as categorical codes in the frames: visualizations group,
+join and show them as strings, and groupbys of categorical columns would also
+return the contributors that aren't in the filtered rows. A frame's ids cost one
+pointer per row, their strings are stored once.
+"""
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+
+def _cast(column, arrow_type):
+    # dictionary encoding isn't a cast in Arrow, and columns of empty or all-null frames have no type yet.
+    if pa.types.is_dictionary(arrow_type):
+        if pa.types.is_null(column.type):
+            return pa.chunked_array([pa.nulls(len(column), arrow_type)], type=arrow_type)
+        return pc.dictionary_encode(column.cast(arrow_type.value_type))
+    return column.cast(arrow_type, safe=False)
+
+
+def to_blob(df, schema):
+    """
+    Serializes a frame to a feather blob whose declared columns have the declared types.
+
+    Args:
+    -----
+        df (pd.DataFrame): data of a repo.
+        schema (dict{str: pa.DataType}): column -> TIMESTAMP or DICTIONARY, other columns keep their inferred types.
+
+    Returns:
+    --------
+        bytes: feather blob.
+    """
+    # timestamps are converted to UTC by pandas, which also handles columns of mixed utc offsets.
+    times = {c: pd.to_datetime(df[c], utc=True) for c, t in schema.items() if t == TIMESTAMP and c in df.columns}
+    table = pa.Table.from_pandas(df.assign(**times), preserve_index=False).replace_schema_metadata(None)
+
+    for name, arrow_type in schema.items():
+        i = table.schema.get_field_index(name)
+        if i != -1:
+            table = table.set_column(i, pa.field(name, arrow_type), _cast(table.column(i), arrow_type))
+
+    return table_to_blob(table)
+
+
+def table_to_blob(table):
+    """
+    Serializes a table to a feather blob.
+
+    Args:
+    -----
+        table (pa.Table): data.
+
+    Returns:
+    --------
+        bytes: feather blob.
+    """
+    sink = pa.BufferOutputStream()
+    # the feather file format has a single dictionary per column.
+    feather.write_feather(table.unify_dictionaries(), sink)
+    return sink.getvalue().to_pybytes()
+
+
+def read_table(blob):
+    """
+    Reads a feather blob without copying its bytes.
+
+    Args:
+    -----
+        blob (bytes): feather blob.
+
+    Returns:
+    --------
+        pa.Table: data.
+    """
+    return feather.read_table(pa.BufferReader(blob))
+
+
+def merge_tables(tables):
+    """
+    Concatenates tables of the same query. Tables whose inferred types differ,
+    e.g. an integer column with nulls in one task's results only, are merged by pandas
+    and cast back to the tables' types, so declared columns keep their types.
+
+    Args:
+    -----
+        tables ([pa.Table]): data of each repo.
+
+    Returns:
+    --------
+        pa.Table: data of all repos.
+    """
+    # empty tables have no rows to add, but their undeclared columns may have no type.
+    tables = [t for t in tables if t.num_rows > 0] or tables[:1]
+    try:
+        return pa.concat_tables(tables)
+    except pa.ArrowInvalid as err:
+        logging.warning(f"MERGE_TABLES - TYPES DIFFER, MERGED BY PANDAS: {err}")
+        df = pd.concat([to_frame(t) for t in tables], ignore_index=True)
+        table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+
+    # type that the tables agree on for each column, all-null columns have no type.
+    types = {}
+    for t in tables:
+        for field in t.schema:
+            if not pa.types.is_null(field.type):
+                types[field.name] = field.type if types.get(field.name, field.type) == field.type else None
+
+    for i, field in enumerate(table.schema):
+        arrow_type = types.get(field.name)
+        if arrow_type is None or field.type == arrow_type:
+            continue
+        try:
+            # values that don't fit the type, e.g. floats of an integer column, keep the merged type.
+            column = table.column(i)
+            column = _cast(column, arrow_type) if pa.types.is_dictionary(arrow_type) else column.cast(arrow_type)
+            table = table.set_column(i, pa.field(field.name, arrow_type), column)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+
+    return table
+
+
+def to_frame(table):
+    """
+    Converts a table to the frame visualizations read.
+
+    Args:
+    -----
+        table (pa.Table): data.
+
+    Returns:
+    --------
+        pd.DataFrame: data, dictionary columns as object columns of str.
+    """
+    df = table.to_pandas()
+
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            # every row of a value refers to the same str object, code -1 (null) takes the appended None.
+            values = np.append(df[name].cat.categories.to_numpy(dtype=object), None)
+            df[name] = values[df[name].cat.codes.to_numpy()]
+
+    return df
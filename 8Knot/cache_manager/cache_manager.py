@@ -1,8 +1,31 @@
-import redis
+import pandas as pd
+from cache_manager.redis_clients import get_cache_client
+from cache_manager import blobs
 import os
 import hashlib
-import pandas as pd
-import io
+
+# seconds that a merged repo-set blob lives in the cache before it has to be rebuilt
+# from the per-repo blobs. per-repo blobs don't expire, so this only bounds memory.
+SET_CACHE_TTL = int(os.getenv("SET_CACHE_TTL", "3600"))
+
+
+def repo_set_key(repos):
+    """
+    Creates a canonical, order-insensitive key for a set of repos.
+
+    [1, 2], [2, 1] and [2, 1, 1] all produce the same key, so derived artifacts
+    for a selection can be shared by every user who picks the same repos or org.
+
+    Args:
+    -----
+        repos ([int]): repo_ids in the selection.
+
+    Returns:
+    --------
+        str: compact hex digest of the sorted, deduplicated repo_ids.
+    """
+    canonical = ",".join(str(r) for r in sorted(set(int(r) for r in repos)))
+    return hashlib.md5(bytes(canonical, "utf-8")).hexdigest()
 
 
 class CacheManager:
@@ -38,17 +61,35 @@ class CacheManager:
         existsm(func, [repo]):
             Returns number of names that exist.
 
+        _get_set_hash(func, [repo]) (private) :
+            Creates an order-insensitive key for the calling function
+            and the set of repos that the function is being run with.
+
+        set_repo_set(func, [repo], data):
+            Sets data at key set_hash(func, [repo]), expires after SET_CACHE_TTL.
+
+        get_repo_set(func, [repo]):
+            Returns data at key set_hash(func, [repo]), None if Nil.
+
+        grabm(func, [repo]):
+            Returns the merged DataFrame for [repo], None if not all ready.
+
+        grabm_partial(func, [repo], partial):
+            Returns the merged DataFrame for the ready subset of [repo],
+            the fraction of [repo] that is ready and the merged data to pass to the next call.
+
+        readym(func, [repo]):
+            Returns the repos of [repo] that have data at hash(func, repo).
+
+        clear_repo_sets(func):
+            Deletes all set-level values of func.
+
     """
 
     def __init__(self, decode_value=False):
         # Redis cache for job queue and results cache
-        self._redis = redis.StrictRedis(
-            # openshift, compose will reconcile the 'redis' naming via the dns
-            host=os.getenv("REDIS_SERVICE_HOST", "redis-cache"),
-            port=os.getenv("REDIS_SERVICE_PORT", "6379"),
-            password=os.getenv("REDIS_PASSWORD", ""),
-            decode_responses=decode_value,
-        )
+        # clients share a connection pool, so constructing a CacheManager doesn't connect.
+        self._redis = get_cache_client(decode_value)
 
     def _get_hash(self, func, repo):
         """
@@ -85,6 +126,24 @@ class CacheManager:
 
         return h
 
+    def _get_set_hash(self, func, repos):
+        """
+        (private)
+        Creates a key for a set of repos in the 'set' namespace.
+        Key doesn't depend on the order of, or duplicates in, the repos.
+
+        Args:
+        -----
+            func (function): Function whose results are cached for the set.
+            repos (list[int]): repo_ids in the set.
+
+        Returns:
+        --------
+            str: Key in the 'set' namespace.
+        """
+        # function name stays readable so that all sets of a function can be found.
+        return f"set:{func.__name__}:{repo_set_key(repos)}"
+
     def set(self, func, repo, data):
         """Sets redis value as data at name=hash(func, repo)
 
@@ -197,10 +256,71 @@ class CacheManager:
         # return results
         return n
 
+    def set_repo_set(self, func, repos, data, ex=SET_CACHE_TTL):
+        """Sets redis value as data at name=set_hash(func, repos)
+
+        Args:
+            func (function): Function whose results are cached
+            repos (list[int]): list of repo_ids in the set
+            data (bytes): serialized result for the whole set
+            ex (int): seconds until the value expires
+
+        Returns:
+            boolean: confirmation of successful set operation.
+        """
+        return self._redis.set(name=self._get_set_hash(func, repos), value=data, ex=ex)
+
+    def get_repo_set(self, func, repos):
+        """Gets redis value at name=set_hash(func, repos)
+
+        Args:
+            func (function): Function whose results are cached
+            repos (list[int]): list of repo_ids in the set
+
+        Returns:
+            bytes | None: serialized result for the whole set, None if Nil.
+        """
+        return self._redis.get(name=self._get_set_hash(func, repos))
+
+    def readym(self, func, repos):
+        """Checks which of the repos have data at name=hash(func, repo)
+
+        Args:
+            func (function): Query function used
+            repos (list[int]): list of repo_ids of repos
+
+        Returns:
+            list[int]: repo_ids whose data is in the cache.
+        """
+        pipe = self._redis.pipeline(transaction=False)
+        for r in repos:
+            pipe.exists(self._get_hash(func, r))
+
+        return [r for r, e in zip(repos, pipe.execute()) if e]
+
+    def clear_repo_sets(self, func):
+        """Deletes every set-level value of func, e.g. after its
+        per-repo data has been replaced.
+
+        Args:
+            func (function): Function whose set-level values are deleted
+
+        Returns:
+            int: number of deleted keys.
+        """
+        n = 0
+        for k in self._redis.scan_iter(match=f"set:{func.__name__}:*", count=1000):
+            n += self._redis.delete(k)
+        return n
+
     def grabm(self, func, repos):
         """Checks to see if data is ready using 'existsm'
         and builds aggregate DataFrame to return to callback.
 
+        Selections of more than one repo are merged once and the merged
+        DataFrame is cached under the repo set's key, so the next callback
+        or user asking for the same set reads a single blob.
+
         Args:
             func (function): Query function used
             repo (list[int]): list of repo_ids of repos
@@ -209,21 +329,90 @@ class CacheManager:
             pd.DataFrame | None: Data if all available.
         """
 
+        if len(repos) == 0:
+            return pd.DataFrame()
+
+        is_set = len(set(repos)) > 1
+
+        if is_set:
+            bset = self.get_repo_set(func=func, repos=repos)
+            if bset is not None:
+                return blobs.to_frame(blobs.read_table(bset))
+
         num_repos = len(repos)
         ready = self.existsm(func=func, repos=repos) == num_repos
         if not ready:
             return None
 
-        # get all results from cache
-        dfs_from_cache = self.getm(func=func, repos=repos)
+        table = self._mergem(func=func, repos=repos)
+
+        if is_set:
+            # write merged table, with the types of the repos' blobs, for the next reader of this set.
+            self.set_repo_set(func=func, repos=repos, data=blobs.table_to_blob(table))
+
+        return blobs.to_frame(table)
+
+    def grabm_partial(self, func, repos, partial=None):
+        """Progressive version of 'grabm'. Builds the aggregate DataFrame
+        from the repos that are already cached, so callbacks can draw
+        a partial graph while the rest of the selection is downloading.
+
+        The merged data of earlier calls is passed back in 'partial', so each
+        call only reads and merges the blobs of the repos that became ready since.
+
+        Args:
+            func (function): Query function used
+            repo (list[int]): list of repo_ids of repos
+            partial ((pa.Table, set[int]) | None): merged data and its repos, as returned by the previous call.
+
+        Returns:
+            (pd.DataFrame | None, float, (pa.Table, set[int]) | None): Data for the ready repos, None if no new
+                repos are ready, the fraction of repos that are ready, and the merged data for the next call.
+        """
+
+        if len(repos) == 0:
+            return pd.DataFrame(), 1.0, partial
+
+        unique = list(dict.fromkeys(repos))
+        is_set = len(unique) > 1
+
+        if partial is None and is_set:
+            bset = self.get_repo_set(func=func, repos=repos)
+            if bset is not None:
+                return blobs.to_frame(blobs.read_table(bset)), 1.0, None
+
+        table, merged = partial if partial is not None else (None, set())
+
+        new_repos = self.readym(func=func, repos=[r for r in unique if r not in merged])
+        fraction = (len(merged) + len(new_repos)) / len(unique)
+        if len(new_repos) == 0:
+            return None, fraction, partial
+
+        new_table = self._mergem(func=func, repos=new_repos)
+        table = new_table if table is None else blobs.merge_tables([table, new_table])
+        merged = merged | set(new_repos)
+
+        if fraction == 1.0 and is_set:
+            # write merged table, with the types of the repos' blobs, for the next reader of this set.
+            self.set_repo_set(func=func, repos=repos, data=blobs.table_to_blob(table))
 
-        pd_dfs = []
-        for bdf in dfs_from_cache:
-            bbuff = io.BytesIO(bdf)
-            bbuff.seek(0)
-            df = pd.read_feather(bbuff)
-            pd_dfs.append(df)
+        return blobs.to_frame(table), fraction, (table, merged)
 
-        out_df = pd.concat(pd_dfs)
+    def _mergem(self, func, repos):
+        """
+        (private)
+        Reads the blobs for repos and concatenates them into one Arrow table.
+        Caller has to make sure that all of the blobs exist.
+
+        Args:
+            func (function): Query function used
+            repo (list[int]): list of repo_ids of repos
+
+        Returns:
+            pa.Table: Data of all repos, see cache_manager/blobs.py.
+        """
+
+        # get all results from cache
+        blobs_from_cache = self.getm(func=func, repos=repos)
 
-        return out_df
+        return blobs.merge_tables([blobs.read_table(b) for b in blobs_from_cache])
@@ -0,0 +1,84 @@
+import os
+import threading
+import redis
+
+"""
+Shared Redis clients of this process.
+
+Every client of an instance uses the same connection pool, so callbacks and
+request handlers reuse open connections instead of connecting (and PINGing)
+for every call. Pools are created on first use. A pool notices a fork and
+opens new connections in the child, so this is safe under gunicorn and
+Celery's prefork workers.
+
+The pool checks connections that were idle for HEALTH_CHECK_INTERVAL seconds
+before using them and reconnects broken ones, so callers don't ping first.
+Errors of an unavailable instance surface as redis.exceptions.ConnectionError
+from the command itself.
+"""
+
+# seconds a pooled connection may be idle before it's checked with a PING before use.
+HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+# maximum open connections per pool, None is unbounded.
+MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "0")) or None
+
+# name -> connection settings of each Redis instance.
+INSTANCES = {
+    # data blobs, metrics and Celery's broker and results
+    "cache": lambda: {
+        "host": os.getenv("REDIS_SERVICE_HOST", "redis-cache"),
+        "port": os.getenv("REDIS_SERVICE_PORT", "6379"),
+        "password": os.getenv("REDIS_PASSWORD", ""),
+    },
+    # user sessions and groups
+    "users": lambda: {
+        "host": os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
+        "port": 6379,
+        "password": os.getenv("REDIS_PASSWORD", ""),
+    },
+}
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_client(instance, decode_responses=False):
+    """
+    Returns a client of a Redis instance that uses the instance's shared pool.
+
+    Args:
+    -----
+        instance (str): name of the instance, key of INSTANCES.
+        decode_responses (bool): whether replies are decoded to str.
+
+    Returns:
+    --------
+        redis.StrictRedis: client.
+    """
+    key = (instance, decode_responses)
+    pool = _pools.get(key)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = redis.ConnectionPool(
+                    **INSTANCES[instance](),
+                    decode_responses=decode_responses,
+                    health_check_interval=HEALTH_CHECK_INTERVAL,
+                    socket_keepalive=True,
+                    retry_on_timeout=True,
+                    max_connections=MAX_CONNECTIONS,
+                )
+                _pools[key] = pool
+    return redis.StrictRedis(connection_pool=pool)
+
+
+def get_cache_client(decode_responses=False):
+    """Returns a pooled client of the redis-cache instance."""
+    return get_client("cache", decode_responses)
+
+
+def get_users_client(decode_responses=False):
+    """Returns a pooled client of the redis-users instance."""
+    return get_client("users", decode_responses)
@@ -0,0 +1,197 @@
+import os
+import numpy as np
+import pandas as pd
+
+"""
+Mergeable sketches of query data.
+
+HyperLogLog sketches estimate the number of distinct values, e.g. contributors,
+of a group of rows. A sketch of a group is built once when the data is cached,
+and the sketches of any number of groups, e.g. of the repos of a selection or
+the months of a date range, are merged into the sketch of their union by taking
+the maximum of each register.
+
+Sketches are sparse: a row of cached data holds the indexes of a sketch's
+non-zero registers and their values, so a sketch of few values takes as much
+space as the values would. Merged sketches are estimated without building
+dense registers.
+
+Top-n sketches keep the values with the n largest counts of a group, e.g. the
+most active contributors of a repo's month, and the sum of the other counts.
+Sketches of several groups are merged by summing the counts of each value; the
+remainders keep totals exact.
+"""
+
+# bits of a value's hash that pick its register. the standard error of an estimate is 1.04 / sqrt(2 ** PRECISION).
+PRECISION = 12
+
+REGISTERS = 1 << PRECISION
+
+# selections of up to this many repos are counted exactly from their rows instead of estimated from sketches.
+EXACT_MAX_REPOS = int(os.getenv("SKETCH_EXACT_MAX_REPOS", "100"))
+
+
+def _leading_zeros(x):
+    # number of leading zero bits of each uint64, by halving the window that's searched.
+    x = x.copy()
+    n = np.zeros(len(x), dtype=np.int64)
+    for s in (32, 16, 8, 4, 2, 1):
+        zero = (x >> np.uint64(64 - s)) == 0
+        n[zero] += s
+        x[zero] <<= np.uint64(s)
+    n[(x >> np.uint64(63)) == 0] += 1
+    return n
+
+
+def hll_registers(values):
+    """
+    Hashes values to the register that they update and the value that they set it to.
+
+    Args:
+    -----
+        values (pd.Series): values that are counted, without nulls.
+
+    Returns:
+    --------
+        (np.ndarray, np.ndarray): int16 register and int8 register value of each value.
+    """
+    # the hash of pandas has a fixed key, so workers and processes hash values the same.
+    h = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+    registers = (h >> np.uint64(64 - PRECISION)).astype(np.int16)
+    ranks = np.minimum(_leading_zeros(h << np.uint64(PRECISION)) + 1, 64 - PRECISION + 1).astype(np.int8)
+
+    return registers, ranks
+
+
+def hll_sketches(df, keys, column):
+    """
+    Builds a sketch of the distinct values of 'column' for each group of rows.
+
+    Args:
+    -----
+        df (pd.DataFrame): data.
+        keys ([str]): columns of a group.
+        column (str): column whose distinct values are counted, nulls aren't counted.
+
+    Returns:
+    --------
+        pd.DataFrame: one row per group with its keys and its sketch as the arrays 'registers' (int16)
+            and 'ranks' (int8) of the non-zero registers. Groups without values have empty arrays.
+    """
+    # rows with nulls take register -1, which is dropped from the sketches.
+    valid = df[column].notna().to_numpy()
+    registers = np.full(len(df), -1, dtype=np.int16)
+    ranks = np.zeros(len(df), dtype=np.int8)
+    registers[valid], ranks[valid] = hll_registers(df.loc[valid, column])
+
+    # rows of a group are adjacent after the groupby.
+    df = (
+        df[keys]
+        .assign(registers=registers, ranks=ranks)
+        .groupby(keys + ["registers"], observed=True)["ranks"]
+        .max()
+        .reset_index()
+    )
+    starts = np.flatnonzero(~df.duplicated(keys).to_numpy())
+
+    # position of each group's first register once the -1 registers are dropped.
+    kept = df["registers"].to_numpy() >= 0
+    kept_starts = np.concatenate([[0], np.cumsum(kept)])[starts]
+
+    sketches = df.iloc[starts][keys].reset_index(drop=True)
+    for name, dtype in [("registers", np.int16), ("ranks", np.int8)]:
+        values = df[name].to_numpy(dtype=dtype)[kept]
+        sketches[name] = pd.Series(np.split(values, kept_starts)[1:], dtype=object)
+
+    return sketches
+
+
+def hll_estimate(df, keys):
+    """
+    Merges the sketches of rows with the same keys and estimates their number of distinct values.
+
+    Args:
+    -----
+        df (pd.DataFrame): rows with sketches, see 'hll_sketches'.
+        keys ([str]): columns of a group, all rows of a group are merged.
+
+    Returns:
+    --------
+        pd.Series: estimated number of distinct values of each group, indexed by the keys.
+    """
+    groups = df.groupby(keys, sort=True, observed=True)
+    codes = groups.ngroup().to_numpy()
+
+    lengths = df["registers"].map(len).to_numpy(dtype=np.int64)
+    flat_registers = np.concatenate([np.empty(0, dtype=np.int16), *df["registers"].to_numpy()]).astype(np.int64)
+    flat_ranks = np.concatenate([np.empty(0, dtype=np.int8), *df["ranks"].to_numpy()])
+
+    # merge: the maximum of each register of each group.
+    merged = pd.Series(flat_ranks).groupby(np.repeat(codes, lengths) * REGISTERS + flat_registers).max()
+    group = merged.index.to_numpy() // REGISTERS
+
+    n = groups.ngroups
+    present = np.bincount(group, minlength=n)
+    harmonic = np.bincount(group, weights=np.exp2(-merged.to_numpy(dtype=np.float64)), minlength=n)
+
+    # zero registers add 2^0 each to the harmonic sum.
+    zeros = REGISTERS - present
+    alpha = 0.7213 / (1 + 1.079 / REGISTERS)
+    estimate = alpha * REGISTERS**2 / (harmonic + zeros)
+
+    # linear counting of the empty registers is more accurate for small counts.
+    small = (estimate <= 2.5 * REGISTERS) & (zeros > 0)
+    estimate[small] = REGISTERS * np.log(REGISTERS / zeros[small])
+
+    index = groups.size().index
+    return pd.Series(np.round(estimate).astype(np.int64), index=index)
+
+
+def top_n_sketches(df, keys, columns, count, n):
+    """
+    Keeps the rows with the n largest counts of each group, and sums the counts of the other rows.
+
+    Args:
+    -----
+        df (pd.DataFrame): counts, one row per group and value of 'columns'.
+        keys ([str]): columns of a group.
+        columns ([str]): columns of a counted value, e.g. a contributor's id and login.
+        count (str): column of the counts.
+        n (int): values kept per group.
+
+    Returns:
+    --------
+        pd.DataFrame: the kept rows, and a remainder row per group with nulls in 'columns'
+            and the sum of the counts that weren't kept.
+    """
+    # largest counts first, ties in the order of the values so that the sketches are deterministic.
+    df = df.sort_values(keys + [count] + columns, ascending=[True] * len(keys) + [False] + [True] * len(columns))
+
+    kept = df.groupby(keys, sort=False, observed=True).cumcount().to_numpy() < n
+    rest = df[~kept].groupby(keys, observed=True, as_index=False)[count].sum()
+
+    return pd.concat([df[kept], rest], ignore_index=True)
+
+
+def top_values(df, column, count, k):
+    """
+    Merges top-n sketches and returns the k values with the largest counts.
+
+    A value's count is summed over the sketches that kept it, so it's a lower bound
+    when the value was in the remainder of some sketches. Remainder rows aren't values.
+
+    Args:
+    -----
+        df (pd.DataFrame): rows of sketches, see 'top_n_sketches', or exact counts.
+        column (str): column of the values.
+        count (str): column of the counts.
+        k (int): number of values.
+
+    Returns:
+    --------
+        pd.DataFrame: 'column' and 'count' of the k values, largest count first.
+    """
+    df = df.groupby(column, observed=True, as_index=False)[count].sum()
+
+    return df.sort_values([count, column], ascending=[False, True]).head(k).reset_index(drop=True)
@@ -7,8 +7,20 @@ import sqlalchemy as salc
 import os
 import logging
 import sys
+import io
+import time
+import redis
 import requests
 from sqlalchemy.exc import SQLAlchemyError
+from db_manager.search_index import SearchIndex
+from cache_manager.redis_clients import get_cache_client
+
+# Redis hash that holds the repo/org search index and the version of Augur's repo table it was built from.
+# workers that start later read the index from here instead of querying Augur for it.
+MULTISELECT_CACHE_KEY = "multiselect_index"
+
+# seconds between checks for a newer multiselect index in Redis, see 'refresh_multiselect'.
+MULTISELECT_CHECK_INTERVAL = int(os.getenv("MULTISELECT_CHECK_INTERVAL", "60"))
 
 
 class AugurManager:
@@ -50,12 +62,18 @@ class AugurManager:
         run_query(query_string):
             Runs a SQL-query against Augur database and returns resulting
             Pandas dataframe.
+
+        run_statement(statement):
+            Runs a SQL-statement that doesn't return rows (DDL, REFRESH, ...)
+            against Augur database in its own transaction.
     """
 
     def __init__(self, handles_oauth=False):
         # sqlalchemy engine object
         self.engine = None
         self.initial_search_option = None
+        self.multiselect_version = None
+        self._multiselect_next_check = 0.0
 
         # db connection credentials
         # if any are unavailable, raise error.
@@ -158,8 +176,42 @@ class AugurManager:
 
         return result_df
 
-    def multiselect_startup(self):
-        logging.warning(f"MULTISELECT_STARTUP")
+    def run_statement(self, statement: str):
+        """
+        Runs SQL statement that doesn't return rows against our Augur database.
+        Statement is committed if it succeeds.
+
+        Args:
+        -----
+            statement (str): SQL statement to run.
+        """
+        if self.engine is None:
+            logging.critical("No engine- please use 'get_engine' method to create engine.")
+            return None
+
+        # context managed transaction, commits on success and rolls back on error.
+        with self.engine.begin() as conn:
+            conn.execute(salc.sql.text(statement))
+
+    def _multiselect_version(self):
+        # cheap stamp of the repo table: changes whenever repos or orgs are added or removed.
+        # repos are joined like in '_query_multiselect', so the count is the number of its rows.
+        df = self.run_query(
+            """SELECT
+                    count(*) AS repos,
+                    max(r.repo_id) AS max_repo_id,
+                    (SELECT count(*) FROM repo_groups) AS orgs
+                FROM
+                    repo r
+                JOIN repo_groups rg
+                ON rg.repo_group_id = r.repo_group_id"""
+        )
+        return f"{df['repos'][0]}:{df['max_repo_id'][0]}:{df['orgs'][0]}"
+
+    def _query_multiselect(self, after_repo_id=None):
+        # rows of the search bar: one per repo, with the name of its org.
+        # with after_repo_id, only repos added after that one.
+        where = f"WHERE r.repo_id > {int(after_repo_id)}" if after_repo_id is not None else ""
 
         query_string = f"""SELECT DISTINCT
                             r.repo_git,
@@ -170,12 +222,138 @@ class AugurManager:
                             repo r
                         JOIN repo_groups rg
                         ON rg.repo_group_id = r.repo_group_id
+                        {where}
                         ORDER BY rg.rg_name"""
 
-        # query for search bar entry generation
-        df_search_bar = self.run_query(query_string)
-        logging.warning(f"MULTISELECT_QUERY")
+        return self.run_query(query_string)[["repo_git", "repo_id", "repo_name", "rg_name"]]
+
+    def _load_multiselect_index(self, version=None):
+        """
+        Reads the search bar rows from the cache.
+
+        Args:
+        -----
+            version (str | None): only return rows built from this version of the repo table.
+
+        Returns:
+        --------
+            (str, pd.DataFrame) | (None, None): version and cached rows, Nones if missing or stale.
+        """
+        try:
+            cached_version, data = get_cache_client().hmget(MULTISELECT_CACHE_KEY, "version", "data")
+        except redis.exceptions.RedisError as err:
+            logging.error(f"MULTISELECT_CACHE - NOT READ: {err}")
+            return None, None
+
+        if cached_version is None or (version is not None and cached_version.decode() != version):
+            logging.warning(f"MULTISELECT_CACHE - STALE OR MISSING")
+            return None, None
+
+        return cached_version.decode(), pd.read_feather(io.BytesIO(data))
+
+    def _store_multiselect_index(self, version, df):
+        """
+        Writes the search bar rows to the cache for workers that start later.
+        Running workers pick them up when they see the new version.
+
+        Args:
+        -----
+            version (str): version of the repo table the rows are from.
+            df (pd.DataFrame): rows of the search bar query.
+        """
+        buf = io.BytesIO()
+        df.reset_index(drop=True).to_feather(buf)
+        try:
+            get_cache_client().hset(MULTISELECT_CACHE_KEY, mapping={"version": version, "data": buf.getvalue()})
+        except redis.exceptions.RedisError as err:
+            logging.error(f"MULTISELECT_CACHE - NOT WRITTEN: {err}")
+
+    def multiselect_startup(self):
+        logging.warning(f"MULTISELECT_STARTUP")
+
+        # only the first worker to start after the repo table
+        # changes runs the full query, the rest read its result.
+        version = self._multiselect_version()
+        _, df_search_bar = self._load_multiselect_index(version)
+
+        if df_search_bar is None:
+            # query for search bar entry generation
+            df_search_bar = self._query_multiselect()
+            logging.warning(f"MULTISELECT_QUERY")
+
+            self._store_multiselect_index(version, df_search_bar)
+        else:
+            logging.warning(f"MULTISELECT_CACHE - HIT: {version}")
 
+        self._set_multiselect(version, df_search_bar)
+
+        logging.warning(f"MULTISELECT_FINISHED")
+
+    def update_multiselect_index(self):
+        """
+        Brings the cached search bar rows up to date with the repo table.
+
+        Repos with a repo_id above the highest cached one are queried and appended.
+        If that doesn't account for every repo (repos were removed), all rows are queried again.
+        Workers load the new rows when they see the new version, see 'refresh_multiselect'.
+
+        Returns:
+        --------
+            bool: whether the cached rows changed.
+        """
+        version = self._multiselect_version()
+        cached_version, df = self._load_multiselect_index()
+
+        if cached_version == version:
+            return False
+
+        if df is not None and len(df) > 0:
+            df_new = self._query_multiselect(after_repo_id=df["repo_id"].max())
+            df = pd.concat([df, df_new], ignore_index=True).sort_values("rg_name", kind="stable")
+            logging.warning(f"MULTISELECT_UPDATE - {len(df_new)} NEW REPOS")
+
+        if df is None or len(df) != int(version.split(":")[0]):
+            df = self._query_multiselect()
+            logging.warning(f"MULTISELECT_UPDATE - FULL QUERY")
+
+        self._store_multiselect_index(version, df)
+        return True
+
+    def refresh_multiselect(self):
+        """
+        Reloads the search bar options and repo/org maps from the cache if a newer
+        version was stored since this process loaded them. Checks Redis at most
+        every MULTISELECT_CHECK_INTERVAL seconds, so getters can call it on every use.
+        """
+        now = time.monotonic()
+        if now < self._multiselect_next_check:
+            return
+        self._multiselect_next_check = now + MULTISELECT_CHECK_INTERVAL
+
+        try:
+            cached_version = get_cache_client().hget(MULTISELECT_CACHE_KEY, "version")
+        except redis.exceptions.RedisError as err:
+            logging.error(f"MULTISELECT_CACHE - NOT READ: {err}")
+            return
+
+        if cached_version is None or cached_version.decode() == self.multiselect_version:
+            return
+
+        version, df_search_bar = self._load_multiselect_index(cached_version.decode())
+        if df_search_bar is not None:
+            self._set_multiselect(version, df_search_bar)
+            logging.warning(f"MULTISELECT_REFRESHED - {version}")
+
+    def _set_multiselect(self, version, df_search_bar):
+        """
+        Builds the search bar options and the repo/org maps from the search bar rows
+        and replaces the current ones all at once.
+
+        Args:
+        -----
+            version (str): version of the repo table the rows are from.
+            df_search_bar (pd.DataFrame): rows of the search bar query.
+        """
         # create a list of dictionaries for the MultiSelect dropdown
         # component on the index page.
         # Output is of the form: [{"label": repo_url, "value": repo_id}, ...]
@@ -191,25 +369,36 @@ class AugurManager:
 
         # combine options for multiselect component and sort them by the length
         # of their label (shorter comes first because it sorts ascending by default.)
-        self.multiselect_options = multiselect_repos + multiselect_orgs
-        self.multiselect_options = sorted(self.multiselect_options, key=lambda i: i["label"])
+        multiselect_options = multiselect_repos + multiselect_orgs
+        multiselect_options = sorted(multiselect_options, key=lambda i: i["label"])
 
         # create a dictionary to map github orgs to their constituent repos.
         # used when the user selects an org
         # Output is of the form: {group_name: [rid1, rid2, ...], group_name: [...], ...}
         df_lower_repo_names = df_search_bar.copy()
         df_lower_repo_names["rg_name"] = df_lower_repo_names["rg_name"].apply(str.lower)
-        self.org_name_to_repos_dict = df_lower_repo_names.groupby("rg_name")["repo_id"].apply(list).to_dict()
-        self.org_names = list(self.org_name_to_repos_dict.keys())
+        org_name_to_repos_dict = df_lower_repo_names.groupby("rg_name")["repo_id"].apply(list).to_dict()
 
         # create a dictionary that maps the github url to the repo_id in database
         df_repo_git_id = df_search_bar.copy()
         df_repo_git_id = df_repo_git_id[["repo_git", "repo_id"]]
-        self.repo_git_to_repo_id = pd.Series(df_repo_git_id.repo_id.values, index=df_repo_git_id["repo_git"]).to_dict()
-        # self.repo_id_to_repo_git = {value: key for (key, value) in self.repo_git_to_repo_id.items()}
-        self.repo_id_to_repo_git = pd.Series(df_repo_git_id.repo_git.values, index=df_repo_git_id["repo_id"]).to_dict()
-
-        logging.warning(f"MULTISELECT_FINISHED")
+        repo_git_to_repo_id = pd.Series(df_repo_git_id.repo_id.values, index=df_repo_git_id["repo_git"]).to_dict()
+        repo_id_to_repo_git = pd.Series(df_repo_git_id.repo_git.values, index=df_repo_git_id["repo_id"]).to_dict()
+
+        # a single dict.update, so callbacks in other threads never see
+        # options of one version together with maps of another.
+        self.__dict__.update(
+            {
+                "multiselect_version": version,
+                "multiselect_options": multiselect_options,
+                # index for the search bar's substring matching, so typing doesn't scan every option.
+                "search_index": SearchIndex(multiselect_options),
+                "org_name_to_repos_dict": org_name_to_repos_dict,
+                "org_names": set(org_name_to_repos_dict.keys()),
+                "repo_git_to_repo_id": repo_git_to_repo_id,
+                "repo_id_to_repo_git": repo_id_to_repo_git,
+            }
+        )
 
     def repo_git_to_id(self, git):
         """Getter method for dictionary
@@ -222,6 +411,7 @@ class AugurManager:
         Returns:
             int: repo_id of the URL in the source DB.
         """
+        self.refresh_multiselect()
         return self.repo_git_to_repo_id.get(git)
 
     def repo_id_to_git(self, id):
@@ -233,6 +423,7 @@ class AugurManager:
         Returns:
             git (str): URL of repo
         """
+        self.refresh_multiselect()
         return self.repo_id_to_repo_git.get(id)
 
     def org_to_repos(self, org):
@@ -244,6 +435,7 @@ class AugurManager:
         Returns:
             [int] | None: repo_ids or None
         """
+        self.refresh_multiselect()
         return self.org_name_to_repos_dict[org]
 
     def is_org(self, org):
@@ -255,6 +447,7 @@ class AugurManager:
         Returns:
             bool: whether org name is in orgs
         """
+        self.refresh_multiselect()
         return org in self.org_names
 
     def initial_multiselect_option(self):
@@ -288,8 +481,35 @@ class AugurManager:
         Returns:
             [{label, value}]: multiselect options
         """
+        self.refresh_multiselect()
         return self.multiselect_options
 
+    def search_multiselect_options(self, user_in, limit=100):
+        """Returns the multiselect options whose label
+        contains the searched text, shortest label first.
+
+        Args:
+            user_in (str): text typed in the search bar.
+            limit (int): maximum number of options returned.
+
+        Returns:
+            [{label, value}]: matching multiselect options
+        """
+        self.refresh_multiselect()
+        return self.search_index.search(user_in, limit)
+
+    def get_multiselect_option(self, value):
+        """Getter method for the multiselect option with a value.
+
+        Args:
+            value (int | str): repo_id or lowercase org name
+
+        Returns:
+            {label, value} | None: option or None
+        """
+        self.refresh_multiselect()
+        return self.search_index.get(value)
+
     def make_user_request(self, access_token, headers={}, params={}):
         """Large parts of code written by John McGinness, University of Missouri
 
@@ -0,0 +1,97 @@
+import logging
+import threading
+
+"""
+Substring search over the repo/org options of the search bar.
+
+Options are ranked shortest label first, like the search bar always did, and
+are numbered in that order. Every trigram of a lowercase label maps to the
+ascending numbers of the options that contain it, so the matches of a query
+are found by walking the shortest list of one of its trigrams in rank order
+and stopping as soon as enough options contain the whole query. A query of
+less than three characters has no trigram and walks all options in rank
+order instead, which stops early because short queries match many labels.
+
+The trigram lists are built on the first search, so processes that import
+the app but never search (e.g. Celery callback workers) don't build them.
+"""
+
+
+def _trigrams(s):
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class SearchIndex:
+    """
+    Trigram index of search bar options.
+
+    Args:
+    -----
+        options ([{label, value}]): options of the search bar.
+    """
+
+    def __init__(self, options):
+        # rank order: shorter labels first, ties by label.
+        self.options = sorted(options, key=lambda o: (len(o["label"]), o["label"]))
+        self.labels = [o["label"].lower() for o in self.options]
+        self.by_value = {o["value"]: o for o in self.options}
+
+        self.postings = None
+        self._lock = threading.Lock()
+
+    def _get_postings(self):
+        with self._lock:
+            if self.postings is None:
+                postings = {}
+                for rank, label in enumerate(self.labels):
+                    for t in _trigrams(label):
+                        postings.setdefault(t, []).append(rank)
+
+                self.postings = postings
+                logging.warning(f"SEARCH_INDEX - {len(self.options)} OPTIONS - {len(postings)} TRIGRAMS")
+        return self.postings
+
+    def search(self, query, limit=100):
+        """
+        Returns the best ranked options whose label contains the query, ignoring case.
+
+        Args:
+        -----
+            query (str): text typed in the search bar.
+            limit (int): maximum number of options returned.
+
+        Returns:
+        --------
+            [{label, value}]: matching options, shortest label first.
+        """
+        query = query.lower()
+        trigrams = _trigrams(query)
+
+        if trigrams:
+            # any trigram of the query is in every match, the rarest one has the fewest candidates.
+            postings = self._get_postings()
+            candidates = min((postings.get(t, []) for t in trigrams), key=len)
+        else:
+            candidates = range(len(self.options))
+
+        matches = []
+        for rank in candidates:
+            if query in self.labels[rank]:
+                matches.append(self.options[rank])
+                if len(matches) == limit:
+                    break
+        return matches
+
+    def get(self, value):
+        """
+        Returns the option with a value, None if there's none.
+
+        Args:
+        -----
+            value (int | str): repo_id or lowercase org name.
+
+        Returns:
+        --------
+            {label, value} | None: option.
+        """
+        return self.by_value.get(value)
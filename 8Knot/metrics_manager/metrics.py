@@ -0,0 +1,252 @@
+import redis
+import time
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from metrics_manager import profiler
+from cache_manager.redis_clients import get_cache_client
+
+"""
+Application metrics in the Prometheus text format.
+
+The app-server, callback workers and query workers all run in separate
+processes (and pods), so observations are aggregated in Redis instead of
+in process memory. Every process writes to the same hashes and the
+'/metrics' route of the app-server (see _metrics.py) renders all of them,
+so one scrape target covers the whole application.
+"""
+
+# prefix of the Redis hash that holds the samples of each metric.
+METRICS_KEY_PREFIX = "metrics:"
+
+# Celery queues whose length is reported. Celery's Redis broker stores each queue as a list,
+# and tasks sent with a priority n > 0 in a list '<queue>:<n>' (see _celery.py).
+CELERY_QUEUES = ["celery", "data", "data-bulk"]
+
+# upper bounds, in seconds, of histogram buckets.
+BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0]
+
+# name -> (type, help) of every metric that is exposed.
+METRICS = {
+    "eightknot_callback_duration_seconds": (
+        "histogram",
+        "Duration of visualization callbacks, including the wait for data.",
+    ),
+    "eightknot_callback_phase_seconds": (
+        "histogram",
+        "Duration of the wait, process_data and create_figure phases of visualization callbacks.",
+    ),
+    "eightknot_grabm_wait_seconds": (
+        "histogram",
+        "Time visualization callbacks wait for cached query data.",
+    ),
+    "eightknot_query_duration_seconds": (
+        "histogram",
+        "Duration of query tasks.",
+    ),
+    "eightknot_cache_requests_total": (
+        "counter",
+        "Repos requested per query, by whether their data was already cached.",
+    ),
+    "eightknot_celery_queue_length": (
+        "gauge",
+        "Tasks waiting in each Celery queue.",
+    ),
+}
+
+# phase timings of the callback that's running in this thread.
+_active = threading.local()
+
+
+def _label_string(labels):
+    return ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    """
+    Increments a counter.
+    Failing to write the metric doesn't fail the caller.
+
+    Args:
+    -----
+        name (str): name of the counter, key of METRICS.
+        value (int): amount to increment by.
+        labels (str): label values of the sample.
+    """
+    try:
+        get_cache_client().hincrbyfloat(f"{METRICS_KEY_PREFIX}{name}", _label_string(labels), value)
+    except redis.exceptions.RedisError as err:
+        logging.error(f"METRICS - {name} NOT WRITTEN: {err}")
+
+
+def observe(name, value, **labels):
+    """
+    Adds an observation to a histogram.
+    Failing to write the metric doesn't fail the caller.
+
+    Args:
+    -----
+        name (str): name of the histogram, key of METRICS.
+        value (float): observed value, in seconds.
+        labels (str): label values of the sample.
+    """
+    ls = _label_string(labels)
+    key = f"{METRICS_KEY_PREFIX}{name}"
+
+    try:
+        p = get_cache_client().pipeline(transaction=False)
+        # buckets are cumulative, every bucket that's large enough counts the observation.
+        for le in BUCKETS:
+            if value <= le:
+                p.hincrby(key, f"bucket|{le}|{ls}", 1)
+        p.hincrbyfloat(key, f"sum||{ls}", value)
+        p.hincrby(key, f"count||{ls}", 1)
+        p.execute()
+    except redis.exceptions.RedisError as err:
+        logging.error(f"METRICS - {name} NOT WRITTEN: {err}")
+
+
+def record_phase(name, seconds):
+    """
+    Adds seconds to a phase of the callback that's running in this thread.
+    Does nothing outside of a callback decorated with observe_callback.
+
+    Args:
+    -----
+        name (str): name of the phase, e.g. 'wait' or 'process_data'.
+        seconds (float): time spent in the phase.
+    """
+    timings = getattr(_active, "timings", None)
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name):
+    """
+    Context manager that adds the time spent in its block
+    to a phase of the callback that's running in this thread.
+
+    Args:
+    -----
+        name (str): name of the phase, e.g. 'process_data'.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def observe_callback(viz):
+    """
+    Decorator that logs and records the duration of a callback
+    in eightknot_callback_duration_seconds, and of the phases of
+    the callback in eightknot_callback_phase_seconds.
+
+    Phases are timed with 'phase' and 'record_phase' in the callback.
+    If VIZ_PROFILE_TOP_N is set, the callback is run under a sampling profiler
+    and the profiles of its slowest invocations are kept.
+
+    Args:
+    -----
+        viz (str): label of the callback, '<PAGE>-<VIZ_ID>' for visualizations.
+    """
+
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            logging.warning(f"{viz}_VIZ - START")
+
+            outer = getattr(_active, "timings", None)
+            _active.timings = timings = {}
+
+            sampler = None
+            if profiler.VIZ_PROFILE_TOP_N > 0:
+                sampler = profiler.SamplingProfiler(threading.get_ident())
+                sampler.start()
+
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                total = time.perf_counter() - start
+                _active.timings = outer
+
+                if sampler is not None:
+                    sampler.stop()
+                    profiler.keep_if_slowest(viz, total, sampler)
+
+                phases = " - ".join(f"{name}: {seconds:.3f}" for name, seconds in timings.items())
+                logging.warning(f"{viz}_VIZ - END - {total:.3f}" + (f" - {phases}" if phases else ""))
+
+                observe("eightknot_callback_duration_seconds", total, viz=viz)
+                for name, seconds in timings.items():
+                    observe("eightknot_callback_phase_seconds", seconds, viz=viz, phase=name)
+
+        return wrapper
+
+    return decorator
+
+
+def _sample(name, ls, value):
+    return f"{name}{{{ls}}} {value}" if ls else f"{name} {value}"
+
+
+def _render_histogram(name, samples):
+    # group fields 'kind|le|labels' by label set
+    series = {}
+    for field, value in samples.items():
+        kind, le, ls = field.split("|", 2)
+        series.setdefault(ls, {})[(kind, le)] = value
+
+    lines = []
+    for ls, values in sorted(series.items()):
+        sep = "," if ls else ""
+        for le in BUCKETS:
+            lines.append(f'{name}_bucket{{{ls}{sep}le="{le}"}} {values.get(("bucket", str(le)), 0)}')
+        lines.append(f'{name}_bucket{{{ls}{sep}le="+Inf"}} {values.get(("count", ""), 0)}')
+        lines.append(_sample(f"{name}_sum", ls, values.get(("sum", ""), 0)))
+        lines.append(_sample(f"{name}_count", ls, values.get(("count", ""), 0)))
+    return lines
+
+
+def render_metrics():
+    """
+    Renders all metrics in the Prometheus text exposition format.
+
+    Returns:
+    --------
+        str: metrics page.
+    """
+    r = get_cache_client(decode_responses=True)
+
+    p = r.pipeline(transaction=False)
+    for q in CELERY_QUEUES:
+        for key in [q] + [f"{q}:{n}" for n in range(1, 10)]:
+            p.llen(key)
+    lengths = iter(p.execute())
+
+    gauges = {
+        "eightknot_celery_queue_length": {
+            _label_string({"queue": q}): sum(next(lengths) for _ in range(10)) for q in CELERY_QUEUES
+        },
+    }
+
+    lines = []
+    for name, (kind, help) in METRICS.items():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        if kind == "gauge":
+            samples = gauges.get(name, {})
+        else:
+            samples = r.hgetall(f"{METRICS_KEY_PREFIX}{name}")
+
+        if kind == "histogram":
+            lines.extend(_render_histogram(name, samples))
+        else:
+            lines.extend(_sample(name, ls, v) for ls, v in sorted(samples.items()))
+
+    return "\n".join(lines) + "\n"
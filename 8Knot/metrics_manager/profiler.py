@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+import heapq
+import logging
+import tempfile
+import threading
+from collections import Counter
+
+# number of slowest invocations of each callback whose profile is kept, 0 disables profiling.
+VIZ_PROFILE_TOP_N = int(os.getenv("VIZ_PROFILE_TOP_N", "0"))
+
+# seconds between two samples of the profiled thread's stack.
+VIZ_PROFILE_INTERVAL = float(os.getenv("VIZ_PROFILE_INTERVAL", "0.005"))
+
+# directory that profiles are written to, one file per kept invocation.
+VIZ_PROFILE_DIR = os.getenv("VIZ_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "8knot-profiles"))
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread from a background thread.
+
+    Sampling doesn't slow down the profiled code the way tracing
+    profilers (cProfile) do, so timings of profiled callbacks stay comparable.
+
+    Attributes
+    ----------
+        thread_id : id of the sampled thread.
+
+        interval : seconds between samples.
+
+        samples : Counter of folded stack -> number of times it was sampled.
+
+    Methods
+    -------
+        start():
+            Starts sampling.
+
+        stop():
+            Stops sampling and waits for the sampling thread to exit.
+
+        folded():
+            Returns the samples in the folded format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=VIZ_PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self):
+        """
+        Returns the samples as one 'frame;frame;frame count' line per stack, root first.
+
+        Returns:
+        --------
+            str: folded stacks.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+# callback -> min-heap of (duration, path) of the profiles kept for the callback.
+_slowest = {}
+_slowest_lock = threading.Lock()
+
+
+def keep_if_slowest(viz, duration, profiler):
+    """
+    Writes the profile of an invocation of a callback if the invocation is one
+    of the VIZ_PROFILE_TOP_N slowest of the callback in this process, and deletes
+    the profile that it displaces.
+
+    Args:
+    -----
+        viz (str): label of the callback.
+        duration (float): seconds the invocation took.
+        profiler (SamplingProfiler): stopped profiler of the invocation.
+    """
+    with _slowest_lock:
+        heap = _slowest.setdefault(viz, [])
+        if len(heap) >= VIZ_PROFILE_TOP_N and duration <= heap[0][0]:
+            return
+
+        os.makedirs(VIZ_PROFILE_DIR, exist_ok=True)
+        path = os.path.join(VIZ_PROFILE_DIR, f"{viz}-{int(duration * 1000)}ms-{os.getpid()}-{time.time_ns()}.folded")
+        with open(path, "w") as f:
+            f.write(profiler.folded())
+
+        heapq.heappush(heap, (duration, path))
+        if len(heap) > VIZ_PROFILE_TOP_N:
+            _, evicted = heapq.heappop(heap)
+            try:
+                os.remove(evicted)
+            except OSError:
+                pass
+
+    logging.warning(f"{viz}_VIZ - PROFILE - {path}")
@@ -0,0 +1,178 @@
+import redis
+import os
+import time
+import json
+import logging
+from contextlib import contextmanager
+from metrics_manager import metrics
+from cache_manager.redis_clients import get_cache_client
+
+# Redis stream that every query task appends its metrics to.
+QUERY_METRICS_STREAM = "query_metrics"
+
+# approximate number of entries kept in the stream, oldest are trimmed first.
+QUERY_METRICS_MAXLEN = int(os.getenv("QUERY_METRICS_MAXLEN", "10000"))
+
+# seconds of SQL time after which the query's plan is captured with EXPLAIN (ANALYZE, BUFFERS).
+# the query is run a second time to get its plan, so this is disabled (0) by default.
+QUERY_EXPLAIN_THRESHOLD = float(os.getenv("QUERY_EXPLAIN_THRESHOLD", "0"))
+
+# number of largest per-repo blobs recorded for each run.
+TOP_BLOBS = 10
+
+
+class QueryMetrics:
+    """
+    Collects timings and sizes of one run of a query task
+    and publishes them to a Redis stream.
+
+    Attributes
+    ----------
+        query_name : name of the query, QUERY_NAME of the query's module.
+
+        repos : repos that the query was run on.
+
+        timings : seconds spent in each phase of the query.
+
+        rows : number of rows returned by the SQL query.
+
+        result_bytes : in-memory size of the SQL query's result.
+
+        blob_sizes : repo -> size of the repo's feather blob.
+
+        plan : EXPLAIN (ANALYZE, BUFFERS) of the query, None if not captured.
+
+    Methods
+    -------
+        phase(name):
+            Context manager that adds the time spent in its block to timings[name].
+
+        record_result(df):
+            Records rows and in-memory size of the SQL query's result.
+
+        record_blobs([repo], [data]):
+            Records the size of each repo's blob.
+
+        explain(dbm, query_string):
+            Captures the query's plan if the query was slower than QUERY_EXPLAIN_THRESHOLD.
+
+        publish():
+            Logs the metrics and appends them to the QUERY_METRICS_STREAM stream.
+    """
+
+    def __init__(self, query_name, repos):
+        self.query_name = query_name
+        self.repos = repos
+        self.timings = {}
+        self.rows = 0
+        self.result_bytes = 0
+        self.blob_sizes = {}
+        self.plan = None
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Adds the time spent in the block to timings[name].
+        Re-entering the same phase, e.g. in a loop, accumulates.
+
+        Args:
+        -----
+            name (str): name of the phase, e.g. 'sql' or 'serialize'.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start)
+
+    def record_result(self, df):
+        """
+        Records the number of rows and the in-memory size of the SQL query's result.
+
+        Args:
+        -----
+            df (pd.DataFrame): result of the SQL query.
+        """
+        self.rows = len(df)
+        self.result_bytes = int(df.memory_usage(deep=True).sum())
+
+    def record_blobs(self, repos, datas):
+        """
+        Records the size of the blob of each repo.
+
+        Args:
+        -----
+            repos ([int]): repos that blobs were created for.
+            datas ([bytes]): blob of each repo, in the same order.
+        """
+        self.blob_sizes = {r: len(d) for r, d in zip(repos, datas)}
+
+    def explain(self, dbm, query_string):
+        """
+        Captures the query's plan with EXPLAIN (ANALYZE, BUFFERS) if the
+        query took longer than QUERY_EXPLAIN_THRESHOLD seconds.
+
+        Must be called after the 'sql' phase.
+
+        Args:
+        -----
+            dbm (AugurManager): manager with an engine.
+            query_string (str): SQL query that was run.
+        """
+        if QUERY_EXPLAIN_THRESHOLD <= 0 or self.timings.get("sql", 0.0) < QUERY_EXPLAIN_THRESHOLD:
+            return
+
+        try:
+            df = dbm.run_query(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query_string}")
+            self.plan = json.dumps(df.iat[0, 0])
+        except Exception as err:
+            # the plan is extra information, the query's data was already fetched.
+            logging.error(f"{self.query_name}_DATA_QUERY - EXPLAIN FAILED: {err}")
+
+    def publish(self):
+        """
+        Logs the metrics and appends them to the QUERY_METRICS_STREAM stream.
+        Failing to publish doesn't fail the query.
+        """
+        largest = sorted(self.blob_sizes.items(), key=lambda i: i[1], reverse=True)[:TOP_BLOBS]
+
+        fields = {
+            "query": self.query_name,
+            "repos": len(self.repos),
+            "rows": self.rows,
+            "result_bytes": self.result_bytes,
+            "blob_bytes": sum(self.blob_sizes.values()),
+            "largest_blobs": json.dumps({str(r): s for r, s in largest}),
+            "total_time": round(time.perf_counter() - self._start, 6),
+        }
+        for name, seconds in self.timings.items():
+            fields[f"{name}_time"] = round(seconds, 6)
+
+        logging.warning(f"{self.query_name}_DATA_QUERY - METRICS - {json.dumps(fields)}")
+        metrics.observe("eightknot_query_duration_seconds", fields["total_time"], query=self.query_name)
+
+        if self.plan is not None:
+            fields["plan"] = self.plan
+
+        try:
+            get_cache_client().xadd(QUERY_METRICS_STREAM, fields, maxlen=QUERY_METRICS_MAXLEN, approximate=True)
+        except redis.exceptions.RedisError as err:
+            logging.error(f"{self.query_name}_DATA_QUERY - METRICS NOT PUBLISHED: {err}")
+
+
+def read_query_metrics(count=1000):
+    """
+    Reads the most recent entries of the QUERY_METRICS_STREAM stream.
+
+    Args:
+    -----
+        count (int): maximum number of entries to read.
+
+    Returns:
+    --------
+        [dict]: metrics of each query run, newest first.
+    """
+    entries = get_cache_client(decode_responses=True).xrevrange(QUERY_METRICS_STREAM, count=count)
+
+    return [dict(fields, id=entry_id) for entry_id, fields in entries]
@@ -8,11 +8,10 @@ import logging
 from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
-from queries.commits_query import commits_query as cq
+from queries.commit_activity_query import commit_activity_query as cq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
 
 PAGE = "affiliation"
@@ -46,7 +45,8 @@ gc_commit_domains = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -130,18 +130,19 @@ def toggle_popover(n, is_open):
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "start_date"),
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "end_date"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def commit_domains_graph(repolist, num, start_date, end_date):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def commit_domains_graph(set_progress, repolist, num, start_date, end_date):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=cq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=cq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=cq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, num, start_date, end_date)),
+    )
 
     # test if there is data
     if df.empty:
@@ -149,11 +150,12 @@ def commit_domains_graph(repolist, num, start_date, end_date):
         return nodata_graph
 
     # function for all data pre processing, COULD HAVE ADDITIONAL INPUTS AND OUTPUTS
-    df = process_data(df, num, start_date, end_date)
+    with phase("process_data"):
+        df = process_data(df, num, start_date, end_date)
 
-    fig = create_figure(df)
+    with phase("create_figure"):
+        fig = create_figure(df)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig
 
 
@@ -172,19 +174,8 @@ def process_data(df: pd.DataFrame, num, start_date, end_date):
     if end_date is not None:
         df = df[df.author_timestamp <= end_date]
 
-    # creates list of emails for each contribution and flattens list result
-    emails = df.author_email.tolist()
-
-    # remove any entries not in email format
-    emails = [x for x in emails if "@" in x]
-
-    # creates list of email domains from the emails list
-    email_domains = [x[x.rindex("@") + 1 :] for x in emails]
-
-    # creates df of domains and counts
-    df = pd.DataFrame(email_domains, columns=["domains"]).value_counts().to_frame().reset_index()
-
-    df = df.rename(columns={0: "occurrences"})
+    # counts commits per email domain, commits whose email isn't in email format have no domain
+    df = df.groupby("author_domain").size().reset_index(name="occurrences").rename(columns={"author_domain": "domains"})
 
     # changes the name of the company if under a certain threshold
     df.loc[df.occurrences <= num, "domains"] = "Other"
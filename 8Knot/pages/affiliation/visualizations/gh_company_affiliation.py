@@ -8,11 +8,17 @@ import logging
 from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
-from queries.company_query import company_query as cmq
+from queries.contributors_query import contributors_query as cnq
+from queries.affiliation_query import affiliation_query as afq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import (
+    nodata_graph,
+    wait_for_joined_data,
+    loading_parent_style,
+    partial_graph,
+    partial_progress,
+)
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
 from fuzzywuzzy import fuzz
 
@@ -45,7 +51,8 @@ gc_gh_company_affiliation = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -127,18 +134,21 @@ def toggle_popover(n, is_open):
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "start_date"),
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "end_date"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def gh_company_affiliation_graph(repolist, num, start_date, end_date):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def gh_company_affiliation_graph(set_progress, repolist, num, start_date, end_date):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=cmq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=cmq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_joined_data(
+        func=cnq,
+        dimension=afq,
+        on="cntrb_id",
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, num, start_date, end_date)),
+    )
 
     # test if there is data
     if df.empty:
@@ -146,11 +156,12 @@ def gh_company_affiliation_graph(repolist, num, start_date, end_date):
         return nodata_graph
 
     # function for all data pre processing, COULD HAVE ADDITIONAL INPUTS AND OUTPUTS
-    df = process_data(df, num, start_date, end_date)
+    with phase("process_data"):
+        df = process_data(df, num, start_date, end_date)
 
-    fig = create_figure(df)
+    with phase("create_figure"):
+        fig = create_figure(df)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig
 
 
@@ -160,16 +171,16 @@ def process_data(df: pd.DataFrame, num, start_date, end_date):
     requiring no further processing."""
 
     # convert to datetime objects rather than strings
-    df["created"] = pd.to_datetime(df["created"], utc=True)
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
 
     # order values chronologically by COLUMN_TO_SORT_BY date
-    df = df.sort_values(by="created", axis=0, ascending=True)
+    df = df.sort_values(by="created_at", axis=0, ascending=True)
 
     # filter values based on date picker
     if start_date is not None:
-        df = df[df.created >= start_date]
+        df = df[df.created_at >= start_date]
     if end_date is not None:
-        df = df[df.created <= end_date]
+        df = df[df.created_at <= end_date]
 
     # intital count of same company name in github profile
     result = df.cntrb_company.value_counts(dropna=False)
@@ -8,11 +8,11 @@ import logging
 from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
-from queries.company_query import company_query as cmq
+from queries.contributors_query import contributors_query as cnq
+from queries.email_domains_query import email_domains_query as edq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
 
 PAGE = "affiliation"
@@ -45,7 +45,8 @@ gc_unique_domains = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -127,18 +128,22 @@ def toggle_popover(n, is_open):
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "start_date"),
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "end_date"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def unique_domains_graph(repolist, num, start_date, end_date):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def unique_domains_graph(set_progress, repolist, num, start_date, end_date):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=cmq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=cmq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    # emails of the selection's contributors, the actions are counted toward their domains.
+    emails = wait_for_data(func=edq, repolist=repolist)
+
+    df = wait_for_data(
+        func=cnq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, emails, num, start_date, end_date)),
+    )
 
     # test if there is data
     if df.empty:
@@ -146,40 +151,33 @@ def unique_domains_graph(repolist, num, start_date, end_date):
         return nodata_graph
 
     # function for all data pre processing, COULD HAVE ADDITIONAL INPUTS AND OUTPUTS
-    df = process_data(df, num, start_date, end_date)
+    with phase("process_data"):
+        df = process_data(df, emails, num, start_date, end_date)
 
-    fig = create_figure(df)
+    with phase("create_figure"):
+        fig = create_figure(df)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig
 
 
-def process_data(df: pd.DataFrame, num, start_date, end_date):
+def process_data(df: pd.DataFrame, emails: pd.DataFrame, num, start_date, end_date):
     # convert to datetime objects rather than strings
-    df["created"] = pd.to_datetime(df["created"], utc=True)
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
 
     # order values chronologically by COLUMN_TO_SORT_BY date
-    df = df.sort_values(by="created", axis=0, ascending=True)
+    df = df.sort_values(by="created_at", axis=0, ascending=True)
 
     # filter values based on date picker
     if start_date is not None:
-        df = df[df.created >= start_date]
+        df = df[df.created_at >= start_date]
     if end_date is not None:
-        df = df[df.created <= end_date]
-
-    # creates list of unique emails and flattens list result
-    emails = df.email_list.str.split(" , ").explode("email_list").unique().tolist()
+        df = df[df.created_at <= end_date]
 
-    # remove any entries not in email format
-    emails = [x for x in emails if "@" in x]
-
-    # creates list of email domains from the emails list
-    email_domains = [x[x.rindex("@") + 1 :] for x in emails]
+    # unique emails of the contributors with actions in the date range
+    emails = emails[emails.cntrb_id.isin(df.cntrb_id.unique())].drop_duplicates(subset="email")
 
     # creates df of domains and counts
-    df = pd.DataFrame(email_domains, columns=["domains"]).value_counts().to_frame().reset_index()
-
-    df = df.rename(columns={0: "occurences"})
+    df = emails.groupby("domain").size().reset_index(name="occurences").rename(columns={"domain": "domains"})
 
     # changes the name of the company if under a certain threshold
     df.loc[df.occurences <= num, "domains"] = "Other"
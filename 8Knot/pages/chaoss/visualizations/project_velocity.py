@@ -9,10 +9,11 @@ from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.contributors_query import contributors_query as ctq
+from queries.contributor_sketches_query import contributor_sketches_query as csq
+from cache_manager.sketches import hll_estimate, EXACT_MAX_REPOS
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
 import math
 import numpy as np
@@ -46,7 +47,8 @@ gc_project_velocity = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -227,21 +229,35 @@ def toggle_popover(n, is_open):
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "start_date"),
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "end_date"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
+@observe_callback(f"{PAGE}-{VIZ_ID}")
 def project_velocity_graph(
-    repolist, log, i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight, start_date, end_date
+    set_progress, repolist, log, i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight, start_date, end_date
 ):
 
-    # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
+    weights = (i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight)
 
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # wait for data to asynchronously download and become available.
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    if len(set(repolist)) <= EXACT_MAX_REPOS:
+        process = process_data
+        df = wait_for_data(
+            func=ctq,
+            repolist=repolist,
+            set_progress=set_progress,
+            render=lambda d: create_figure(process_data(d, start_date, end_date, *weights), log),
+        )
+    else:
+        # large selections are estimated from per-month sketches instead of counted from every action.
+        process = process_sketches
+        df = wait_for_data(
+            func=csq,
+            repolist=repolist,
+            set_progress=set_progress,
+            render=lambda d: create_figure(process_sketches(d, start_date, end_date, *weights), log),
+        )
 
     # test if there is data
     if df.empty:
@@ -249,11 +265,12 @@ def project_velocity_graph(
         return nodata_graph
 
     # function for all data pre processing
-    df = process_data(df, start_date, end_date, i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight)
+    with phase("process_data"):
+        df = process(df, start_date, end_date, *weights)
 
-    fig = create_figure(df, log)
+    with phase("create_figure"):
+        fig = create_figure(df, log)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig
 
 
@@ -292,6 +309,35 @@ def process_data(
     # pivot df to reformat the actions to be columns and repo_id to be rows
     df_actions = df_actions.pivot(index="repo_name", columns="Action", values="count")
 
+    return consolidate(df_actions, df_cntrbs, i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight)
+
+
+def process_sketches(
+    df: pd.DataFrame,
+    start_date,
+    end_date,
+    i_o_weight,
+    i_c_weight,
+    pr_o_weight,
+    pr_m_weight,
+    pr_c_weight,
+):
+    # keep the months that overlap the date picker's range
+    if start_date is not None:
+        df = df[df.month >= pd.Timestamp(start_date, tz="UTC").replace(day=1)]
+    if end_date is not None:
+        df = df[df.month <= end_date]
+
+    # estimate of the unique contributors of each repo, from the merged sketches of its months and actions
+    df_cntrbs = hll_estimate(df, ["repo_name"]).to_frame("num_unique_contributors")
+
+    # counts of the actions by repo
+    df_actions = df.pivot_table(index="repo_name", columns="Action", values="actions", aggfunc="sum")
+
+    return consolidate(df_actions, df_cntrbs, i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight)
+
+
+def consolidate(df_actions, df_cntrbs, i_o_weight, i_c_weight, pr_o_weight, pr_m_weight, pr_c_weight):
     # df_consolidated combines the actions and unique contributors and then specific columns for visualization use are added on
     df_consolidated = pd.concat([df_actions, df_cntrbs], axis=1).reset_index()
 
@@ -10,9 +10,8 @@ import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.issue_assignee_query import issue_assignee_query as iaq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
 
 PAGE = "contributions"
@@ -44,7 +43,8 @@ gc_cntrib_issue_assignment = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -143,29 +143,31 @@ def toggle_popover(n, is_open):
         Input(f"date-radio-{PAGE}-{VIZ_ID}", "value"),
         Input(f"assignments-required-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def cntrib_issue_assignment_graph(repolist, interval, assign_req):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def cntrib_issue_assignment_graph(set_progress, repolist, interval, assign_req):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=iaq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=iaq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=iaq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval, assign_req), interval),
+    )
 
     # test if there is data
     if df.empty:
         logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph, False
 
-    df = process_data(df, interval, assign_req)
+    with phase("process_data"):
+        df = process_data(df, interval, assign_req)
 
-    fig = create_figure(df, interval)
+    with phase("create_figure"):
+        fig = create_figure(df, interval)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig, False
 
 
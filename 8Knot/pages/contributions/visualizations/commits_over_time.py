@@ -7,11 +7,11 @@ import pandas as pd
 import logging
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
-from queries.commits_query import commits_query as cmq
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
+from pages.utils.time_bins import count_by_interval
+from queries.commit_activity_query import commit_activity_query as cmq
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import io
-import time
 
 PAGE = "contributions"
 VIZ_ID = "commits-over-time"
@@ -41,7 +41,8 @@ gc_commits_over_time = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -112,31 +113,33 @@ def toggle_popover(n, is_open):
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def commits_over_time_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def commits_over_time_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=cmq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=cmq, repos=repolist)
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=cmq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval), interval),
+    )
 
     # data ready.
-    start = time.perf_counter()
-    logging.warning("COMMITS_OVER_TIME_VIZ - START")
-
     # test if there is data
     if df.empty:
-        logging.warning("COMMITS OVER TIME - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df_created = process_data(df, interval)
+    with phase("process_data"):
+        df_created = process_data(df, interval)
 
-    fig = create_figure(df_created, interval)
+    with phase("create_figure"):
+        fig = create_figure(df_created, interval)
 
-    logging.warning(f"COMMITS_OVER_TIME_VIZ - END - {time.perf_counter() - start}")
     return fig
 
 
@@ -146,23 +149,8 @@ def process_data(df: pd.DataFrame, interval):
     df["date"] = pd.to_datetime(df["date"], utc=True)
     df.rename(columns={"date": "created"}, inplace=True)
 
-    # variable to slice on to handle weekly period edge case
-    period_slice = None
-    if interval == "W":
-        # this is to slice the extra period information that comes with the weekly case
-        period_slice = 10
-
-    # get the count of commits in the desired interval in pandas period format, sort index to order entries
-    df_created = (
-        df.groupby(by=df.created.dt.to_period(interval))["commits"]
-        .count()
-        .reset_index()
-        .rename(columns={"created": "Date"})
-    )
-
-    # converts date column to a datetime object, converts to string first to handle period information
-    # the period slice is to handle weekly corner case
-    df_created["Date"] = pd.to_datetime(df_created["Date"].astype(str).str[:period_slice])
+    # get the count of commits per time bin from the first to the last bin
+    df_created = count_by_interval(df, ["created"], interval).rename(columns={"created": "commits"})
 
     return df_created
 
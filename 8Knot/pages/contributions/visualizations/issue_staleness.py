@@ -11,10 +11,9 @@ from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.issues_query import issues_query as iq
-from pages.utils.job_utils import nodata_graph
-from cache_manager.cache_manager import CacheManager as cm
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import io
-import time
 
 PAGE = "contributions"
 VIZ_ID = "issue-staleness"
@@ -46,7 +45,8 @@ gc_issue_staleness = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -162,9 +162,11 @@ def toggle_popover(n, is_open):
         Input(f"staling-days-{PAGE}-{VIZ_ID}", "value"),
         Input(f"stale-days-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def new_staling_issues_graph(repolist, interval, staling_interval, stale_interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def new_staling_issues_graph(set_progress, repolist, interval, staling_interval, stale_interval):
     # conditional for the intervals to be valid options
     if staling_interval > stale_interval:
         return dash.no_update, True
@@ -173,26 +175,26 @@ def new_staling_issues_graph(repolist, interval, staling_interval, stale_interva
         return dash.no_update, dash.no_update
 
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=iq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=iq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning("ISSUES STALENESS - START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=iq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval, staling_interval, stale_interval), interval),
+    )
 
     # test if there is data
     if df.empty:
-        logging.warning("ISSUE STALENESS - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph, False
 
     # function for all data pre processing
-    df_status = process_data(df, interval, staling_interval, stale_interval)
+    with phase("process_data"):
+        df_status = process_data(df, interval, staling_interval, stale_interval)
 
-    fig = create_figure(df_status, interval)
+    with phase("create_figure"):
+        fig = create_figure(df_status, interval)
 
-    logging.warning(f"ISSUE STALENESS - END - {time.perf_counter() - start}")
     return fig, False
 
 
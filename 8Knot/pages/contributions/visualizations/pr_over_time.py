@@ -8,11 +8,11 @@ import pandas as pd
 import datetime as dt
 import logging
 from pages.utils.graph_utils import get_graph_time_values, color_seq
+from pages.utils.time_bins import count_by_interval
 import io
-from pages.utils.job_utils import nodata_graph
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 from queries.prs_query import prs_query as prq
-from cache_manager.cache_manager import CacheManager as cm
-import time
 
 PAGE = "contributions"
 VIZ_ID = "prs-over-time"
@@ -42,7 +42,8 @@ gc_pr_over_time = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -113,31 +114,32 @@ def toggle_popover(n, is_open):
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def prs_over_time_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def prs_over_time_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=prq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=prq, repos=repolist)
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=prq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(*process_data(d, interval), interval),
+    )
 
     # data ready.
-    start = time.perf_counter()
-    logging.warning("PULL REQUESTS OVER TIME - START")
-
     # test if there is data
     if df.empty:
-        logging.warning("PULL REQUESTS OVER TIME - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df_created, df_closed_merged, df_open = process_data(df, interval)
-
-    fig = create_figure(df_created, df_closed_merged, df_open, interval)
+    with phase("process_data"):
+        df_created, df_closed_merged, df_open = process_data(df, interval)
 
-    logging.warning(f"PRS_OVER_TIME_VIZ - END - {time.perf_counter() - start}")
+    with phase("create_figure"):
+        fig = create_figure(df_created, df_closed_merged, df_open, interval)
 
     return fig
 
@@ -151,44 +153,11 @@ def process_data(df: pd.DataFrame, interval):
     # order values chronologically by creation date
     df = df.sort_values(by="created", axis=0, ascending=True)
 
-    # variable to slice on to handle weekly period edge case
-    period_slice = None
-    if interval == "W":
-        # this is to slice the extra period information that comes with the weekly case
-        period_slice = 10
-
-    # --data frames for PR created, merged, or closed. Detailed description applies for all 3.--
-
-    # get the count of created prs in the desired interval in pandas period format, sort index to order entries
-    created_range = df["created"].dt.to_period(interval).value_counts().sort_index()
-
-    # converts to data frame object and created date column from period values
-    df_created = created_range.to_frame().reset_index().rename(columns={"index": "Date"})
-
-    # converts date column to a datetime object, converts to string first to handle period information
-    # the period slice is to handle weekly corner case
-    df_created["Date"] = pd.to_datetime(df_created["Date"].astype(str).str[:period_slice])
-
-    # df for merged prs in time interval
-    merged_range = pd.to_datetime(df["merged"]).dt.to_period(interval).value_counts().sort_index()
-    df_merged = merged_range.to_frame().reset_index().rename(columns={"index": "Date"})
-    df_merged["Date"] = pd.to_datetime(df_merged["Date"].astype(str).str[:period_slice])
-
-    # df for closed prs in time interval
-    closed_range = pd.to_datetime(df["closed"]).dt.to_period(interval).value_counts().sort_index()
-    df_closed = closed_range.to_frame().reset_index().rename(columns={"index": "Date"})
-    df_closed["Date"] = pd.to_datetime(df_closed["Date"].astype(str).str[:period_slice])
+    # --data frames for PR created, merged, or closed, counts per time bin from the first to the last bin--
+    df_created = count_by_interval(df, ["created"], interval)
 
     # A single df created for plotting merged and closed as stacked bar chart
-    df_closed_merged = pd.merge(df_merged, df_closed, on="Date", how="outer")
-
-    # formatting for graph generation
-    if interval == "M":
-        df_created["Date"] = df_created["Date"].dt.strftime("%Y-%m-01")
-        df_closed_merged["Date"] = df_closed_merged["Date"].dt.strftime("%Y-%m-01")
-    elif interval == "Y":
-        df_created["Date"] = df_created["Date"].dt.strftime("%Y-01-01")
-        df_closed_merged["Date"] = df_closed_merged["Date"].dt.strftime("%Y-01-01")
+    df_closed_merged = count_by_interval(df, ["merged", "closed"], interval)
 
     df_closed_merged["closed"] = df_closed_merged["closed"] - df_closed_merged["merged"]
 
@@ -10,9 +10,8 @@ import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.contributors_query import contributors_query as ctq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 
 PAGE = "contributors"
 VIZ_ID = "active-drifting-contributors"
@@ -43,7 +42,8 @@ gc_active_drifting_contributors = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -159,9 +159,11 @@ def toggle_popover(n, is_open):
         Input(f"drifting-months-{PAGE}-{VIZ_ID}", "value"),
         Input(f"away-months-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def active_drifting_contributors_graph(repolist, interval, drift_interval, away_interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def active_drifting_contributors_graph(set_progress, repolist, interval, drift_interval, away_interval):
     # conditional for the intervals to be valid options
     if drift_interval is None or away_interval is None:
         return dash.no_update, dash.no_update
@@ -170,26 +172,26 @@ def active_drifting_contributors_graph(repolist, interval, drift_interval, away_
         return dash.no_update, True
 
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
-
-    logging.warning(f"ACTIVE_DRIFTING_CONTRIBUTOR_GROWTH_VIZ - START")
-    start = time.perf_counter()
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=ctq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval, drift_interval, away_interval), interval),
+    )
 
     # test if there is data
     if df.empty:
-        logging.warning("PULL REQUEST STALENESS - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph, False
 
     # function for all data pre processing
-    df_status = process_data(df, interval, drift_interval, away_interval)
+    with phase("process_data"):
+        df_status = process_data(df, interval, drift_interval, away_interval)
 
-    fig = create_figure(df_status, interval)
+    with phase("create_figure"):
+        fig = create_figure(df_status, interval)
 
-    logging.warning(f"ACTIVE_DRIFTING_CONTRIBUTOR_GROWTH_VIZ - END - {time.perf_counter() - start}")
     return fig, False
 
 
@@ -4,19 +4,22 @@ import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 import logging
 from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
-from queries.commits_query import commits_query as cmq
+from queries.commit_activity_query import commit_activity_query as cmq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 
 PAGE = "contributors"
 VIZ_ID = "contrib-activity-cycle"
 
+# weekdays in the order of the query's weekday numbers, 0 is Sunday
+WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
 
 gc_contrib_activity_cycle = dbc.Card(
     [
@@ -43,7 +46,8 @@ gc_contrib_activity_cycle = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -110,18 +114,19 @@ def toggle_popover(n, is_open):
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def contrib_activity_cycle_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def contrib_activity_cycle_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=cmq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=cmq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=cmq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval), interval),
+    )
 
     # test if there is data
     if df.empty:
@@ -129,58 +134,34 @@ def contrib_activity_cycle_graph(repolist, interval):
         return nodata_graph
 
     # function for all data pre processing, COULD HAVE ADDITIONAL INPUTS AND OUTPUTS
-    df = process_data(df, interval)
+    with phase("process_data"):
+        df = process_data(df, interval)
 
-    fig = create_figure(df, interval)
+    with phase("create_figure"):
+        fig = create_figure(df, interval)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig
 
 
 def process_data(df: pd.DataFrame, interval):
-    # for this usecase we want the datetimes to be in their local values
-    # tricking pandas to keep local values when UTC conversion is required for to_datetime
-    df["author_timestamp"] = df["author_timestamp"].astype("str").str[:-6]
-    df["committer_timestamp"] = df["committer_timestamp"].astype("str").str[:-6]
-
-    # convert to datetime objects rather than strings
-    df["author_timestamp"] = pd.to_datetime(df["author_timestamp"], utc=True)
-    df["committer_timestamp"] = pd.to_datetime(df["committer_timestamp"], utc=True)
-    # removes duplicate values when the author and committer is the same
-    df.loc[df["author_timestamp"] == df["committer_timestamp"], "author_timestamp"] = None
-
-    df_final = pd.DataFrame()
-
+    # hours and weekdays of the author and committer times are computed by the query,
+    # -1 where there's no time or the author time is the committer time.
     if interval == "H":
-        # combine the hour values for author and committer
-        hour = pd.concat([df["author_timestamp"].dt.hour, df["committer_timestamp"].dt.hour])
-        df_hour = pd.DataFrame(hour, columns=["Hour"])
-        df_final = df_hour.groupby(["Hour"])["Hour"].count()
+        columns, labels, name = ["author_hour", "committer_hour"], list(range(24)), "Hour"
     else:
-        # combine the weekday values for author and committer
-        weekday = pd.concat(
-            [
-                df["author_timestamp"].dt.day_name(),
-                df["committer_timestamp"].dt.day_name(),
-            ]
-        )
-        df_weekday = pd.DataFrame(weekday, columns=["Weekday"])
-        df_final = df_weekday.groupby(["Weekday"])["Weekday"].count()
+        columns, labels, name = ["author_weekday", "committer_weekday"], WEEKDAYS, "Weekday"
+
+    # count the author and committer values together
+    values = np.concatenate([df[c].to_numpy() for c in columns])
+    counts = np.bincount(values[values >= 0], minlength=len(labels))
+
+    df_final = pd.Series(counts, index=pd.Index(labels, name=name), name=name)
 
     return df_final
 
 
 def create_figure(df: pd.DataFrame, interval):
     column = "Weekday"
-    order = [
-        "Sunday",
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-        "Saturday",
-    ]
     if interval == "H":
         column = "Hour"
 
@@ -191,7 +172,7 @@ def create_figure(df: pd.DataFrame, interval):
     fig.update_traces(hovertemplate=hover)
     fig.update_xaxes(
         categoryorder="array",
-        categoryarray=order,
+        categoryarray=WEEKDAYS,
     )
     fig.update_layout(
         yaxis_title="Activity Count",
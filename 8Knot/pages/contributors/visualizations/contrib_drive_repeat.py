@@ -7,11 +7,11 @@ import pandas as pd
 import logging
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
-from pages.utils.job_utils import nodata_graph
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 from queries.contributors_query import contributors_query as ctq
-import time
+from queries.contributor_lifecycle_query import contributor_lifecycle_query as clq, merge_repos
 import io
-from cache_manager.cache_manager import CacheManager as cm
 
 PAGE = "contributors"
 VIZ_ID = "contrib-drive-repeat"
@@ -44,7 +44,8 @@ gc_contrib_drive_repeat = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -151,47 +152,51 @@ def graph_title(view):
         Input(f"contributions-required-{PAGE}-{VIZ_ID}", "value"),
         Input(f"graph-view-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def repeat_drive_by_graph(repolist, contribs, view):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def repeat_drive_by_graph(set_progress, repolist, contribs, view):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    # contributions of each contributor of the selection, the actions are split by them.
+    lifecycle = merge_repos(wait_for_data(func=clq, repolist=repolist))
+
+    df = wait_for_data(
+        func=ctq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, lifecycle, view, contribs)),
+    )
 
     # data ready.
-    start = time.perf_counter()
-    logging.warning("CONTRIB_DRIVE_REPEAT_VIZ - START")
-
     # test if there is data
     if df.empty:
-        logging.warning("CONTRIB DRIVE REPEAT - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df_cont_subset = process_data(df, view, contribs)
+    with phase("process_data"):
+        df_cont_subset = process_data(df, lifecycle, view, contribs)
 
     # test if there is data
     if df_cont_subset.empty:
-        logging.warning("CONTRIB DRIVE REPEAT - NO DRIVE OR REPEAT DATA")
+        logging.warning(f"{VIZ_ID} - NO DRIVE OR REPEAT DATA")
         return nodata_graph
 
-    fig = create_figure(df_cont_subset)
-
-    logging.warning(f"CONTRIB_DRIVE_REPEAT_VIZ - END - {time.perf_counter() - start}")
+    with phase("create_figure"):
+        fig = create_figure(df_cont_subset)
 
     return fig
 
 
-def process_data(df, view, contribs):
+def process_data(df, lifecycle, view, contribs):
     # convert to datetime objects with consistent column name
     df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
     df.rename(columns={"created_at": "created"}, inplace=True)
 
-    # graph on contribution subset
-    contributors = df["cntrb_id"][df["rank"] == contribs].to_list()
+    # graph on contribution subset, contributors with at least 'contribs' contributions are repeat contributors
+    contributors = lifecycle["cntrb_id"][lifecycle["contributions"] >= contribs]
     df_cont_subset = pd.DataFrame(df)
 
     # filtering data by view
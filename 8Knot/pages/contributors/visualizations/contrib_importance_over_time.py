@@ -12,11 +12,9 @@ import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.contributors_query import contributors_query as ctq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
-from scipy import stats
 
 PAGE = "contributors"
 VIZ_ID = "contrib-prolificacy-over-time"
@@ -57,7 +55,8 @@ gc_contrib_prolificacy_over_time = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -228,23 +227,25 @@ def graph_title(window_width):
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "start_date"),
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "end_date"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
+@observe_callback(f"{PAGE}-{VIZ_ID}")
 def create_contrib_prolificacy_over_time_graph(
-    repolist, patterns, threshold, window_width, step_size, start_date, end_date
+    set_progress, repolist, patterns, threshold, window_width, step_size, start_date, end_date
 ):
-    # main function for all data pre processing
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
+    # wait for data to asynchronously download and become available.
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=ctq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(
+            process_data(d, patterns, threshold, window_width, step_size, start_date, end_date), step_size
+        ),
+    )
 
     # data ready.
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
-
     # test if there is data
     if df.empty:
         logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
@@ -254,11 +255,12 @@ def create_contrib_prolificacy_over_time_graph(
     if step_size > window_width:
         return dash.no_update, True
 
-    df_final = process_data(df, patterns, threshold, window_width, step_size, start_date, end_date)
+    with phase("process_data"):
+        df_final = process_data(df, patterns, threshold, window_width, step_size, start_date, end_date)
 
-    fig = create_figure(df_final, step_size)
+    with phase("create_figure"):
+        fig = create_figure(df_final, step_size)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig, False
 
 
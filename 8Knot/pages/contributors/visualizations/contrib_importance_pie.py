@@ -11,10 +11,11 @@ from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.contributors_query import contributors_query as ctq
+from queries.top_contributors_query import top_contributors_query as tcq
+from cache_manager.sketches import top_values, EXACT_MAX_REPOS
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import datetime as dt
 
 PAGE = "contributors"
@@ -52,7 +53,8 @@ gc_contrib_importance_pie = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -211,18 +213,34 @@ def graph_title(k, action_type):
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "start_date"),
         Input(f"date-picker-range-{PAGE}-{VIZ_ID}", "end_date"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def create_top_k_cntrbs_graph(repolist, action_type, top_k, patterns, start_date, end_date):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def create_top_k_cntrbs_graph(set_progress, repolist, action_type, top_k, patterns, start_date, end_date):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    if len(set(repolist)) <= EXACT_MAX_REPOS:
+        process = process_data
+        df = wait_for_data(
+            func=ctq,
+            repolist=repolist,
+            set_progress=set_progress,
+            render=lambda d: create_figure(
+                process_data(d, action_type, top_k, patterns, start_date, end_date), action_type
+            ),
+        )
+    else:
+        # large selections are ranked from the cached top contributors of each month instead of every action.
+        process = process_sketches
+        df = wait_for_data(
+            func=tcq,
+            repolist=repolist,
+            set_progress=set_progress,
+            render=lambda d: create_figure(
+                process_sketches(d, action_type, top_k, patterns, start_date, end_date), action_type
+            ),
+        )
 
     # test if there is data
     if df.empty:
@@ -234,11 +252,12 @@ def create_top_k_cntrbs_graph(repolist, action_type, top_k, patterns, start_date
         return dash.no_update, True
 
     # function for all data pre processing
-    df = process_data(df, action_type, top_k, patterns, start_date, end_date)
+    with phase("process_data"):
+        df = process(df, action_type, top_k, patterns, start_date, end_date)
 
-    fig = create_figure(df, action_type)
+    with phase("create_figure"):
+        fig = create_figure(df, action_type)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig, False
 
 
@@ -265,20 +284,41 @@ def process_data(df: pd.DataFrame, action_type, top_k, patterns, start_date, end
         df = df[~patterns_mask]
 
     # count the number of contributions for each contributor
-    df = (df.groupby("cntrb_id")["Action"].count()).to_frame()
-
-    # sort rows according to amount of contributions from greatest to least
-    df.sort_values(by="cntrb_id", ascending=False, inplace=True)
-    df = df.reset_index()
+    df = df.groupby("cntrb_id", observed=True, as_index=False)["Action"].count()
 
     # rename Action column to action_type
     df = df.rename(columns={"Action": action_type})
 
-    # get the number of total contributions
+    return top_contributors(df, action_type, top_k)
+
+
+def process_sketches(df: pd.DataFrame, action_type, top_k, patterns, start_date, end_date):
+    # keep the months that overlap the date picker's range
+    if start_date is not None:
+        df = df[df.month >= pd.Timestamp(start_date, tz="UTC").replace(day=1)]
+    if end_date is not None:
+        df = df[df.month <= end_date]
+
+    # subset the df such that it only contains rows where the Action column value is the action type
+    df = df[df["Action"].str.contains(action_type)]
+
+    # option to filter out potential bots, bots that aren't among a month's top contributors stay in "Other"
+    if patterns:
+        patterns_mask = df["login"].str.contains("|".join(patterns), na=False)
+        df = df[~patterns_mask]
+
+    # rename actions column to action_type
+    df = df.rename(columns={"actions": action_type})
+
+    return top_contributors(df, action_type, top_k)
+
+
+def top_contributors(df: pd.DataFrame, action_type, top_k):
+    # get the number of total contributions, rows without a contributor are included
     t_sum = df[action_type].sum()
 
-    # index df to get first k rows
-    df = df.head(top_k)
+    # k contributors with the most contributions, from greatest to least
+    df = top_values(df, "cntrb_id", action_type, top_k)
 
     # convert cntrb_id from type UUID to String
     df["cntrb_id"] = df["cntrb_id"].apply(lambda x: str(x).split("-")[0])
@@ -287,7 +327,7 @@ def process_data(df: pd.DataFrame, action_type, top_k, patterns, start_date, end
     df_sum = df[action_type].sum()
 
     # calculate the remaining contributions by taking the the difference of t_sum and df_sum
-    df = df.append({"cntrb_id": "Other", action_type: t_sum - df_sum}, ignore_index=True)
+    df = pd.concat([df, pd.DataFrame({"cntrb_id": ["Other"], action_type: [t_sum - df_sum]})], ignore_index=True)
 
     return df
 
@@ -10,9 +10,8 @@ import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.contributors_query import contributors_query as ctq
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 
 
 PAGE = "contributors"
@@ -43,7 +42,8 @@ gc_contribs_by_action = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -151,19 +151,19 @@ def toggle_popover(n, is_open):
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
         Input(f"action-dropdown-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def contribs_by_action_graph(repolist, interval, action):
-
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def contribs_by_action_graph(set_progress, repolist, interval, action):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=ctq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval, action), interval, action),
+    )
 
     # test if there is data
     if df.empty:
@@ -175,11 +175,12 @@ def contribs_by_action_graph(repolist, interval, action):
         return dash.no_update, True
 
     # function for all data pre processing
-    df = process_data(df, interval, action)
+    with phase("process_data"):
+        df = process_data(df, interval, action)
 
-    fig = create_figure(df, interval, action)
+    with phase("create_figure"):
+        fig = create_figure(df, interval, action)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig, False
 
 
@@ -8,12 +8,13 @@ import logging
 import numpy as np
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
+from pages.utils.time_bins import floor_times, count_by_interval
 
-from pages.utils.job_utils import nodata_graph
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 from queries.contributors_query import contributors_query as ctq
-import time
+from queries.contributor_lifecycle_query import contributor_lifecycle_query as clq, merge_repos
 import io
-from cache_manager.cache_manager import CacheManager as cm
 
 PAGE = "contributors"
 VIZ_ID = "contrib-types-over-time"
@@ -45,7 +46,8 @@ gc_contributors_over_time = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -135,34 +137,39 @@ def toggle_popover(n, is_open):
         Input(f"contributions-required-{PAGE}-{VIZ_ID}", "value"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def create_contrib_over_time_graph(repolist, contribs, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def create_contrib_over_time_graph(set_progress, repolist, contribs, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning("CONTRIB_DRIVE_REPEAT_VIZ - START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    # contributions of each contributor of the selection, the actions are split by them.
+    lifecycle = merge_repos(wait_for_data(func=clq, repolist=repolist))
+
+    df = wait_for_data(
+        func=ctq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, lifecycle, interval, contribs), interval),
+    )
 
     # test if there is data
     if df.empty:
-        logging.warning("PULL REQUESTS OVER TIME - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df_drive_repeat = process_data(df, interval, contribs)
+    with phase("process_data"):
+        df_drive_repeat = process_data(df, lifecycle, interval, contribs)
 
-    fig = create_figure(df_drive_repeat, interval)
+    with phase("create_figure"):
+        fig = create_figure(df_drive_repeat, interval)
 
-    logging.warning(f"CONTRIBUTIONS_OVER_TIME_VIZ - END - {time.perf_counter() - start}")
     return fig
 
 
-def process_data(df, interval, contribs):
+def process_data(df, lifecycle, interval, contribs):
     # convert to datetime objects with consistent column name
     df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
     df.rename(columns={"created_at": "created"}, inplace=True)
@@ -171,53 +178,17 @@ def process_data(df, interval, contribs):
     df.dropna(inplace=True)
 
     # create column for identifying Drive by and Repeat Contributors
-    contributors = df["cntrb_id"][df["rank"] == contribs].to_list()
-
-    # dfs for drive by and repeat contributors
-    df_drive_temp = df.loc[~df["cntrb_id"].isin(contributors)]
-    df_repeat_temp = df.loc[df["cntrb_id"].isin(contributors)]
-
-    # order values chronologically by creation date
-    df = df.sort_values(by="created", axis=0, ascending=True)
-
-    # variable to slice on to handle weekly period edge case
-    period_slice = None
-    if interval == "W":
-        # this is to slice the extra period information that comes with the weekly case
-        period_slice = 10
-
-    # df for drive by contributros in time interval
-    df_drive = (
-        # disable and re-enable formatter
-        # fmt: off
-        df_drive_temp.groupby(by=df_drive_temp.created.dt.to_period(interval))["cntrb_id"]
-        # fmt: on
-        .nunique()
-        .reset_index()
-        .rename(columns={"cntrb_id": "Drive", "created": "Date"})
-    )
-    df_drive["Date"] = pd.to_datetime(df_drive["Date"].astype(str).str[:period_slice])
-
-    # df for repeat contributors in time interval
-    df_repeat = (
-        # disable and re-enable formatter
-        # fmt: off
-        df_repeat_temp.groupby(by=df_repeat_temp.created.dt.to_period(interval))["cntrb_id"]
-        # fmt: on
-        .nunique()
-        .reset_index()
-        .rename(columns={"cntrb_id": "Repeat", "created": "Date"})
-    )
-    df_repeat["Date"] = pd.to_datetime(df_repeat["Date"].astype(str).str[:period_slice])
+    contributors = lifecycle["cntrb_id"][lifecycle["contributions"] >= contribs]
 
-    # A single df created for plotting merged and closed as stacked bar chart
-    df_drive_repeat = pd.merge(df_drive, df_repeat, on="Date", how="outer")
+    # each contributor is counted once per time bin, as a drive by or a repeat contributor
+    df = pd.DataFrame({"Date": floor_times(df["created"], interval), "cntrb_id": df["cntrb_id"].to_numpy()})
+    df = df.drop_duplicates()
+    repeat = df["cntrb_id"].isin(contributors)
 
-    # formating for graph generation
-    if interval == "M":
-        df_drive_repeat["Date"] = df_drive_repeat["Date"].dt.strftime("%Y-%m-01")
-    elif interval == "Y":
-        df_drive_repeat["Date"] = df_drive_repeat["Date"].dt.strftime("%Y-01-01")
+    # A single df created for plotting drive by and repeat contributors as stacked bar chart
+    df["Drive"] = df["Date"].where(~repeat)
+    df["Repeat"] = df["Date"].where(repeat)
+    df_drive_repeat = count_by_interval(df, ["Drive", "Repeat"], interval)
 
     return df_drive_repeat
 
@@ -3,15 +3,13 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import callback
 from dash.dependencies import Input, Output, State
-import pandas as pd
 import logging
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
-from queries.contributors_query import contributors_query as ctq
-from cache_manager.cache_manager import CacheManager as cm
+from queries.contributor_lifecycle_query import contributor_lifecycle_query as clq, merge_repos
 import io
-import time
-from pages.utils.job_utils import nodata_graph
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 
 PAGE = "contributors"
 VIZ_ID = "first-time-contribution"
@@ -41,7 +39,8 @@ gc_first_time_contributions = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Row(
                     dbc.Button(
@@ -75,43 +74,41 @@ def toggle_popover(n, is_open):
     [
         Input("repo-choices", "data"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def create_first_time_contributors_graph(repolist):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def create_first_time_contributors_graph(set_progress, repolist):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning("CONTRIB_DRIVE_REPEAT_VIZ - START")
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=clq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d)),
+    )
 
     # test if there is data
     if df.empty:
-        logging.warning("1ST CONTRIBUTIONS - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df = process_data(df)
+    with phase("process_data"):
+        df = process_data(df)
 
-    fig = create_figure(df)
+    with phase("create_figure"):
+        fig = create_figure(df)
 
-    logging.warning(f"1ST_CONTRIBUTIONS_VIZ - END - {time.perf_counter() - start}")
     return fig
 
 
 def process_data(df):
-    # convert to datetime objects with consistent column name
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    df.rename(columns={"created_at": "created"}, inplace=True)
-
-    # selection for 1st contribution only
-    df = df[df["rank"] == 1]
+    # one row per contributor of the selection, with their first contribution to any of its repos
+    df = merge_repos(df).rename(columns={"first_seen": "created", "first_action": "Action"})
 
     # reset index to be ready for plotly
-    df = df.reset_index()
+    df = df.reset_index(drop=True)
 
     return df
 
@@ -3,15 +3,14 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import callback
 from dash.dependencies import Input, Output, State
-import pandas as pd
 import logging
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
-from queries.contributors_query import contributors_query as ctq
+from pages.utils.time_bins import count_by_interval
+from queries.contributor_lifecycle_query import contributor_lifecycle_query as clq, merge_repos
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
-import time
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 
 PAGE = "contributors"
 VIZ_ID = "new-contributor"
@@ -40,7 +39,8 @@ gc_new_contributor = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -122,65 +122,47 @@ def graph_title(view):
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def new_contributor_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def new_contributor_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=ctq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=ctq, repos=repolist)
-
-    logging.warning("TOTAL_CONTRIBUTOR_GROWTH_VIZ - START")
-    start = time.perf_counter()
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=clq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(*process_data(d, interval), interval),
+    )
 
     # test if there is data
     if df.empty:
-        logging.warning("TOTAL_CONTRIBUTOR_GROWTH_VIZ - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df, df_contribs = process_data(df, interval)
+    with phase("process_data"):
+        df, df_contribs = process_data(df, interval)
 
-    fig = create_figure(df, df_contribs, interval)
+    with phase("create_figure"):
+        fig = create_figure(df, df_contribs, interval)
 
-    logging.warning(f"TOTAL_CONTRIBUTOR_GROWTH_VIZ - END - {time.perf_counter() - start}")
     return fig
 
 
 def process_data(df, interval):
-    # convert to datetime objects with consistent column name
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    df.rename(columns={"created_at": "created"}, inplace=True)
+    # one row per contributor of the selection, dated by their first contribution to any of its repos
+    df = merge_repos(df).rename(columns={"first_seen": "created"})
 
     # order from beginning of time to most recent
-    df = df.sort_values("created", axis=0, ascending=True)
-
-    """
-        Assume that the cntrb_id values are unique to individual contributors.
-        Find the first rank-1 contribution of the contributors, saving the created
-        date.
-    """
-
-    # keep only first contributions
-    df = df[df["rank"] == 1]
-
-    # get all of the unique entries by contributor ID
-    df.drop_duplicates(subset=["cntrb_id"], inplace=True)
-    df.reset_index(inplace=True)
+    df = df.sort_values("created", axis=0, ascending=True).reset_index(drop=True)
 
     if interval == -1:
         return df, None
 
-    # get the count of new contributors in the desired interval in pandas period format, sort index to order entries
-    created_range = pd.to_datetime(df["created"]).dt.to_period(interval).value_counts().sort_index()
-
-    # converts to data frame object and creates date column from period values
-    df_contribs = created_range.to_frame().reset_index().rename(columns={"index": "Date", "created": "contribs"})
-
-    # converts date column to a datetime object, converts to string first to handle period information
-    df_contribs["Date"] = pd.to_datetime(df_contribs["Date"].astype(str))
+    # get the count of new contributors per time bin from the first to the last bin
+    df_contribs = count_by_interval(df, ["created"], interval).rename(columns={"created": "contribs"})
 
     # correction for year binning -
     # rounded up to next year so this is a simple patch
@@ -7,11 +7,10 @@ import pandas as pd
 import logging
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
-from queries.commits_query import commits_query as cmq
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
+from queries.commit_activity_query import commit_activity_query as cmq
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import io
-import time
 
 PAGE = "cs4320"
 VIZ_ID = "commit-frequency"
@@ -40,7 +39,8 @@ gc_commit_freq = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -96,21 +96,23 @@ gc_commit_freq = dbc.Card(
 @callback(
     Output(f"{PAGE}-{VIZ_ID}", "figure"),
     [Input("repo-choices", "data")],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def commits_over_time_graph(repolist):
-    # Start time recorded
-    start = time.perf_counter()
-
-    cache = cm()
-    df = cache.grabm(func=cmq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=cmq, repos=repolist)
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def commits_over_time_graph(set_progress, repolist):
+    # wait for data to asynchronously download and become available.
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=cmq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d.rename(columns={"date": "created"}))),
+    )
 
     # Check if DataFrame is empty
     if df.empty:
-        logging.warning("COMMITS OVER TIME - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # Rename 'date' column to 'created'
@@ -118,12 +120,12 @@ def commits_over_time_graph(repolist):
         df.rename(columns={'date': 'created'}, inplace=True)
 
     # Continue with processing
-    df_created = process_data(df)
+    with phase("process_data"):
+        df_created = process_data(df)
 
-    fig = create_figure(df_created)
+    with phase("create_figure"):
+        fig = create_figure(df_created)
 
-    # Logging the end time and duration
-    logging.warning(f"COMMITS_OVER_TIME_VIZ - END - {time.perf_counter() - start}")
     return fig
 
 
@@ -7,11 +7,11 @@ import plotly.graph_objects as go
 import pandas as pd
 import logging
 from pages.utils.graph_utils import get_graph_time_values, color_seq
-from pages.utils.job_utils import nodata_graph
+from pages.utils.time_bins import count_by_interval
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 from queries.issues_query import issues_query as iq
-from cache_manager.cache_manager import CacheManager as cm
 import io
-import time
 
 PAGE = "cs4320"
 VIZ_ID = "issues-closed-over-time"
@@ -40,7 +40,8 @@ gc_issues_closed_over_time = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -99,27 +100,29 @@ gc_issues_closed_over_time = dbc.Card(
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def issues_over_time_graph(repolist, interval):
-    cache = cm()
-    df = cache.grabm(func=iq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=iq, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning("ISSUES OVER TIME - START")
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def issues_over_time_graph(set_progress, repolist, interval):
+    # wait for data to asynchronously download and become available.
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=iq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval), interval),
+    )
 
     if df.empty:
-        logging.warning("ISSUES OVER TIME - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
-    df_closed = process_data(df, interval)
+    with phase("process_data"):
+        df_closed = process_data(df, interval)
 
-    fig = create_figure(df_closed, interval)
-
-    logging.warning(f"ISSUES_OVER_TIME_VIZ - END - {time.perf_counter() - start}")
+    with phase("create_figure"):
+        fig = create_figure(df_closed, interval)
 
     return fig
 
@@ -129,20 +132,8 @@ def process_data(df: pd.DataFrame, interval):
     df["closed"] = pd.to_datetime(df["closed"], utc=True)
     df = df.sort_values(by="closed", axis=0, ascending=True)
 
-    period_slice = None
-    if interval == "W":
-        period_slice = 10
-
     # DataFrame for closed issues in the time interval
-    closed_range = pd.to_datetime(df["closed"]).dt.to_period(interval).value_counts().sort_index()
-    df_closed = closed_range.to_frame().reset_index().rename(columns={"index": "Date", "closed": "Closed"})
-    df_closed["Date"] = pd.to_datetime(df_closed["Date"].astype(str).str[:period_slice])
-
-    # Formatting for graph generation
-    if interval == "M":
-        df_closed["Date"] = df_closed["Date"].dt.strftime("%Y-%m-01")
-    elif interval == "Y":
-        df_closed["Date"] = df_closed["Date"].dt.strftime("%Y-01-01")
+    df_closed = count_by_interval(df, ["closed"], interval).rename(columns={"closed": "Closed"})
 
     return df_closed
 
@@ -7,11 +7,11 @@ import plotly.graph_objects as go
 import pandas as pd
 import logging
 from pages.utils.graph_utils import get_graph_time_values, color_seq
-from pages.utils.job_utils import nodata_graph
+from pages.utils.time_bins import count_by_interval
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 from queries.issues_query import issues_query as iq
-from cache_manager.cache_manager import CacheManager as cm
 import io
-import time
 
 PAGE = "cs4320"
 VIZ_ID = "cumulative-issues-over-time"
@@ -41,7 +41,8 @@ gc_cumulative_issues_over_time = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -112,31 +113,32 @@ def toggle_popover(n, is_open):
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def issues_over_time_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def issues_over_time_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=iq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=iq, repos=repolist)
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=iq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(*process_data(d, interval), interval),
+    )
 
     # data ready.
-    start = time.perf_counter()
-    logging.warning("ISSUES OVER TIME - START")
-
     # test if there is data
     if df.empty:
-        logging.warning("ISSUES OVER TIME - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    df_created, df_closed, df_open = process_data(df, interval)
-
-    fig = create_figure(df_created, df_closed, df_open, interval)
+    with phase("process_data"):
+        df_created, df_closed, df_open = process_data(df, interval)
 
-    logging.warning(f"ISSUES_OVER_TIME_VIZ - END - {time.perf_counter() - start}")
+    with phase("create_figure"):
+        fig = create_figure(df_created, df_closed, df_open, interval)
 
     return fig
 
@@ -149,36 +151,9 @@ def process_data(df: pd.DataFrame, interval):
     # order values chronologically by creation date
     df = df.sort_values(by="created", axis=0, ascending=True)
 
-    # variable to slice on to handle weekly period edge case
-    period_slice = None
-    if interval == "W":
-        # this is to slice the extra period information that comes with the weekly case
-        period_slice = 10
-
-    # data frames for issues created or closed. Detailed description applies for all 3.
-
-    # get the count of created issues in the desired interval in pandas period format, sort index to order entries
-    created_range = pd.to_datetime(df["created"]).dt.to_period(interval).value_counts().sort_index()
-
-    # converts to data frame object and creates date column from period values
-    df_created = created_range.to_frame().reset_index().rename(columns={"index": "Date"})
-
-    # converts date column to a datetime object, converts to string first to handle period information
-    # the period slice is to handle weekly corner case
-    df_created["Date"] = pd.to_datetime(df_created["Date"].astype(str).str[:period_slice])
-
-    # df for closed issues in time interval
-    closed_range = pd.to_datetime(df["closed"]).dt.to_period(interval).value_counts().sort_index()
-    df_closed = closed_range.to_frame().reset_index().rename(columns={"index": "Date"})
-    df_closed["Date"] = pd.to_datetime(df_closed["Date"].astype(str).str[:period_slice])
-
-    # formatting for graph generation
-    if interval == "M":
-        df_created["Date"] = df_created["Date"].dt.strftime("%Y-%m-01")
-        df_closed["Date"] = df_closed["Date"].dt.strftime("%Y-%m-01")
-    elif interval == "Y":
-        df_created["Date"] = df_created["Date"].dt.strftime("%Y-01-01")
-        df_closed["Date"] = df_closed["Date"].dt.strftime("%Y-01-01")
+    # data frames for issues created or closed, counts per time bin from the first to the last bin
+    df_created = count_by_interval(df, ["created"], interval)
+    df_closed = count_by_interval(df, ["closed"], interval)
 
     # first and last elements of the dataframe are the
     # earliest and latest events respectively
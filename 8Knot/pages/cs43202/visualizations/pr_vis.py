@@ -10,10 +10,9 @@ import datetime as dt
 import logging
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 import io
-from pages.utils.job_utils import nodata_graph
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 from queries.prs_query import prs_query as prq
-from cache_manager.cache_manager import CacheManager as cm
-import time
 
 PAGE = "cs43202"
 VIZ_ID = "prs-closure-time-distribution"
@@ -42,7 +41,8 @@ gc_pr_closure_time_distribution = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -111,31 +111,32 @@ def toggle_popover(n, is_open):
         Input("repo-choices", "data"),
         Input(f"date-interval-{PAGE}-{VIZ_ID}", "value"),
     ],
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def pr_closure_time_distribution_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def pr_closure_time_distribution_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=prq, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=prq, repos=repolist)
+    # repos that are already cached are drawn while the rest of the selection downloads.
+    df = wait_for_data(
+        func=prq,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(*process_data(d, interval), interval),
+    )
 
     # data ready.
-    start = time.perf_counter()
-    logging.warning("PULL REQUEST CLOSURE TIME DISTRIBUTION - START")
-
     # test if there is data
     if df.empty:
-        logging.warning("PULL REQUEST CLOSURE TIME DISTRIBUTION - NO DATA AVAILABLE")
+        logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
     # function for all data pre processing
-    closure_times, bin_edges = process_data(df, interval)
-
-    fig = create_figure(closure_times, bin_edges, interval)  # Pass interval argument
+    with phase("process_data"):
+        closure_times, bin_edges = process_data(df, interval)
 
-    logging.warning(f"PULL REQUEST CLOSURE TIME DISTRIBUTION - END - {time.perf_counter() - start}")
+    with phase("create_figure"):
+        fig = create_figure(closure_times, bin_edges, interval)  # Pass interval argument
 
     return fig
 
@@ -3,6 +3,7 @@ import dash_bootstrap_components as dbc
 from dash import callback
 from dash.dependencies import Input, Output, State
 from db_manager.augur_manager import AugurManager
+from metrics_manager.metrics import observe_callback
 
 # card for commit total for selected repos
 commit_total = dbc.Card(
@@ -119,6 +120,7 @@ gc_commit_metrics = dbc.Card(
     ],
     background=True,
 )
+@observe_callback("home-commit-count")
 def commit_count(repolist):
     """Queries Augur for the count of commits for repos in repolist
     Args:
@@ -138,11 +140,9 @@ def commit_count(repolist):
             /*commit_hash'es are unique per commit*/
             count(distinct c.cmt_commit_hash) as num_commits
         from
-            augur_data.commits c,
-            augur_data.repo r
+            augur_data.explorer_commits c
         where
-            r.repo_id in ({str(repolist)[1:-1]})
-            and c.repo_id = r.repo_id
+            c.repo_id in ({str(repolist)[1:-1]})
         """
     )
 
@@ -157,6 +157,7 @@ def commit_count(repolist):
     ],
     background=True,
 )
+@observe_callback("home-commit-lines-added")
 def commit_lines_delta(repolist):
     """Queries Augur for the average number of lines added per commit
     Args:
@@ -177,15 +178,14 @@ def commit_lines_delta(repolist):
             from
                 /*
                 * For each commit, get the total number of lines added/removed across all files in commit.
+                * explorer_commits has them per commit and repo, a commit can be in several repos (forks).
                 * */
                 (select
-                    sum(c.cmt_added) as lines_added, sum(c.cmt_removed) as lines_removed
+                    sum(c.lines_added) as lines_added, sum(c.lines_removed) as lines_removed
                 from
-                    augur_data.commits c,
-                    augur_data.repo r
+                    augur_data.explorer_commits c
                 where
-                    r.repo_id in ({str(repolist)[1:-1]})
-                    and c.repo_id = r.repo_id
+                    c.repo_id in ({str(repolist)[1:-1]})
                 group by c.cmt_commit_hash) as l_delta
         """
     )
@@ -200,6 +200,7 @@ def commit_lines_delta(repolist):
     ],
     background=True,
 )
+@observe_callback("home-files-per-commit")
 def files_per_commit(repolist):
     """Queries Augur for the number of files per commit for repos in repolist
     Args:
@@ -220,13 +221,11 @@ def files_per_commit(repolist):
         from
             (select
                 /*commit_hash'es are unique per commit*/
-                count(*) as num_files
+                sum(c.files_changed) as num_files
             from
-                augur_data.commits c,
-                augur_data.repo r
+                augur_data.explorer_commits c
             where
-                r.repo_id in ({str(repolist)[1:-1]})
-                and c.repo_id = r.repo_id
+                c.repo_id in ({str(repolist)[1:-1]})
             group by c.cmt_commit_hash) as f
         """
     )
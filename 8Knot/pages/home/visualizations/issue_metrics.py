@@ -5,6 +5,7 @@ from dash.dependencies import Input, Output, State
 from db_manager.augur_manager import AugurManager
 import numpy as np
 import pandas as pd
+from metrics_manager.metrics import observe_callback
 
 
 # card for number of open issues in the selected repo set
@@ -121,6 +122,7 @@ gc_issue_metrics = dbc.Card(
     ],
     background=True,
 )
+@observe_callback("home-avg-closed-issue-age")
 def avg_closed_issue_age(repolist):
     """Queries Augur for the avg age of closed issues for repos in repolist
     Args:
@@ -170,6 +172,7 @@ def avg_closed_issue_age(repolist):
     ],
     background=True,
 )
+@observe_callback("home-avg-open-issue-age")
 def avg_open_issue_age(repolist):
     """Queries Augur for the avg age of open issues for repos in repolist
     Args:
@@ -219,6 +222,7 @@ def avg_open_issue_age(repolist):
     ],
     background=True,
 )
+@observe_callback("home-closed-issue-count")
 def closed_issue_count(repolist):
     """Queries Augur for the count of closed issues for repos in repolist
     Args:
@@ -256,6 +260,7 @@ def closed_issue_count(repolist):
     ],
     background=True,
 )
+@observe_callback("home-open-issue-count")
 def open_issue_count(repolist):
     """Queries Augur for the count of open issues for repos in repolist
     Args:
@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 import logging
 from db_manager.augur_manager import AugurManager
+from metrics_manager.metrics import observe_callback
 
 # card for number of open prs in the selected repo set
 pr_open = dbc.Card(
@@ -172,6 +173,7 @@ gc_pr_metrics = dbc.Card(
     ],
     background=True,
 )
+@observe_callback("home-open-pr-count")
 def pr_count(repolist):
     """Queries Augur for the count of open prs for repos in repolist
     Args:
@@ -209,6 +211,7 @@ def pr_count(repolist):
     ],
     background=True,
 )
+@observe_callback("home-merged-pr-count")
 def merged_pr_count(repolist):
     """Queries Augur for the count of merged prs for repos in repolist
     Args:
@@ -246,6 +249,7 @@ def merged_pr_count(repolist):
     ],
     background=True,
 )
+@observe_callback("home-rejected-pr-count")
 def rejected_pr_count(repolist):
     """Queries Augur for the count of unmerged but closed prs for repos in repolist
     Args:
@@ -284,6 +288,7 @@ def rejected_pr_count(repolist):
     ],
     background=True,
 )
+@observe_callback("home-avg-open-pr-age")
 def avg_open_pr_age(repolist):
     """Queries Augur for the average age of open PRs for repos in repolist
     Args:
@@ -333,6 +338,7 @@ def avg_open_pr_age(repolist):
     ],
     background=True,
 )
+@observe_callback("home-avg-merged-pr-age")
 def avg_merged_pr_age(repolist):
     """Queries Augur for the average age of merged PRs for repos in repolist
     Args:
@@ -383,6 +389,7 @@ def avg_merged_pr_age(repolist):
     ],
     background=True,
 )
+@observe_callback("home-avg-pr-messages")
 def rejected_pr_count(repolist):
     """Queries Augur for the average # of messages on all PRs for repos in repolist
     Args:
@@ -12,21 +12,15 @@ from dash.dependencies import Input, Output, State
 from app import augur
 from flask_login import current_user
 from cache_manager.cache_manager import CacheManager as cm
-from queries.issues_query import issues_query as iq
-from queries.commits_query import commits_query as cq
-from queries.contributors_query import contributors_query as cnq
-from queries.prs_query import prs_query as prq
-from queries.company_query import company_query as cmq
-from queries.pr_assignee_query import pr_assignee_query as praq
-from queries.issue_assignee_query import issue_assignee_query as iaq
+from cache_manager.redis_clients import get_users_client
+from metrics_manager import metrics
 from queries.user_groups_query import user_groups_query as ugq
+from queries.query_list import QUERIES, cache_funcs
+from queries.cache_warming import record_selection
+from _celery import INTERACTIVE_QUEUE, BULK_QUEUE, BULK_QUERY_THRESHOLD, BULK_CHUNK_SIZE
 import redis
 import flask
 
-
-# list of queries to be run
-QUERIES = [iq, cq, cnq, prq, cmq, iaq, praq]
-
 # check if login has been enabled in config
 login_enabled = os.getenv("AUGUR_LOGIN_ENABLED", "False") == "True"
 
@@ -51,13 +45,8 @@ def kick_off_group_collection(url, n_clicks):
     """
     if current_user.is_authenticated:
         user_id = current_user.get_id()
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-        )
         try:
-            users_cache.ping()
+            groups_cached = get_users_client().exists(f"{user_id}_groups")
         except redis.exceptions.ConnectionError:
             logging.error("GROUP-COLLECTION: Could not connect to users-cache.")
             return dash.no_update
@@ -65,10 +54,10 @@ def kick_off_group_collection(url, n_clicks):
         # TODO: check how old groups are. If they're pretty old (threshold tbd) then requery
 
         # check if groups are not already cached, or if the refresh-button was pressed
-        if not users_cache.exists(f"{user_id}_groups") or (dash.ctx.triggered_id == "refresh-button"):
+        if not groups_cached or (dash.ctx.triggered_id == "refresh-button"):
             # kick off celery task to collect groups
             # on query worker queue,
-            return [ugq.apply_async(args=[user_id], queue="data").id]
+            return [ugq.apply_async(args=[user_id], queue=INTERACTIVE_QUEUE).id]
         else:
             return dash.no_update
     else:
@@ -121,20 +110,13 @@ def login_username_button(url):
         if current_user.is_authenticated:
             logging.warning(f"LOGINBUTTON: USER LOGGED IN {current_user}")
             # TODO: implement more permanent interface
-            users_cache = redis.StrictRedis(
-                host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-                port=6379,
-                password=os.getenv("REDIS_PASSWORD", ""),
-            )
+            user_id = current_user.get_id()
             try:
-                users_cache.ping()
+                user_info = json.loads(get_users_client().get(user_id))
             except redis.exceptions.ConnectionError:
                 logging.error("USERNAME: Could not connect to users-cache.")
                 return dash.no_update
 
-            user_id = current_user.get_id()
-            user_info = json.loads(users_cache.get(user_id))
-
             navlink = [
                 dbc.NavItem(
                     dbc.NavLink(
@@ -176,49 +158,38 @@ def dynamic_multiselect_options(user_in: str, selections):
     if not user_in:
         return dash.no_update
 
-    options = augur.get_multiselect_options().copy()
+    # options of the logged-in user's groups, searched next to the indexed repos and orgs.
+    group_options = []
 
     if current_user.is_authenticated:
         logging.warning(f"LOGINBUTTON: USER LOGGED IN {current_user}")
         # TODO: implement more permanent interface
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-            decode_responses=True,
-        )
-        try:
-            users_cache.ping()
-        except redis.exceptions.ConnectionError:
-            logging.error("MULTISELECT: Could not connect to users-cache.")
-            return dash.no_update
-
+        users_cache = get_users_client(decode_responses=True)
         try:
             if users_cache.exists(f"{current_user.get_id()}_group_options"):
-                options = options + json.loads(users_cache.get(f"{current_user.get_id()}_group_options"))
+                group_options = json.loads(users_cache.get(f"{current_user.get_id()}_group_options"))
         except redis.exceptions.ConnectionError:
             logging.error("Searchbar: couldn't connect to Redis for user group options.")
 
-    # if the number of options changes then we're
-    # adding AUGUR_ entries somewhere.
-
     if selections is None:
         selections = []
 
-    # match lowercase inputs with lowercase possible values
-    opts = [i for i in options if user_in.lower() in i["label"]]
+    # arbitrarily 'small' number of matches returned..
+    limit = 100
 
-    # sort matches by length
-    opts = sorted(opts, key=lambda v: len(v["label"]))
+    # the index returns the best ranked matches without scanning all options,
+    # user groups are few so they're matched directly.
+    opts = augur.search_multiselect_options(user_in, limit)
+    if group_options:
+        opts += [o for o in group_options if user_in.lower() in o["label"].lower()]
+        opts = sorted(opts, key=lambda v: len(v["label"]))[:limit]
 
     # always include the previous selections from the searchbar to avoid
     # those values being clobbered when we truncate the total length.
-    # arbitrarily 'small' number of matches returned..
-    if len(opts) < 100:
-        return [opts + [v for v in options if v["value"] in selections]]
+    groups_by_value = {o["value"]: o for o in group_options}
+    selected = [augur.get_multiselect_option(v) or groups_by_value.get(v) for v in selections]
 
-    else:
-        return [opts[:100] + [v for v in options if v["value"] in selections]]
+    return [opts + [v for v in selected if v is not None]]
 
 
 # callback for repo selections to feed into visualization call backs
@@ -241,6 +212,9 @@ def multiselect_values_to_repo_ids(n_clicks, user_vals):
     # names of augur groups or orgs
     names = [n for n in user_vals if isinstance(n, str)]
 
+    # searched repos and orgs are warmed in the cache off-peak, see queries/cache_warming.py
+    record_selection(repos, [o for o in names if augur.is_org(o)])
+
     org_repos = [augur.org_to_repos(o) for o in names if augur.is_org(o)]
     # flatten list repo_ids in orgs to 1D
     org_repos = [v for l in org_repos for v in l]
@@ -250,18 +224,7 @@ def multiselect_values_to_repo_ids(n_clicks, user_vals):
     if current_user.is_authenticated:
         logging.warning(f"LOGINBUTTON: USER LOGGED IN {current_user}")
         # TODO: implement more permanent interface
-        users_cache = redis.StrictRedis(
-            host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-            port=6379,
-            password=os.getenv("REDIS_PASSWORD", ""),
-            decode_responses=True,
-        )
-        try:
-            users_cache.ping()
-        except redis.exceptions.ConnectionError:
-            logging.error("SEARCH-BUTTON: Could not connect to users-cache.")
-            return dash.no_update
-
+        users_cache = get_users_client(decode_responses=True)
         try:
             if users_cache.exists(f"{current_user.get_id()}_groups"):
                 user_groups = json.loads(users_cache.get(f"{current_user.get_id()}_groups"))
@@ -391,6 +354,9 @@ def run_queries(repos):
     instance for input Repos; caches results in redis per
     (query_function,repo) pair.
 
+    Queries of more than BULK_QUERY_THRESHOLD uncached repos
+    run in chunks on the bulk queue, the rest on the interactive queue.
+
     Args:
         repos ([int]): repositories we collect data for.
     """
@@ -405,13 +371,25 @@ def run_queries(repos):
     jobs = []
 
     for f in funcs:
-        # only download repos that aren't currently in cache
-        not_ready = [r for r in repos if cache.exists(f, r) != 1]
-
-        # add job to queue
-        j = f.apply_async(args=[not_ready], queue="data")
-
-        # add job promise to local promise list
-        jobs.append(j)
+        # only download repos that aren't currently in cache, with the data derived from them.
+        ready = set(repos)
+        for d in cache_funcs(f):
+            ready &= set(cache.readym(func=d, repos=repos))
+        not_ready = [r for r in repos if r not in ready]
+
+        metrics.inc("eightknot_cache_requests_total", len(repos) - len(not_ready), query=f.__name__, result="hit")
+        metrics.inc("eightknot_cache_requests_total", len(not_ready), query=f.__name__, result="miss")
+
+        if len(not_ready) <= BULK_QUERY_THRESHOLD:
+            # add job to interactive queue
+            jobs.append(f.apply_async(args=[not_ready], queue=INTERACTIVE_QUEUE))
+            continue
+
+        # large selections are split into chunks on the bulk queue. the n-th chunk is sent with priority n,
+        # so other users' first chunks don't wait behind all chunks of this selection.
+        logging.warning(f"RUN_QUERIES - {f.__name__} - {len(not_ready)} REPOS - BULK QUEUE")
+        chunks = [not_ready[i : i + BULK_CHUNK_SIZE] for i in range(0, len(not_ready), BULK_CHUNK_SIZE)]
+        for n, chunk in enumerate(chunks):
+            jobs.append(f.apply_async(args=[chunk], queue=BULK_QUEUE, priority=min(n, 9)))
 
     return [j.id for j in jobs]
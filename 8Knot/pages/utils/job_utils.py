@@ -1,4 +1,10 @@
+import time
+import logging
 import plotly.graph_objects as go
+from dash import dcc, Output
+from cache_manager.cache_manager import CacheManager as cm
+from metrics_manager import metrics
+
 
 columns = ["1", "2", "3"]
 
@@ -39,3 +45,175 @@ timeout_graph.update_layout(
     },
     font=dict(size=18, color="orange"),
 )
+
+# parent_style for the dcc.Loading around a graph. Keeps the graph visible under
+# the spinner so partial figures pushed by 'wait_for_data' can be seen.
+loading_parent_style = {"visibility": "visible"}
+
+# styles of a graph and of its partial graph, see 'partial_progress'.
+_shown = {"display": "block"}
+_hidden = {"display": "none"}
+
+
+def partial_graph(graph_id):
+    """
+    Hidden graph next to the graph 'graph_id' that shows its partial figures.
+
+    Args:
+    -----
+        graph_id (str): id of the graph.
+
+    Returns:
+    --------
+        dcc.Graph: graph with id '<graph_id>-partial'.
+    """
+    return dcc.Graph(id=f"{graph_id}-partial", style=_hidden)
+
+
+def partial_progress(graph_id):
+    """
+    Progress arguments of the background callback of the graph 'graph_id'.
+
+    Partial figures go to the graph of 'partial_graph', which is shown in place of
+    the graph while the callback runs. The graph's own figure is only set by the
+    callback's result, and once the callback is done the partial graph is hidden
+    and cleared, so the final state doesn't depend on the order of the updates.
+
+    Args:
+    -----
+        graph_id (str): id of the graph.
+
+    Returns:
+    --------
+        dict: 'progress' and 'progress_default' of dash.callback.
+    """
+    return {
+        "progress": [
+            Output(f"{graph_id}-partial", "figure"),
+            Output(f"{graph_id}-partial", "style"),
+            Output(graph_id, "style"),
+        ],
+        "progress_default": [{"data": [], "layout": {}}, _hidden, _shown],
+    }
+
+
+def wait_for_data(func, repolist, set_progress=None, render=None):
+    """
+    Blocks until the data of 'func' is cached for every repo in repolist.
+
+    If set_progress and render are passed, the repos that are already cached
+    are drawn with render(df) and pushed to the partial graph via set_progress
+    each time more of the selection becomes available, see 'partial_progress'.
+    Users see a partial graph while the slowest repos are still downloading.
+
+    Args:
+    -----
+        func (function): Query function whose data is waited for.
+        repolist ([int]): repo_ids of the selection.
+        set_progress (function | None): progress setter of a Dash background callback
+            with the progress of 'partial_progress'.
+        render (function | None): creates a figure from a (partial) DataFrame.
+
+    Returns:
+    --------
+        pd.DataFrame: Data of all repos in repolist.
+    """
+    cache = cm()
+    start = time.perf_counter()
+
+    if set_progress is None or render is None:
+        df = cache.grabm(func=func, repos=repolist)
+        while df is None:
+            time.sleep(1.0)
+            df = cache.grabm(func=func, repos=repolist)
+        _record_wait(func, start)
+        return df
+
+    partial = None
+    drawn = 0.0
+    while True:
+        df, ready, partial = cache.grabm_partial(func=func, repos=repolist, partial=partial)
+        if ready == 1.0:
+            _record_wait(func, start)
+            return df
+
+        # only redraw once more of the selection is ready, drawing costs about as much as the final render.
+        if df is not None and ready > drawn:
+            drawn = ready
+            fig = render_partial(render, df, ready)
+            if fig is not None:
+                set_progress([fig, _shown, _hidden])
+
+        time.sleep(1.0)
+
+
+def wait_for_joined_data(func, dimension, on, repolist, set_progress=None, render=None):
+    """
+    Blocks until the data of 'func' and of 'dimension' is cached for every repo
+    in repolist, and joins the columns of the dimension to the rows of func.
+
+    A dimension query caches attributes once per key, e.g. the company and emails
+    of each contributor, instead of repeating them on every row of func. Rows
+    of func without a match in the dimension are dropped.
+
+    The dimension is waited for first, then partial results of func are drawn
+    like in 'wait_for_data'.
+
+    Args:
+    -----
+        func (function): Query function whose rows are joined.
+        dimension (function): Query function with one row per key and repo.
+        on (str): key column of both queries.
+        repolist ([int]): repo_ids of the selection.
+        set_progress (function | None): progress setter of a Dash background callback
+            with the progress of 'partial_progress'.
+        render (function | None): creates a figure from a (partial) joined DataFrame.
+
+    Returns:
+    --------
+        pd.DataFrame: Joined data of all repos in repolist.
+    """
+    # a key that's in several repos has a row per repo, its attributes are the same.
+    dim = wait_for_data(dimension, repolist).drop_duplicates(subset=on)
+
+    def join(df):
+        return df.merge(dim, on=on, how="inner")
+
+    df = wait_for_data(func, repolist, set_progress, render and (lambda d: render(join(d))))
+    return join(df)
+
+
+def _record_wait(func, start):
+    waited = time.perf_counter() - start
+    metrics.observe("eightknot_grabm_wait_seconds", waited, query=func.__name__)
+    metrics.record_phase("wait", waited)
+
+
+def render_partial(render, df, ready):
+    """
+    Draws a figure from the part of the selection that's available.
+
+    Args:
+    -----
+        render (function): creates a figure from a DataFrame.
+        df (pd.DataFrame): data of the repos that are ready.
+        ready (float): fraction of the selection in df.
+
+    Returns:
+    --------
+        go.Figure | None: partial figure, None if it couldn't be drawn.
+    """
+    try:
+        fig = render(df)
+    except Exception as e:
+        # partial data can break assumptions of a visualization, the full render will still happen.
+        logging.warning(f"PARTIAL RENDER FAILED - {e}")
+        return None
+
+    if not isinstance(fig, go.Figure):
+        return None
+
+    # copy so that shared figures like 'nodata_graph' aren't changed.
+    fig = go.Figure(fig)
+    fig.update_layout(title={"text": f"Loading: {ready:.0%} of repos ready", "x": 0.5, "xanchor": "center"})
+    return fig
@@ -10,8 +10,8 @@ import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.QUERY_NAME import QUERY_NAME as QUERY_INITIALS
 import io
-from cache_manager.cache_manager import CacheManager as cm
-from pages.utils.job_utils import nodata_graph
+from pages.utils.job_utils import nodata_graph, wait_for_data, loading_parent_style, partial_graph, partial_progress
+from metrics_manager.metrics import observe_callback, phase
 import time
 
 """
@@ -72,7 +72,8 @@ gc_VISUALIZATION = dbc.Card(
                     is_open=False,
                 ),
                 dcc.Loading(
-                    dcc.Graph(id=f"{PAGE}-{VIZ_ID}"),
+                    [dcc.Graph(id=f"{PAGE}-{VIZ_ID}"), partial_graph(f"{PAGE}-{VIZ_ID}")],
+                    parent_style=loading_parent_style,
                 ),
                 dbc.Form(
                     [
@@ -184,18 +185,20 @@ def toggle_popover(n, is_open):
         Input(f"date-radio-{PAGE}-{VIZ_ID}", "value"),
         # add additional inputs here
     ],
+    # graph is redrawn with the repos that are ready while the rest of the selection downloads
+    **partial_progress(f"{PAGE}-{VIZ_ID}"),
     background=True,
 )
-def NAME_OF_VISUALIZATION_graph(repolist, interval):
+@observe_callback(f"{PAGE}-{VIZ_ID}")
+def NAME_OF_VISUALIZATION_graph(set_progress, repolist, interval):
     # wait for data to asynchronously download and become available.
-    cache = cm()
-    df = cache.grabm(func=QUERY_INITIALS, repos=repolist)
-    while df is None:
-        time.sleep(1.0)
-        df = cache.grabm(func=QUERY_INITIALS, repos=repolist)
-
-    start = time.perf_counter()
-    logging.warning(f"{VIZ_ID}- START")
+    # 'render' should draw the figure the same way as below, from a partial DataFrame.
+    df = wait_for_data(
+        func=QUERY_INITIALS,
+        repolist=repolist,
+        set_progress=set_progress,
+        render=lambda d: create_figure(process_data(d, interval), interval),
+    )
 
     # test if there is data
     if df.empty:
@@ -203,11 +206,12 @@ def NAME_OF_VISUALIZATION_graph(repolist, interval):
         return nodata_graph
 
     # function for all data pre processing, COULD HAVE ADDITIONAL INPUTS AND OUTPUTS
-    df = process_data(df, interval)
+    with phase("process_data"):
+        df = process_data(df, interval)
 
-    fig = create_figure(df, interval)
+    with phase("create_figure"):
+        fig = create_figure(df, interval)
 
-    logging.warning(f"{VIZ_ID} - END - {time.perf_counter() - start}")
     return fig
 
 
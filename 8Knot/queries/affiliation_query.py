@@ -1,13 +1,16 @@
 import logging
 from db_manager.augur_manager import AugurManager
-from app import celery_app
+from _celery import celery_app
 import pandas as pd
 from cache_manager.cache_manager import CacheManager as cm
-import io
-import datetime as dt
+from cache_manager.blobs import to_blob, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
 from sqlalchemy.exc import SQLAlchemyError
 
-QUERY_NAME = "COMPANY"
+QUERY_NAME = "AFFILIATION"
+
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {"cntrb_company": DICTIONARY}
 
 
 @celery_app.task(
@@ -17,14 +20,19 @@ QUERY_NAME = "COMPANY"
     retry_kwargs={"max_retries": 5},
     retry_jitter=True,
 )
-def company_query(self, repos):
+def affiliation_query(self, repos):
     """
     (Worker Query)
-    Executes SQL query against Augur database for company affiliation data.
+    Executes SQL query against Augur database for the company
+    of the contributors of each repo.
+
+    One row per contributor of a repo. Visualizations join it to the actions of
+    'contributors_query' on cntrb_id (see 'wait_for_joined_data'), so the
+    company isn't repeated on every action. Emails are in 'email_domains_query'.
 
     Explorer_contributor_actions is a materialized view on the database for quicker run time and
     may not be in your augur database. The SQL query content can be found
-    in docs/explorer_contributor_actions.sql
+    in docs/materialized_views/explorer_contributor_actions.sql
 
     Args:
     -----
@@ -40,25 +48,21 @@ def company_query(self, repos):
     if len(repos) == 0:
         return None
 
+    # rank is numbered per contributor and repo, rank 1 is one row per contributor of a repo.
+    # contributors without aliases or a contributors row have no affiliation, their actions aren't joined.
     query_string = f"""
                     SELECT
-                        c.cntrb_id,
-                        c.created_at AS created,
                         c.repo_id AS id,
-                        c.login,
-                        c.action,
-                        c.rank,
-                        con.cntrb_company,
-                        string_agg(ca.alias_email, ' , ' order by ca.alias_email) as email_list
+                        c.cntrb_id::text AS cntrb_id,
+                        con.cntrb_company
                     FROM
                         explorer_contributor_actions c
-                    JOIN contributors_aliases ca
-                        ON c.cntrb_id = ca.cntrb_id
                     JOIN contributors con
                         ON c.cntrb_id = con.cntrb_id
                     WHERE
-                        c.repo_id in({str(repos)[1:-1]})
-                    GROUP BY c.cntrb_id, c.created_at, c.repo_id, c.login, c.action, c.rank, con.cntrb_company
+                        c.repo_id in({str(repos)[1:-1]}) AND
+                        c.rank = 1 AND
+                        EXISTS (SELECT 1 FROM contributors_aliases ca WHERE ca.cntrb_id = c.cntrb_id)
                     """
 
     try:
@@ -73,17 +77,12 @@ def company_query(self, repos):
         # allow retry via Celery rules.
         raise SQLAlchemyError("DBConnect failed")
 
-    df = dbm.run_query(query_string)
-
-    df["cntrb_id"] = df["cntrb_id"].astype(str)
-    df = df.sort_values(by="created")
+    qm = QueryMetrics(QUERY_NAME, repos)
 
-    # change to compatible type and remove all data that has been incorrectly formatted
-    df["created"] = pd.to_datetime(df["created"], utc=True).dt.date
-    df = df[df.created < dt.date.today()]
-
-    df = df.reset_index()
-    df.drop("index", axis=1, inplace=True)
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
 
     # break apart returned data per repo
     # and temporarily store in List to be
@@ -92,32 +91,29 @@ def company_query(self, repos):
     for r in repos:
         # convert series to a dataframe
         # once we've stored the data by ID we no longer need the column.
-        c_df = pd.DataFrame(df.loc[df["id"] == r].drop(columns=["id"])).reset_index(drop=True)
-
-        # bytes buffer to be written to
-        b = io.BytesIO()
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r].drop(columns=["id"])).reset_index(drop=True)
 
-        # write dataframe in feather format to BytesIO buffer
-        bs = c_df.to_feather(b)
-
-        # move head of buffer to the beginning
-        b.seek(0)
-
-        # write the bytes of the buffer into the array
-        bs = b.read()
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
         pic.append(bs)
 
+    qm.record_blobs(repos, pic)
+
     del df
 
     # store results in Redis
     cm_o = cm()
 
     # 'ack' is a boolean of whether data was set correctly or not.
-    ack = cm_o.setm(
-        func=company_query,
-        repos=repos,
-        datas=pic,
-    )
-
+    with qm.phase("redis_write"):
+        ack = cm_o.setm(
+            func=affiliation_query,
+            repos=repos,
+            datas=pic,
+        )
+
+    qm.publish()
     logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
     return ack
@@ -0,0 +1,164 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import redis
+from db_manager.augur_manager import AugurManager
+from _celery import celery_app
+from cache_manager.cache_manager import CacheManager as cm
+from cache_manager.redis_clients import get_cache_client
+from sqlalchemy.exc import SQLAlchemyError
+from queries.query_list import QUERIES, cache_funcs
+
+QUERY_NAME = "CACHE_WARMING"
+
+# sorted set of searched repos and orgs, as members 'repo:<repo_id>' and 'org:<lowercase name>', -> how often they were searched.
+POPULARITY_KEY = "search_popularity"
+
+# Redis lock so that only one warming runs at a time.
+WARM_LOCK_KEY = "cache_warming_lock"
+
+# most searched repos/orgs that are warmed.
+WARM_CACHE_TOP_N = int(os.getenv("WARM_CACHE_TOP_N", "20"))
+
+# search bar labels (repo urls or org names) that are always warmed, comma separated.
+WARM_CACHE_LABELS = [
+    label.strip()
+    for label in os.getenv("WARM_CACHE_LABELS", os.getenv("DEFAULT_SEARCHBAR_LABEL", "")).split(",")
+    if label.strip()
+]
+
+# upper bound of repos warmed per run, the most searched come first.
+WARM_CACHE_MAX_REPOS = int(os.getenv("WARM_CACHE_MAX_REPOS", "2000"))
+
+# query tasks that run at the same time, i.e. database connections used by the warming.
+WARM_CACHE_CONCURRENCY = int(os.getenv("WARM_CACHE_CONCURRENCY", "2"))
+
+# repos per query task.
+WARM_CHUNK_SIZE = 100
+
+# factor popularity is multiplied by after each run, so recent searches count more than old ones.
+POPULARITY_DECAY = 0.5
+
+
+def record_selection(repos, orgs):
+    """
+    Counts a search of repos and orgs toward their popularity.
+    Failing to count doesn't fail the caller.
+
+    Args:
+    -----
+        repos ([int]): repo_ids that were searched.
+        orgs ([str]): org names that were searched.
+    """
+    members = [f"repo:{r}" for r in repos] + [f"org:{o.lower()}" for o in orgs]
+    if not members:
+        return
+    try:
+        p = get_cache_client().pipeline(transaction=False)
+        for m in members:
+            p.zincrby(POPULARITY_KEY, 1, m)
+        p.execute()
+    except redis.exceptions.RedisError as err:
+        logging.error(f"{QUERY_NAME} - SELECTION NOT RECORDED: {err}")
+
+
+def popular_repos(dbm):
+    """
+    Resolves the configured labels and the most searched repos and orgs to repo_ids.
+
+    Args:
+    -----
+        dbm (AugurManager): manager with the search bar maps loaded.
+
+    Returns:
+    --------
+        [int]: repo_ids, configured first, then most searched first.
+    """
+    members = []
+    for label in WARM_CACHE_LABELS:
+        repo_id = dbm.repo_git_to_id(label)
+        members.append(f"repo:{repo_id}" if repo_id is not None else f"org:{label.lower()}")
+
+    members += get_cache_client(decode_responses=True).zrevrange(POPULARITY_KEY, 0, WARM_CACHE_TOP_N - 1)
+
+    repos = []
+    for m in members:
+        kind, _, value = m.partition(":")
+        if kind == "repo" and value.isdigit():
+            repos.append(int(value))
+        elif kind == "org" and dbm.is_org(value):
+            repos.extend(dbm.org_to_repos(value))
+        else:
+            logging.warning(f"{QUERY_NAME} - UNKNOWN REPO OR ORG: {m}")
+
+    # unique, in order of priority.
+    return list(dict.fromkeys(repos))[:WARM_CACHE_MAX_REPOS]
+
+
+@celery_app.task(
+    bind=True,
+)
+def warm_cache(self):
+    """
+    (Worker Maintenance)
+    Runs every query for the configured and the most searched repos and orgs,
+    so their data is cached and recent before users open them.
+
+    Data that is already cached is replaced, which keeps it fresh, and the merged
+    repo-set data built from the old data is deleted. At most WARM_CACHE_CONCURRENCY
+    query tasks run at a time.
+
+    Runs off-peak, on the schedule set in _celery.py.
+
+    Returns:
+    --------
+        int: number of repos warmed.
+    """
+    logging.warning(f"{QUERY_NAME} - START")
+
+    results_cache = get_cache_client()
+
+    lock = results_cache.lock(WARM_LOCK_KEY, timeout=celery_app.conf.task_time_limit)
+    if not lock.acquire(blocking=False):
+        logging.warning(f"{QUERY_NAME} - ALREADY RUNNING")
+        return 0
+
+    try:
+        try:
+            dbm = AugurManager()
+            dbm.get_engine()
+            dbm.multiselect_startup()
+        except KeyError:
+            logging.error(f"{QUERY_NAME} - INCOMPLETE ENVIRONMENT")
+            return 0
+        except SQLAlchemyError:
+            logging.error(f"{QUERY_NAME} - COULDN'T CONNECT TO DB")
+            return 0
+
+        repos = popular_repos(dbm)
+        chunks = [repos[i : i + WARM_CHUNK_SIZE] for i in range(0, len(repos), WARM_CHUNK_SIZE)]
+
+        cache = cm()
+        with ThreadPoolExecutor(max_workers=max(1, WARM_CACHE_CONCURRENCY)) as pool:
+            for q in QUERIES:
+                start = time.perf_counter()
+                # runs in this worker so the sets are only cleared once all repos are replaced.
+                results = list(pool.map(lambda chunk: q.apply(args=[chunk]), chunks))
+
+                failed = [r for r in results if r.failed()]
+                for f in cache_funcs(q):
+                    cache.clear_repo_sets(func=f)
+                logging.warning(
+                    f"{QUERY_NAME} - {q.__name__} - {len(repos)} REPOS - {len(failed)} FAILED - {time.perf_counter() - start}"
+                )
+
+        # decay all counts so that what's popular follows what's searched lately,
+        # and forget values that weren't searched for several runs.
+        results_cache.zunionstore(POPULARITY_KEY, {POPULARITY_KEY: POPULARITY_DECAY})
+        results_cache.zremrangebyscore(POPULARITY_KEY, "-inf", 0.1)
+    finally:
+        lock.release()
+
+    logging.warning(f"{QUERY_NAME} - END")
+    return len(repos)
@@ -0,0 +1,139 @@
+import logging
+from db_manager.augur_manager import AugurManager
+from _celery import celery_app
+import pandas as pd
+from cache_manager.cache_manager import CacheManager as cm
+from cache_manager.blobs import to_blob, TIMESTAMP, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
+import datetime as dt
+from sqlalchemy.exc import SQLAlchemyError
+
+# DEBUGGING
+import os
+
+QUERY_NAME = "COMMIT_ACTIVITY"
+
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {"author_timestamp": TIMESTAMP, "author_domain": DICTIONARY}
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    exponential_backoff=2,
+    retry_kwargs={"max_retries": 5},
+    retry_jitter=True,
+)
+def commit_activity_query(self, repos):
+    """
+    (Worker Query)
+    Executes SQL query against Augur database for commit data.
+
+    Args:
+    -----
+        repo_ids ([str]): repos that SQL query is executed on.
+
+    Returns:
+    --------
+        dict: Results from SQL query, interpreted from pd.to_dict('records')
+    """
+    logging.warning(f"{QUERY_NAME}_DATA_QUERY - START")
+
+    if len(repos) == 0:
+        return None
+
+    # commenting-outunused query components. only need the repo_id and the
+    # authorship date for our current queries. remove the '--' to re-add
+    # the now-removed values.
+    # explorer_commits has one row per commit, the commits table one per file of a commit.
+    query_string = f"""
+                    SELECT
+                        c.repo_id AS id,
+                        c.cmt_commit_hash AS commits,
+                        -- c.files_changed AS files,
+                        -- c.lines_added,
+                        -- c.lines_removed,
+                        c.cmt_author_email AS author_email,
+                        -- what follows the last '@', NULL if the email isn't in email format
+                        CASE WHEN strpos(c.cmt_author_email, '@') > 0
+                            THEN substring(c.cmt_author_email from '[^@]*$')
+                        END AS author_domain,
+                        c.cmt_author_date AS date,
+                        c.cmt_author_timestamp AS author_timestamp,
+                        -- hour (0-23) and weekday (0 is Sunday) of the author and committer times, -1 if missing.
+                        -- the author's are -1 if the author time is the committer time too, so it's counted once.
+                        CASE WHEN c.cmt_author_timestamp = c.cmt_committer_timestamp THEN -1
+                            ELSE COALESCE(extract(hour from c.cmt_author_timestamp), -1)
+                        END::smallint AS author_hour,
+                        CASE WHEN c.cmt_author_timestamp = c.cmt_committer_timestamp THEN -1
+                            ELSE COALESCE(extract(dow from c.cmt_author_timestamp), -1)
+                        END::smallint AS author_weekday,
+                        COALESCE(extract(hour from c.cmt_committer_timestamp), -1)::smallint AS committer_hour,
+                        COALESCE(extract(dow from c.cmt_committer_timestamp), -1)::smallint AS committer_weekday
+
+                    FROM
+                        augur_data.explorer_commits c
+                    WHERE
+                        c.repo_id in ({str(repos)[1:-1]}) AND
+                        c.cmt_author_timestamp < '{dt.date.today()} 00:00:00+00'
+                    """
+
+    try:
+        dbm = AugurManager()
+        engine = dbm.get_engine()
+    except KeyError:
+        # noack, data wasn't successfully set.
+        logging.error(f"{QUERY_NAME}_DATA_QUERY - INCOMPLETE ENVIRONMENT")
+        return False
+    except SQLAlchemyError:
+        logging.error(f"{QUERY_NAME}_DATA_QUERY - COULDN'T CONNECT TO DB")
+        # allow retry via Celery rules.
+        raise SQLAlchemyError("DBConnect failed")
+
+    qm = QueryMetrics(QUERY_NAME, repos)
+
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
+
+    # change to compatible type
+    df["author_timestamp"] = pd.to_datetime(df["author_timestamp"], utc=True).dt.floor("D")
+
+    # hours and weekdays fit in a byte each
+    cycle = ["author_hour", "author_weekday", "committer_hour", "committer_weekday"]
+    df[cycle] = df[cycle].astype("int8")
+
+    # break apart returned data per repo
+    # and temporarily store in List to be
+    # stored in Redis.
+    pic = []
+    for r in repos:
+        # convert series to a dataframe
+        # once we've stored the data by ID we no longer need the column.
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r].drop(columns=["id"])).reset_index(drop=True)
+
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
+        pic.append(bs)
+
+    qm.record_blobs(repos, pic)
+
+    del df
+
+    # store results in Redis
+    cm_o = cm()
+
+    # 'ack' is a boolean of whether data was set correctly or not.
+    with qm.phase("redis_write"):
+        ack = cm_o.setm(
+            func=commit_activity_query,
+            repos=repos,
+            datas=pic,
+        )
+
+    qm.publish()
+    logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
+    return ack
@@ -0,0 +1,90 @@
+import pandas as pd
+from cache_manager.blobs import TIMESTAMP, DICTIONARY
+
+"""
+Lifecycle of each contributor of a repo, derived from the rows that
+'contributors_query' fetches and cached per repo besides them, so the
+contributor visualizations don't have to aggregate every action.
+"""
+
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {
+    "cntrb_id": DICTIONARY,
+    "first_seen": TIMESTAMP,
+    "last_seen": TIMESTAMP,
+    "first_action": DICTIONARY,
+}
+
+# labels of the actions of 'contributors_query', one count column each.
+ACTIONS = [
+    "Commit",
+    "Issue Opened",
+    "Issue Closed",
+    "Issue Comment",
+    "PR Opened",
+    "PR Closed",
+    "PR Merged",
+    "PR Comment",
+    "PR Review",
+]
+
+
+def contributor_lifecycle_query(df):
+    """
+    (Derived Data)
+    Summarizes each contributor of each repo.
+
+    One row per contributor of a repo: dates of the contributor's first and
+    last actions, the first action, and the number of actions in total and
+    of each action of ACTIONS. Rows of several repos are combined by 'merge_repos'.
+
+    Args:
+    -----
+        df (pd.DataFrame): rows of 'contributors_query' with their 'id' and exact 'created_at'.
+
+    Returns:
+    --------
+        pd.DataFrame: one row per repo ('id') and contributor.
+    """
+    # actions at the same time are ordered like rank, which is numbered from the latest action.
+    df = df.sort_values(["created_at", "rank"], ascending=[True, False], kind="stable")
+    keys = ["id", "cntrb_id"]
+
+    summary = df.groupby(keys, sort=False).agg(
+        first_seen=("created_at", "min"),
+        last_seen=("created_at", "max"),
+        first_action=("Action", "first"),
+        contributions=("Action", "size"),
+    )
+    counts = df.groupby(keys + ["Action"], sort=False).size().unstack("Action", fill_value=0)
+    summary = summary.join(counts.reindex(columns=ACTIONS, fill_value=0)).reset_index()
+
+    # days as in 'contributors_query'
+    summary["first_seen"] = pd.to_datetime(summary["first_seen"], utc=True).dt.floor("D")
+    summary["last_seen"] = pd.to_datetime(summary["last_seen"], utc=True).dt.floor("D")
+
+    return summary
+
+
+def merge_repos(df):
+    """
+    Combines the rows of a contributor in several repos into one row.
+
+    First seen is the earliest of the repos' dates, last seen the latest, the
+    first action is the one of the earliest repo, and the counts are summed.
+
+    Args:
+    -----
+        df (pd.DataFrame): data of 'contributor_lifecycle_query' for a selection of repos.
+
+    Returns:
+    --------
+        pd.DataFrame: one row per contributor of the selection.
+    """
+    counts = {c: "sum" for c in ["contributions"] + ACTIONS}
+
+    return (
+        df.sort_values("first_seen", kind="stable")
+        .groupby("cntrb_id", sort=False, as_index=False)
+        .agg({"first_seen": "min", "last_seen": "max", "first_action": "first", **counts})
+    )
@@ -0,0 +1,42 @@
+from cache_manager.blobs import TIMESTAMP, DICTIONARY
+from cache_manager.sketches import hll_sketches
+
+"""
+Number of actions and sketch of the distinct contributors of each repo,
+month and action, derived from the rows that 'contributors_query' fetches
+and cached per repo besides them.
+"""
+
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {
+    "repo_name": DICTIONARY,
+    "month": TIMESTAMP,
+    "Action": DICTIONARY,
+}
+
+
+def contributor_sketches_query(df):
+    """
+    (Derived Data)
+    Counts the actions and sketches the distinct contributors of each repo, month and action.
+
+    Sketches of any repos, months and actions are merged to estimate their
+    number of distinct contributors without the rows of 'contributors_query',
+    see cache_manager/sketches.py.
+
+    Args:
+    -----
+        df (pd.DataFrame): rows of 'contributors_query' with their 'id' and exact 'created_at'.
+
+    Returns:
+    --------
+        pd.DataFrame: one row per repo ('id'), month and action.
+    """
+    # month of the action in UTC.
+    month = df["created_at"].dt.tz_localize(None).dt.to_period("M").dt.to_timestamp().dt.tz_localize("UTC")
+    df = df[["id", "repo_name", "Action", "cntrb_id"]].assign(month=month)
+
+    keys = ["id", "repo_name", "month", "Action"]
+    actions = df.groupby(keys, sort=False).size().rename("actions").reset_index()
+
+    return actions.merge(hll_sketches(df, keys, "cntrb_id"), on=keys)
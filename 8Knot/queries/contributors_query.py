@@ -1,14 +1,53 @@
 import logging
 import pandas as pd
 from db_manager.augur_manager import AugurManager
-from app import celery_app
+from _celery import celery_app
 from cache_manager.cache_manager import CacheManager as cm
-import io
+from cache_manager.blobs import to_blob, TIMESTAMP, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
+from queries.contributor_lifecycle_query import contributor_lifecycle_query, SCHEMA as LIFECYCLE_SCHEMA
+from queries.contributor_sketches_query import contributor_sketches_query, SCHEMA as SKETCHES_SCHEMA
+from queries.top_contributors_query import top_contributors_query, SCHEMA as TOP_CONTRIBUTORS_SCHEMA
 import datetime as dt
 from sqlalchemy.exc import SQLAlchemyError
 
 QUERY_NAME = "CONTRIBUTOR"
 
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {
+    "created_at": TIMESTAMP,
+    "Action": DICTIONARY,
+    "login": DICTIONARY,
+    "repo_name": DICTIONARY,
+    "cntrb_id": DICTIONARY,
+}
+
+# label of the action of an explorer_contributor_actions row, shared by the queries that read the view.
+ACTION_LABEL = """
+                        CASE action
+                            WHEN 'pull_request_open' THEN 'PR Opened'
+                            WHEN 'pull_request_comment' THEN 'PR Comment'
+                            WHEN 'pull_request_closed' THEN 'PR Closed'
+                            WHEN 'pull_request_merged' THEN 'PR Merged'
+                            WHEN 'pull_request_review_COMMENTED' THEN 'PR Review'
+                            WHEN 'pull_request_review_APPROVED' THEN 'PR Review'
+                            WHEN 'pull_request_review_CHANGES_REQUESTED' THEN 'PR Review'
+                            WHEN 'pull_request_review_DISMISSED' THEN 'PR Review'
+                            WHEN 'issue_opened' THEN 'Issue Opened'
+                            WHEN 'issue_closed' THEN 'Issue Closed'
+                            WHEN 'issue_comment' THEN 'Issue Comment'
+                            WHEN 'commit' THEN 'Commit'
+                            ELSE action
+                        END"""
+
+# data derived from the fetched rows and cached per repo under the derive function's name,
+# so it doesn't take another scan of the view: derive function -> types of its cached columns.
+DERIVED = {
+    contributor_lifecycle_query: LIFECYCLE_SCHEMA,
+    contributor_sketches_query: SKETCHES_SCHEMA,
+    top_contributors_query: TOP_CONTRIBUTORS_SCHEMA,
+}
+
 
 @celery_app.task(
     bind=True,
@@ -22,6 +61,8 @@ def contributors_query(self, repos):
     (Worker Query)
     Executes SQL query against Augur database for contributor data.
 
+    The data of DERIVED is built from the same rows and cached besides them.
+
     Explorer_contributor_actions is a materialized view on the database for quicker run time and
     may not be in your augur database. The SQL query content can be found
     in docs/materialized_views/explorer_contributor_actions.sql
@@ -40,19 +81,21 @@ def contributors_query(self, repos):
     if len(repos) == 0:
         return None
 
+    # actions without a contributor id have the id 'None', they're counted as one contributor.
     query_string = f"""
                     SELECT
                         repo_id as id,
                         repo_name as repo_name,
-                        cntrb_id,
+                        COALESCE(cntrb_id::text, 'None') AS cntrb_id,
                         created_at,
                         login,
-                        action,
+                        {ACTION_LABEL} AS "Action",
                         rank
                     FROM
                         augur_data.explorer_contributor_actions
                     WHERE
-                        repo_id in ({str(repos)[1:-1]})
+                        repo_id in ({str(repos)[1:-1]}) AND
+                        created_at < '{dt.date.today()} 00:00:00+00'
                 """
 
     try:
@@ -67,60 +110,58 @@ def contributors_query(self, repos):
         # allow retry via Celery rules.
         raise SQLAlchemyError("DBConnect failed")
 
-    df = dbm.run_query(query_string)
-
-    # update column values
-    df.loc[df["action"] == "pull_request_open", "action"] = "PR Opened"
-    df.loc[df["action"] == "pull_request_comment", "action"] = "PR Comment"
-    df.loc[df["action"] == "pull_request_closed", "action"] = "PR Closed"
-    df.loc[df["action"] == "pull_request_merged", "action"] = "PR Merged"
-    df.loc[df["action"] == "pull_request_review_COMMENTED", "action"] = "PR Review"
-    df.loc[df["action"] == "pull_request_review_APPROVED", "action"] = "PR Review"
-    df.loc[df["action"] == "pull_request_review_CHANGES_REQUESTED", "action"] = "PR Review"
-    df.loc[df["action"] == "pull_request_review_DISMISSED", "action"] = "PR Review"
-    df.loc[df["action"] == "issue_opened", "action"] = "Issue Opened"
-    df.loc[df["action"] == "issue_closed", "action"] = "Issue Closed"
-    df.loc[df["action"] == "issue_comment", "action"] = "Issue Comment"
-    df.loc[df["action"] == "commit", "action"] = "Commit"
-    df["cntrb_id"] = df["cntrb_id"].astype(str)  # contributor ids to strings
-    df.rename(columns={"action": "Action"}, inplace=True)
-
-    # change to compatible type and remove all data that has been incorrectly formated
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True).dt.date
-    df = df[df.created_at < dt.date.today()]
-
-    df = df.reset_index(drop=True)
+    qm = QueryMetrics(QUERY_NAME, repos)
 
-    pic = []
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
 
-    for i, r in enumerate(repos):
-        # convert series to a dataframe
-        c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
+    # change to compatible type
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
 
-        # bytes buffer to be written to
-        b = io.BytesIO()
+    # derived data is built from the exact times.
+    with qm.phase("derive"):
+        derived = {f: f(df) for f in DERIVED}
 
-        # write dataframe in feather format to BytesIO buffer
-        bs = c_df.to_feather(b)
+    df["created_at"] = df["created_at"].dt.floor("D")
 
-        # move head of buffer to the beginning
-        b.seek(0)
+    pic = []
+    derived_pic = {f: [] for f in DERIVED}
 
-        # write the bytes of the buffer into the array
-        bs = b.read()
+    for i, r in enumerate(repos):
+        # convert series to a dataframe
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
+            d_dfs = {
+                f: d_df.loc[d_df["id"] == r].drop(columns=["id"]).reset_index(drop=True) for f, d_df in derived.items()
+            }
+
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
+            for f, d_df in d_dfs.items():
+                derived_pic[f].append(to_blob(d_df, DERIVED[f]))
         pic.append(bs)
 
-    del df
+    qm.record_blobs(repos, pic)
+
+    del df, derived
 
     # store results in Redis
     cm_o = cm()
 
     # 'ack' is a boolean of whether data was set correctly or not.
-    ack = cm_o.setm(
-        func=contributors_query,
-        repos=repos,
-        datas=pic,
-    )
+    # derived data is written first, so it's there once the rows are.
+    with qm.phase("redis_write"):
+        acks = [cm_o.setm(func=f, repos=repos, datas=d_pic) for f, d_pic in derived_pic.items()]
+        ack = cm_o.setm(
+            func=contributors_query,
+            repos=repos,
+            datas=pic,
+        )
+    ack = ack and all(acks)
+    qm.publish()
     logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
 
     return ack
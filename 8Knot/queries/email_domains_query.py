@@ -0,0 +1,123 @@
+import logging
+from db_manager.augur_manager import AugurManager
+from _celery import celery_app
+import pandas as pd
+from cache_manager.cache_manager import CacheManager as cm
+from cache_manager.blobs import to_blob, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
+from sqlalchemy.exc import SQLAlchemyError
+
+QUERY_NAME = "EMAIL_DOMAINS"
+
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {"domain": DICTIONARY}
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    exponential_backoff=2,
+    retry_kwargs={"max_retries": 5},
+    retry_jitter=True,
+)
+def email_domains_query(self, repos):
+    """
+    (Worker Query)
+    Executes SQL query against Augur database for the emails of the
+    contributors of each repo and their domains.
+
+    One row per email of a contributor of a repo. Affiliation visualizations
+    count the emails' domains for the contributors of the actions of
+    'contributors_query', instead of splitting email strings on every action.
+
+    Explorer_contributor_actions is a materialized view on the database for quicker run time and
+    may not be in your augur database. The SQL query content can be found
+    in docs/materialized_views/explorer_contributor_actions.sql
+
+    Args:
+    -----
+        repo_ids ([str]): repos that SQL query is executed on.
+
+    Returns:
+    --------
+        dict: Results from SQL query, interpreted from pd.to_dict('records')
+
+    """
+    logging.warning(f"{QUERY_NAME}_DATA_QUERY - START")
+
+    if len(repos) == 0:
+        return None
+
+    # rank is numbered per contributor and repo, rank 1 is one row per contributor of a repo.
+    # only aliases in email format are kept, the domain is what follows the last '@'.
+    # contributors without a contributors row have no affiliation, as in 'affiliation_query'.
+    query_string = f"""
+                    SELECT
+                        c.repo_id AS id,
+                        c.cntrb_id::text AS cntrb_id,
+                        ca.alias_email AS email,
+                        substring(ca.alias_email from '[^@]*$') AS domain
+                    FROM
+                        explorer_contributor_actions c
+                    JOIN contributors_aliases ca
+                        ON c.cntrb_id = ca.cntrb_id
+                    JOIN contributors con
+                        ON c.cntrb_id = con.cntrb_id
+                    WHERE
+                        c.repo_id in({str(repos)[1:-1]}) AND
+                        c.rank = 1 AND
+                        strpos(ca.alias_email, '@') > 0
+                    """
+
+    try:
+        dbm = AugurManager()
+        engine = dbm.get_engine()
+    except KeyError:
+        # noack, data wasn't successfully set.
+        logging.error(f"{QUERY_NAME}_DATA_QUERY - INCOMPLETE ENVIRONMENT")
+        return False
+    except SQLAlchemyError:
+        logging.error(f"{QUERY_NAME}_DATA_QUERY - COULDN'T CONNECT TO DB")
+        # allow retry via Celery rules.
+        raise SQLAlchemyError("DBConnect failed")
+
+    qm = QueryMetrics(QUERY_NAME, repos)
+
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
+
+    # break apart returned data per repo
+    # and temporarily store in List to be
+    # stored in Redis.
+    pic = []
+    for r in repos:
+        # convert series to a dataframe
+        # once we've stored the data by ID we no longer need the column.
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r].drop(columns=["id"])).reset_index(drop=True)
+
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
+        pic.append(bs)
+
+    qm.record_blobs(repos, pic)
+
+    del df
+
+    # store results in Redis
+    cm_o = cm()
+
+    # 'ack' is a boolean of whether data was set correctly or not.
+    with qm.phase("redis_write"):
+        ack = cm_o.setm(
+            func=email_domains_query,
+            repos=repos,
+            datas=pic,
+        )
+
+    qm.publish()
+    logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
+    return ack
@@ -1,14 +1,18 @@
 import logging
 from db_manager.augur_manager import AugurManager
-from app import celery_app
+from _celery import celery_app
 from cache_manager.cache_manager import CacheManager as cm
+from cache_manager.blobs import to_blob, TIMESTAMP, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
 import pandas as pd
-import io
 import datetime as dt
 from sqlalchemy.exc import SQLAlchemyError
 
 QUERY_NAME = "ISSUE"
 
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {"created": TIMESTAMP, "closed": TIMESTAMP, "repo_name": DICTIONARY}
+
 
 @celery_app.task(
     bind=True,
@@ -44,14 +48,15 @@ def issues_query(self, repos):
                         i.gh_issue_number AS issue_number,
                         i.gh_issue_id AS gh_issue,
                         i.created_at AS created,
-                        i.closed_at AS closed,
-                        i.pull_request_id
+                        i.closed_at AS closed
                     FROM
                         repo r,
                         issues i
                     WHERE
                         r.repo_id = i.repo_id AND
-                        r.repo_id in ({str(repos)[1:-1]})
+                        r.repo_id in ({str(repos)[1:-1]}) AND
+                        i.pull_request_id IS NULL AND
+                        i.created_at < '{dt.date.today()} 00:00:00+00'
                     """
 
     try:
@@ -66,15 +71,17 @@ def issues_query(self, repos):
         # allow retry via Celery rules.
         raise SQLAlchemyError("DBConnect failed")
 
-    df = dbm.run_query(query_string)
+    qm = QueryMetrics(QUERY_NAME, repos)
+
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
 
-    df = df[df["pull_request_id"].isnull()]
-    df = df.drop(columns="pull_request_id")
     df = df.sort_values(by="created")
 
-    # change to compatible type and remove all data that has been incorrectly formated
-    df["created"] = pd.to_datetime(df["created"], utc=True).dt.date
-    df = df[df.created < dt.date.today()]
+    # change to compatible type
+    df["created"] = pd.to_datetime(df["created"], utc=True).dt.floor("D")
 
     df = df.reset_index()
     df.drop("index", axis=1, inplace=True)
@@ -85,32 +92,29 @@ def issues_query(self, repos):
     pic = []
     for i, r in enumerate(repos):
         # convert series to a dataframe
-        c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
-
-        # bytes buffer to be written to
-        b = io.BytesIO()
-
-        # write dataframe in feather format to BytesIO buffer
-        bs = c_df.to_feather(b)
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
 
-        # move head of buffer to the beginning
-        b.seek(0)
-
-        # write the bytes of the buffer into the array
-        bs = b.read()
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
         pic.append(bs)
 
+    qm.record_blobs(repos, pic)
+
     del df
 
     # store results in Redis
     cm_o = cm()
 
     # 'ack' is a boolean of whether data was set correctly or not.
-    ack = cm_o.setm(
-        func=issues_query,
-        repos=repos,
-        datas=pic,
-    )
-
+    with qm.phase("redis_write"):
+        ack = cm_o.setm(
+            func=issues_query,
+            repos=repos,
+            datas=pic,
+        )
+
+    qm.publish()
     logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
     return ack
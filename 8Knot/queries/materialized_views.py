@@ -0,0 +1,272 @@
+import logging
+import os
+import time
+import datetime as dt
+from db_manager.augur_manager import AugurManager
+from celery import chord
+from _celery import celery_app, BULK_QUEUE
+from cache_manager.cache_manager import CacheManager as cm
+from cache_manager.redis_clients import get_cache_client
+from sqlalchemy.exc import SQLAlchemyError
+from queries.query_list import VIEW_QUERIES, cache_funcs
+
+QUERY_NAME = "MATERIALIZED_VIEWS"
+
+# SQL that populates each view, one '<view name>.sql' file per view.
+# docs/materialized_views is copied next to the app in the container image.
+VIEWS_DIR = os.getenv(
+    "MATERIALIZED_VIEWS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "docs", "materialized_views"),
+)
+
+# Redis hash of view name -> ISO timestamp of the view's last successful refresh.
+LAST_REFRESH_KEY = "materialized_views_last_refresh"
+
+# Redis lock so that only one refresh runs at a time.
+REFRESH_LOCK_KEY = "materialized_views_refresh_lock"
+
+# repos re-queried per query task when cached data is replaced after a refresh.
+RECACHE_CHUNK_SIZE = 100
+
+"""
+Materialized views that 8Knot's queries read from.
+
+    name: name of the view and of its SQL file in VIEWS_DIR.
+    repo_column: column with the repo_id that all queries filter on.
+    unique_columns: columns of the unique index that 'REFRESH ... CONCURRENTLY' requires.
+    indexes: (optional) other indexes, for queries that filter on more than the repo:
+        name suffix, columns and the 'where' of a partial index.
+
+Query tasks whose cached data comes from each view are in VIEW_QUERIES, see queries/query_list.py.
+"""
+MATERIALIZED_VIEWS = [
+    {
+        "name": "explorer_commits",
+        "repo_column": "repo_id",
+        "unique_columns": ["repo_id", "cmt_commit_hash"],
+    },
+    {
+        "name": "explorer_contributor_actions",
+        "repo_column": "repo_id",
+        # rank is a row_number() partitioned by contributor and repo.
+        "unique_columns": ["cntrb_id", "repo_id", "rank"],
+        # affiliation_query and email_domains_query read one row per contributor of a repo, rank = 1.
+        # the index covers the columns they read, so the other actions of the repos aren't read.
+        "indexes": [{"name": "rank_1", "columns": ["repo_id", "cntrb_id"], "where": "rank = 1"}],
+    },
+    {
+        "name": "explorer_issue_assignments",
+        "repo_column": "id",
+        "unique_columns": ["issue_id", "assign_date", "assignment_action", "assignee"],
+    },
+    {
+        "name": "explorer_pr_assignments",
+        "repo_column": "id",
+        "unique_columns": ["pull_request_id", "assign_date", "assignment_action", "assignee"],
+    },
+]
+
+
+@celery_app.task(
+    bind=True,
+)
+def refresh_materialized_views(self):
+    """
+    (Worker Maintenance)
+    Installs the materialized views that the queries read from if they're missing,
+    refreshes them, and records when each view was last refreshed.
+
+    Cached data of the queries that depend on a refreshed view is replaced with
+    data from the refreshed view by tasks on the bulk queue, after the refresh.
+
+    Runs on the schedule set in _celery.py.
+
+    Returns:
+    --------
+        bool: Whether the refresh ran.
+    """
+    logging.warning(f"{QUERY_NAME}_REFRESH - START")
+
+    results_cache = get_cache_client()
+
+    lock = results_cache.lock(REFRESH_LOCK_KEY, timeout=celery_app.conf.task_time_limit)
+    if not lock.acquire(blocking=False):
+        logging.warning(f"{QUERY_NAME}_REFRESH - ALREADY RUNNING")
+        return False
+
+    refreshed = []
+    try:
+        try:
+            dbm = AugurManager()
+            dbm.get_engine()
+        except KeyError:
+            logging.error(f"{QUERY_NAME}_REFRESH - INCOMPLETE ENVIRONMENT")
+            return False
+        except SQLAlchemyError:
+            logging.error(f"{QUERY_NAME}_REFRESH - COULDN'T CONNECT TO DB")
+            return False
+
+        for view in MATERIALIZED_VIEWS:
+            start = time.perf_counter()
+            try:
+                created = install_view(dbm, view)
+                if not created:
+                    refresh_view(dbm, view)
+            except SQLAlchemyError as err:
+                logging.error(f"{QUERY_NAME}_REFRESH - {view['name']} FAILED: {err}")
+                continue
+
+            results_cache.hset(LAST_REFRESH_KEY, view["name"], dt.datetime.now(dt.timezone.utc).isoformat())
+            logging.warning(f"{QUERY_NAME}_REFRESH - {view['name']} - {time.perf_counter() - start}")
+            refreshed.append(view)
+    finally:
+        lock.release()
+
+    # the lock isn't held while the cached data is replaced, a stuck query can't hold up the next refresh.
+    for view in refreshed:
+        recache_queries(dbm, VIEW_QUERIES[view["name"]])
+
+    logging.warning(f"{QUERY_NAME}_REFRESH - END")
+    return True
+
+
+def install_view(dbm, view):
+    """Creates the view and its indexes if the view doesn't exist yet.
+
+    Args:
+        dbm (AugurManager): manager with an engine.
+        view (dict): entry of MATERIALIZED_VIEWS.
+
+    Returns:
+        bool: True if the view was created (and is therefore fresh).
+    """
+    name = view["name"]
+
+    df = dbm.run_query(
+        f"""
+        SELECT count(*) FROM pg_matviews
+        WHERE matviewname = '{name}' AND schemaname = 'augur_data'
+        """
+    )
+    exists = df.iat[0, 0] > 0
+
+    if not exists:
+        logging.warning(f"{QUERY_NAME}_INSTALL - {name}")
+        with open(os.path.join(VIEWS_DIR, f"{name}.sql")) as f:
+            view_sql = f.read()
+        # the view's SQL refers to Augur's tables without their schema.
+        dbm.run_statement(
+            f"SET LOCAL search_path TO augur_data; CREATE MATERIALIZED VIEW augur_data.{name} AS {view_sql} WITH DATA"
+        )
+
+    # every query filters the view by repo.
+    dbm.run_statement(f"CREATE INDEX IF NOT EXISTS {name}_repo_idx ON augur_data.{name} ({view['repo_column']})")
+
+    # created on views that already exist too, as they're checked on every refresh.
+    for index in view.get("indexes", []):
+        dbm.run_statement(
+            f"CREATE INDEX IF NOT EXISTS {name}_{index['name']}_idx ON augur_data.{name} ({', '.join(index['columns'])})"
+            + (f" WHERE {index['where']}" if "where" in index else "")
+        )
+
+    try:
+        dbm.run_statement(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {name}_unique_idx ON augur_data.{name} ({', '.join(view['unique_columns'])})"
+        )
+    except SQLAlchemyError:
+        # rows aren't unique in this database, refresh will lock the view while it runs.
+        logging.warning(f"{QUERY_NAME}_INSTALL - {name} - NO UNIQUE INDEX, CAN'T REFRESH CONCURRENTLY")
+
+    return not exists
+
+
+def refresh_view(dbm, view):
+    """Refreshes the view. Concurrently if possible, so that
+    queries can keep reading the view during the refresh.
+
+    Args:
+        dbm (AugurManager): manager with an engine.
+        view (dict): entry of MATERIALIZED_VIEWS.
+    """
+    name = view["name"]
+
+    df = dbm.run_query(
+        f"""
+        SELECT count(*) FROM pg_indexes
+        WHERE tablename = '{name}' AND indexname = '{name}_unique_idx' AND schemaname = 'augur_data'
+        """
+    )
+
+    if df.iat[0, 0] > 0:
+        dbm.run_statement(f"REFRESH MATERIALIZED VIEW CONCURRENTLY augur_data.{name}")
+    else:
+        dbm.run_statement(f"REFRESH MATERIALIZED VIEW augur_data.{name}")
+
+
+def recache_queries(dbm, queries):
+    """Replaces the cached data of the queries for every
+    repo that currently has data in the cache, in chunks of
+    RECACHE_CHUNK_SIZE repos on the bulk queue. The merged repo-set
+    data built from the old data is deleted once every chunk of a
+    query is done.
+
+    Args:
+        dbm (AugurManager): manager with an engine.
+        queries ([function]): query tasks to run again.
+    """
+    repo_ids = dbm.run_query("SELECT repo_id FROM augur_data.repo")["repo_id"].to_list()
+
+    cache = cm()
+    for q in queries:
+        cached = cache.readym(func=q, repos=repo_ids)
+        if len(cached) == 0:
+            continue
+
+        # lowest priority of the bulk queue, users' selections go first.
+        chunks = [
+            q.si(cached[i : i + RECACHE_CHUNK_SIZE]).set(queue=BULK_QUEUE, priority=9)
+            for i in range(0, len(cached), RECACHE_CHUNK_SIZE)
+        ]
+        chord(chunks)(clear_repo_sets.si(q.name).set(queue=BULK_QUEUE, priority=9))
+        logging.warning(f"{QUERY_NAME}_RECACHE - {q.__name__} - {len(cached)} REPOS - {len(chunks)} TASKS")
+
+
+@celery_app.task(
+    bind=True,
+)
+def clear_repo_sets(self, query):
+    """
+    (Worker Maintenance)
+    Deletes the merged repo-set data of a query task and of its
+    derived data, once its per-repo data has been replaced.
+
+    Args:
+    -----
+        query (str): name of the query task.
+
+    Returns:
+    --------
+        int: number of deleted keys.
+    """
+    cache = cm()
+    n = sum(cache.clear_repo_sets(func=f) for f in cache_funcs(celery_app.tasks[query]))
+    logging.warning(f"{QUERY_NAME}_RECACHE - {query} - {n} SETS CLEARED")
+    return n
+
+
+def get_view_staleness():
+    """Seconds since each view was last refreshed by 8Knot.
+
+    Returns:
+        dict{str: float | None}: view name -> seconds since last refresh, None if never refreshed.
+    """
+    r = get_cache_client(decode_responses=True)
+    last_refresh = r.hgetall(LAST_REFRESH_KEY)
+
+    now = dt.datetime.now(dt.timezone.utc)
+    staleness = {}
+    for view in MATERIALIZED_VIEWS:
+        ts = last_refresh.get(view["name"])
+        staleness[view["name"]] = (now - dt.datetime.fromisoformat(ts)).total_seconds() if ts else None
+
+    return staleness
@@ -0,0 +1,44 @@
+import logging
+from db_manager.augur_manager import AugurManager
+from _celery import celery_app
+from sqlalchemy.exc import SQLAlchemyError
+
+QUERY_NAME = "MULTISELECT_INDEX"
+
+
+@celery_app.task(
+    bind=True,
+)
+def refresh_multiselect_index(self):
+    """
+    (Worker Maintenance)
+    Adds repos that were added to Augur since the last run to the
+    cached search bar rows and stores them under a new version.
+
+    App processes compare their version with the cached one
+    (see AugurManager.refresh_multiselect) and reload the search
+    bar options and repo/org maps when it changes, so new repos
+    become searchable without restarting pods.
+
+    Runs on the schedule set in _celery.py.
+
+    Returns:
+    --------
+        bool: Whether the cached rows changed.
+    """
+    logging.warning(f"{QUERY_NAME}_REFRESH - START")
+
+    try:
+        dbm = AugurManager()
+        dbm.get_engine()
+    except KeyError:
+        logging.error(f"{QUERY_NAME}_REFRESH - INCOMPLETE ENVIRONMENT")
+        return False
+    except SQLAlchemyError:
+        logging.error(f"{QUERY_NAME}_REFRESH - COULDN'T CONNECT TO DB")
+        return False
+
+    changed = dbm.update_multiselect_index()
+
+    logging.warning(f"{QUERY_NAME}_REFRESH - END - CHANGED: {changed}")
+    return changed
@@ -1,14 +1,24 @@
 import logging
 import pandas as pd
 from db_manager.augur_manager import AugurManager
-from app import celery_app
+from _celery import celery_app
 from cache_manager.cache_manager import CacheManager as cm
-import io
+from cache_manager.blobs import to_blob, TIMESTAMP, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
 import datetime as dt
 from sqlalchemy.exc import SQLAlchemyError
 
 QUERY_NAME = "PR_ASSIGNEE"
 
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {
+    "created": TIMESTAMP,
+    "closed": TIMESTAMP,
+    "assign_date": TIMESTAMP,
+    "assignee": DICTIONARY,
+    "assignment_action": DICTIONARY,
+}
+
 
 @celery_app.task(
     bind=True,
@@ -40,11 +50,19 @@ def pr_assignee_query(self, repos):
 
     query_string = f"""
                     SELECT
-                        *
+                        pa.pull_request_id,
+                        pa.id,
+                        pa.created,
+                        pa.closed,
+                        pa.assign_date,
+                        pa.assignment_action,
+                        -- id as text, sliced to remove excess 0s
+                        COALESCE(LEFT(pa.assignee::text, 13), 'None') AS assignee
                     FROM
                         explorer_pr_assignments pa
                     WHERE
-                        pa.id in ({str(repos)[1:-1]})
+                        pa.id in ({str(repos)[1:-1]}) AND
+                        pa.created < '{dt.date.today()} 00:00:00+00'
                 """
 
     try:
@@ -59,46 +77,43 @@ def pr_assignee_query(self, repos):
         # allow retry via Celery rules.
         raise SQLAlchemyError("DBConnect failed")
 
-    df = dbm.run_query(query_string)
+    qm = QueryMetrics(QUERY_NAME, repos)
 
-    # id as string and slice to remove excess 0s
-    df["assignee"] = df["assignee"].astype(str)
-    df["assignee"] = df["assignee"].str[:13]
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
 
-    # change to compatible type and remove all data that has been incorrectly formated
-    df["created"] = pd.to_datetime(df["created"], utc=True).dt.date
-    df = df[df.created < dt.date.today()]
+    # change to compatible type
+    df["created"] = pd.to_datetime(df["created"], utc=True).dt.floor("D")
 
     pic = []
 
     for i, r in enumerate(repos):
         # convert series to a dataframe
-        c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
-
-        # bytes buffer to be written to
-        b = io.BytesIO()
-
-        # write dataframe in feather format to BytesIO buffer
-        bs = c_df.to_feather(b)
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
 
-        # move head of buffer to the beginning
-        b.seek(0)
-
-        # write the bytes of the buffer into the array
-        bs = b.read()
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
         pic.append(bs)
 
+    qm.record_blobs(repos, pic)
+
     del df
 
     # store results in Redis
     cm_o = cm()
 
     # 'ack' is a boolean of whether data was set correctly or not.
-    ack = cm_o.setm(
-        func=pr_assignee_query,
-        repos=repos,
-        datas=pic,
-    )
+    with qm.phase("redis_write"):
+        ack = cm_o.setm(
+            func=pr_assignee_query,
+            repos=repos,
+            datas=pic,
+        )
+    qm.publish()
     logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
 
     return ack
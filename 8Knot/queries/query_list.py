@@ -0,0 +1,53 @@
+from queries.issues_query import issues_query
+from queries.commit_activity_query import commit_activity_query
+from queries.contributors_query import contributors_query, DERIVED as CONTRIBUTORS_DERIVED
+from queries.prs_query import prs_query
+from queries.affiliation_query import affiliation_query
+from queries.email_domains_query import email_domains_query
+from queries.issue_assignee_query import issue_assignee_query
+from queries.pr_assignee_query import pr_assignee_query
+
+"""
+Query tasks whose data the visualizations read.
+
+Defined once here for the callback that runs them for a selection
+(pages/index/index_callbacks.py), the off-peak cache warming
+(queries/cache_warming.py) and the refresh of the materialized views
+(queries/materialized_views.py).
+"""
+
+# query tasks that read each materialized view, their cached data is replaced when the view is refreshed.
+VIEW_QUERIES = {
+    # the home page's commit metrics read explorer_commits too, they aren't cached.
+    "explorer_commits": [commit_activity_query],
+    "explorer_contributor_actions": [
+        contributors_query,
+        affiliation_query,
+        email_domains_query,
+    ],
+    "explorer_issue_assignments": [issue_assignee_query],
+    "explorer_pr_assignments": [pr_assignee_query],
+}
+
+# every query task whose data the visualizations read.
+QUERIES = [issues_query, prs_query] + [q for queries in VIEW_QUERIES.values() for q in queries]
+
+# data that query tasks derive from the rows they fetch and cache per repo besides their own,
+# see 'DERIVED' of queries/contributors_query.py.
+DERIVED = {contributors_query.__name__: list(CONTRIBUTORS_DERIVED)}
+
+
+def cache_funcs(query):
+    """
+    Functions whose names key the data that a query task caches per repo.
+    A repo's data of the query is complete once all of them are cached.
+
+    Args:
+    -----
+        query (celery.Task): query task.
+
+    Returns:
+    --------
+        [function]: the task and the derive functions of its derived data.
+    """
+    return [query, *DERIVED.get(query.__name__, [])]
@@ -1,9 +1,10 @@
 import logging
 import pandas as pd
 from db_manager.augur_manager import AugurManager
-from app import celery_app
+from _celery import celery_app
 from cache_manager.cache_manager import CacheManager as cm
-import io
+from cache_manager.blobs import to_blob, TIMESTAMP, DICTIONARY
+from metrics_manager.query_metrics import QueryMetrics
 import datetime as dt
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -12,15 +13,20 @@ TODO:
 (1) update QUERY_NAME
 (2) update 'NAME_query' found in function definition and in the function call that sets the 'ack' variable below.
 'NAME' should be the same as QUERY_NAME
-(3) paste SQL query in the query_string
+(3) paste SQL query in the query_string. filter rows and map values in the SQL (WHERE, CASE) rather than in pandas,
+so that only the rows and values that are cached leave the database
 (4) insert any necessary df column name or format changed under the pandas column and format updates comment
 (5) reset df index if #4 is performed via "df = df.reset_index(drop=True)"
-(6) go to index/index_callbacks.py and import the NAME_query as a unqiue acronym and add it to the QUERIES list
-(7) delete this list when completed
+(6) declare the time columns (TIMESTAMP) and repeated string columns (DICTIONARY) in SCHEMA
+(7) go to index/index_callbacks.py and import the NAME_query as a unqiue acronym and add it to the QUERIES list
+(8) delete this list when completed
 """
 
 QUERY_NAME = "NAME"
 
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {"created": TIMESTAMP, "repo_name": DICTIONARY}
+
 
 @celery_app.task(
     bind=True,
@@ -47,13 +53,16 @@ def NAME_query(self, repos):
     if len(repos) == 0:
         return None
 
+    # today's rows are incomplete. the date is midnight UTC, columns without time zone hold UTC times
+    # and ignore the literal's offset.
     query_string = f"""
                     SELECT
 
                     FROM
 
                     WHERE
-                        repo_id in ({str(repos)[1:-1]})
+                        repo_id in ({str(repos)[1:-1]}) AND
+                        created < '{dt.date.today()} 00:00:00+00'
                 """
 
     try:
@@ -68,51 +77,51 @@ def NAME_query(self, repos):
         # allow retry via Celery rules.
         raise SQLAlchemyError("DBConnect failed")
 
-    df = dbm.run_query(query_string)
+    qm = QueryMetrics(QUERY_NAME, repos)
+
+    with qm.phase("sql"):
+        df = dbm.run_query(query_string)
+    qm.record_result(df)
+    qm.explain(dbm, query_string)
 
     # pandas column and format updates
     """Commonly used df updates:
 
-    df["cntrb_id"] = df["cntrb_id"].astype(str)  # contributor ids to strings
     df = df.sort_values(by="created")
     df = df.reset_index()
     df = df.reset_index(drop=True)
 
     """
-    # change to compatible type and remove all data that has been incorrectly formated
-    df["created"] = pd.to_datetime(df["created"], utc=True).dt.date
-    df = df[df.created < dt.date.today()]
+    # change to compatible type
+    df["created"] = pd.to_datetime(df["created"], utc=True).dt.floor("D")
 
     pic = []
 
     for i, r in enumerate(repos):
         # convert series to a dataframe
-        c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
-
-        # bytes buffer to be written to
-        b = io.BytesIO()
+        with qm.phase("split"):
+            c_df = pd.DataFrame(df.loc[df["id"] == r]).reset_index(drop=True)
 
-        # write dataframe in feather format to BytesIO buffer
-        bs = c_df.to_feather(b)
-
-        # move head of buffer to the beginning
-        b.seek(0)
-
-        # write the bytes of the buffer into the array
-        bs = b.read()
+        with qm.phase("serialize"):
+            # write dataframe in feather format, with the declared column types
+            bs = to_blob(c_df, SCHEMA)
         pic.append(bs)
 
+    qm.record_blobs(repos, pic)
+
     del df
 
     # store results in Redis
     cm_o = cm()
 
     # 'ack' is a boolean of whether data was set correctly or not.
-    ack = cm_o.setm(
-        func=NAME_query,
-        repos=repos,
-        datas=pic,
-    )
+    with qm.phase("redis_write"):
+        ack = cm_o.setm(
+            func=NAME_query,
+            repos=repos,
+            datas=pic,
+        )
+    qm.publish()
     logging.warning(f"{QUERY_NAME}_DATA_QUERY - END")
 
     return ack
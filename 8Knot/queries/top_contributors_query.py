@@ -0,0 +1,49 @@
+from cache_manager.blobs import TIMESTAMP, DICTIONARY
+from cache_manager.sketches import top_n_sketches
+
+"""
+Most active contributors of each repo, month and action, derived from the
+rows that 'contributors_query' fetches and cached per repo besides them.
+"""
+
+# types of the cached columns, see cache_manager/blobs.py
+SCHEMA = {
+    "repo_name": DICTIONARY,
+    "month": TIMESTAMP,
+    "Action": DICTIONARY,
+    "cntrb_id": DICTIONARY,
+    "login": DICTIONARY,
+}
+
+# contributors kept per repo, month and action, the largest top k of the visualizations.
+TOP_N = 100
+
+
+def top_contributors_query(df):
+    """
+    (Derived Data)
+    Ranks the contributors of each repo, month and action by their number of actions.
+
+    The TOP_N contributors with the most actions of each repo, month and action
+    are kept with their number of actions, the actions of the other contributors
+    are summed into a row without a contributor. The rows of any repos and months
+    are merged to rank contributors without the rows of 'contributors_query',
+    see cache_manager/sketches.py.
+
+    Args:
+    -----
+        df (pd.DataFrame): rows of 'contributors_query' with their 'id' and exact 'created_at'.
+
+    Returns:
+    --------
+        pd.DataFrame: kept contributors and remainder row of each repo ('id'), month and action.
+    """
+    # month of the action in UTC.
+    month = df["created_at"].dt.tz_localize(None).dt.to_period("M").dt.to_timestamp().dt.tz_localize("UTC")
+    df = df[["id", "repo_name", "Action", "cntrb_id", "login"]].assign(month=month)
+
+    # one row per contributor of each repo, month and action, a contributor without a login is kept.
+    keys = ["id", "repo_name", "month", "Action"]
+    counts = df.groupby(keys + ["cntrb_id", "login"], sort=False, dropna=False).size().rename("actions").reset_index()
+
+    return top_n_sketches(counts, keys, ["cntrb_id", "login"], "actions", TOP_N)
@@ -1,16 +1,38 @@
 import logging
-from app import celery_app, augur
+from db_manager.augur_manager import AugurManager
+from _celery import celery_app
+from cache_manager.redis_clients import get_users_client
 import pandas as pd
 from cache_manager.cache_manager import CacheManager as cm
 import io
 import datetime as dt
 from sqlalchemy.exc import SQLAlchemyError
-import redis
 import json
-import os
 
 QUERY_NAME = "USER_GROUPS_QUERY"
 
+# Augur connection of this worker, created on first use so that
+# workers that never see a logged-in user don't load the search index.
+_augur = None
+
+
+def get_augur():
+    """
+    Returns this worker's AugurManager, with the
+    search index that maps repo urls to repo_ids.
+
+    Returns:
+    --------
+        AugurManager: connected manager.
+    """
+    global _augur
+    if _augur is None:
+        augur = AugurManager(handles_oauth=True)
+        augur.get_engine()
+        augur.multiselect_startup()
+        _augur = augur
+    return _augur
+
 
 @celery_app.task(
     bind=True,
@@ -32,15 +54,8 @@ def user_groups_query(self, user_id):
     """
     logging.warning(f"{QUERY_NAME}_DATA_QUERY - START")
 
-    users_cache = redis.StrictRedis(
-        host=os.getenv("REDIS_SERVICE_USERS_HOST", "redis-users"),
-        port=6379,
-        password=os.getenv("REDIS_PASSWORD", ""),
-    )
-
-    # checks connection to Redis, raises redis.exceptions.ConnectionError if connection fails.
-    # returns True if connection succeeds.
-    users_cache.ping()
+    # raises redis.exceptions.ConnectionError if the connection fails.
+    users_cache = get_users_client()
 
     # check if user is in sessions
     if not users_cache.exists(user_id):
@@ -72,7 +87,7 @@ def get_user_groups(username, bearer_token):
     """
 
     # request to get user's groups
-    augur_users_groups = augur.make_user_request(access_token=bearer_token)
+    augur_users_groups = get_augur().make_user_request(access_token=bearer_token)
 
     # structure of the incoming data
     # [{group_name: {favorited: False, repos: [{repo_git: asd;lfkj, repo_id=46555}, ...]}, ...]
@@ -139,7 +154,7 @@ def parse_repolist(repo_list, prepend_to_url=""):
             continue
 
         # translate that natural key to the repo's ID in the primary database
-        repo_id_translated = augur.repo_git_to_id(prepend_to_url + repo_url)
+        repo_id_translated = get_augur().repo_git_to_id(prepend_to_url + repo_url)
 
         # check if the translation worked.
         if not repo_id_translated:
@@ -0,0 +1,17 @@
+import os
+import sys
+import pytest
+
+"""
+Unit tests of the app's pure-logic modules, run from 8Knot/ with 'python -m pytest tests'.
+Modules import each other from the 8Knot/ directory, like the app and the workers do.
+"""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def fake_redis():
+    """Redis client of an in-memory server, returns bytes like the app's cache client."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis()
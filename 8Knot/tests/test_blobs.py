@@ -0,0 +1,76 @@
+import pandas as pd
+import pyarrow as pa
+from cache_manager import blobs
+
+SCHEMA = {"created_at": blobs.TIMESTAMP, "Action": blobs.DICTIONARY}
+
+
+def _frame(actions, times, ids):
+    return pd.DataFrame({"Action": actions, "created_at": times, "id": ids})
+
+
+def _roundtrip(df, schema=SCHEMA):
+    return blobs.to_frame(blobs.read_table(blobs.to_blob(df, schema)))
+
+
+def test_to_blob_declared_types():
+    df = _frame(["PR Opened", "Commit"], ["2022-01-01 10:00:00+02:00", "2022-01-02"], [1, 2])
+    table = blobs.read_table(blobs.to_blob(df, SCHEMA))
+
+    assert table.schema.field("created_at").type == blobs.TIMESTAMP
+    assert table.schema.field("Action").type == blobs.DICTIONARY
+    assert table.schema.field("id").type == pa.int64()
+
+
+def test_roundtrip_values():
+    df = _roundtrip(
+        _frame(["PR Opened", None, "PR Opened"], ["2022-01-01 10:00:00+02:00", None, "2022-01-03"], [1, 2, 3])
+    )
+
+    assert str(df["created_at"].dtype) == "datetime64[ns, UTC]"
+    assert df["created_at"].iloc[0] == pd.Timestamp("2022-01-01 08:00:00", tz="UTC")
+    assert df["created_at"].isna().tolist() == [False, True, False]
+    assert df["Action"].dtype == object
+    assert df["Action"].tolist() == ["PR Opened", None, "PR Opened"]
+    # a value's rows share one str object.
+    assert df["Action"].iloc[0] is df["Action"].iloc[2]
+
+
+def test_empty_and_all_null_columns():
+    df = _roundtrip(pd.DataFrame({"Action": pd.Series([], dtype=object), "created_at": pd.Series([], dtype=object)}))
+    assert df.empty
+    assert list(df.columns) == ["Action", "created_at"]
+
+    df = _roundtrip(_frame([None, None], [None, None], [1, 2]))
+    assert df["Action"].isna().all()
+    assert df["created_at"].isna().all()
+
+
+def test_merge_tables_unifies_dictionaries():
+    a = blobs.read_table(blobs.to_blob(_frame(["PR Opened"], ["2022-01-01"], [1]), SCHEMA))
+    b = blobs.read_table(blobs.to_blob(_frame(["Commit", "PR Opened"], ["2022-01-02", "2022-01-03"], [2, 3]), SCHEMA))
+
+    merged = blobs.read_table(blobs.table_to_blob(blobs.merge_tables([a, b])))
+
+    assert merged.schema.field("Action").type == blobs.DICTIONARY
+    assert blobs.to_frame(merged)["Action"].tolist() == ["PR Opened", "Commit", "PR Opened"]
+
+
+def test_merge_tables_keeps_types_when_inferred_types_differ():
+    # ids with a null are floats in pandas, doubles in Arrow.
+    a = blobs.read_table(blobs.to_blob(_frame(["PR Opened"], ["2022-01-01"], [1]), SCHEMA))
+    b = blobs.read_table(blobs.to_blob(_frame(["Commit", "Commit"], ["2022-01-02", None], [2.0, None]), SCHEMA))
+
+    merged = blobs.merge_tables([a, b])
+
+    assert merged.schema.field("Action").type == blobs.DICTIONARY
+    assert merged.schema.field("created_at").type == blobs.TIMESTAMP
+    assert blobs.to_frame(merged)["id"].tolist()[:2] == [1, 2]
+
+
+def test_merge_tables_skips_empty_tables():
+    empty = blobs.read_table(blobs.to_blob(_frame([], [], []), SCHEMA))
+    a = blobs.read_table(blobs.to_blob(_frame(["Commit"], ["2022-01-02"], [2]), SCHEMA))
+
+    assert blobs.merge_tables([empty, a]).num_rows == 1
+    assert blobs.merge_tables([empty]).num_rows == 0
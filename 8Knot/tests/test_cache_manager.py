@@ -0,0 +1,128 @@
+import pandas as pd
+import pytest
+from cache_manager import blobs
+from cache_manager.cache_manager import CacheManager, repo_set_key
+
+
+def _query():
+    pass
+
+
+def _other_query():
+    pass
+
+
+def _cache(redis):
+    cm = CacheManager.__new__(CacheManager)
+    cm._redis = redis
+    return cm
+
+
+def test_repo_set_key_ignores_order_and_duplicates():
+    assert repo_set_key([1, 2]) == repo_set_key([2, 1]) == repo_set_key([2, 1, 1])
+    assert repo_set_key(["1", "2"]) == repo_set_key([1, 2])
+
+
+def test_repo_set_key_differs_between_sets():
+    assert repo_set_key([1, 2]) != repo_set_key([1, 2, 3])
+    # ids aren't concatenated without a separator.
+    assert repo_set_key([1, 23]) != repo_set_key([12, 3])
+
+
+def test_set_keys_depend_on_func_not_order(fake_redis):
+    cm = _cache(fake_redis)
+    cm.set_repo_set(_query, [3, 1, 2], b"merged")
+
+    assert cm.get_repo_set(_query, [1, 2, 3]) == b"merged"
+    assert cm.get_repo_set(_query, [1, 2, 3, 3]) == b"merged"
+    assert cm.get_repo_set(_other_query, [1, 2, 3]) is None
+
+
+def test_clear_repo_sets_only_deletes_func_sets(fake_redis):
+    cm = _cache(fake_redis)
+    cm.set_repo_set(_query, [1, 2], b"a")
+    cm.set_repo_set(_query, [1, 3], b"b")
+    cm.set_repo_set(_other_query, [1, 2], b"c")
+
+    assert cm.clear_repo_sets(_query) == 2
+    assert cm.get_repo_set(_query, [1, 2]) is None
+    assert cm.get_repo_set(_other_query, [1, 2]) == b"c"
+
+
+def _cache_repo(cm, repo, n):
+    df = pd.DataFrame({"id": [repo] * n, "Action": ["PR Opened"] * n})
+    cm.set(_query, repo, blobs.to_blob(df, {"Action": blobs.DICTIONARY}))
+
+
+def test_grabm_without_repos_is_empty(fake_redis):
+    cm = _cache(fake_redis)
+    assert cm.grabm(_query, []).empty
+
+
+def test_grabm_waits_for_every_repo(fake_redis):
+    cm = _cache(fake_redis)
+    _cache_repo(cm, 1, 2)
+    assert cm.grabm(_query, [1, 2]) is None
+
+    _cache_repo(cm, 2, 3)
+    df = cm.grabm(_query, [2, 1])
+    assert sorted(df["id"].tolist()) == [1, 1, 2, 2, 2]
+
+
+def test_grabm_caches_merged_set(fake_redis):
+    cm = _cache(fake_redis)
+    _cache_repo(cm, 1, 2)
+    _cache_repo(cm, 2, 3)
+    cm.grabm(_query, [1, 2])
+
+    # the set is read from its own blob once its repos are gone.
+    fake_redis.delete(cm._get_hash(_query, 1), cm._get_hash(_query, 2))
+    assert len(cm.grabm(_query, [2, 1])) == 5
+    assert cm.grabm(_query, [1]) is None
+
+
+def test_grabm_partial_merges_only_new_repos(fake_redis):
+    cm = _cache(fake_redis)
+    _cache_repo(cm, 1, 2)
+
+    df, ready, partial = cm.grabm_partial(_query, [1, 2, 3])
+    assert len(df) == 2
+    assert ready == pytest.approx(1 / 3)
+    assert partial[1] == {1}
+
+    # no new repos: no frame, the same partial data.
+    df, ready, same = cm.grabm_partial(_query, [1, 2, 3], partial)
+    assert df is None
+    assert same is partial
+
+    # repo 1's blob isn't read again.
+    fake_redis.delete(cm._get_hash(_query, 1))
+    _cache_repo(cm, 2, 3)
+    df, ready, partial = cm.grabm_partial(_query, [1, 2, 3], partial)
+    assert sorted(df["id"].tolist()) == [1, 1, 2, 2, 2]
+    assert ready == pytest.approx(2 / 3)
+    assert cm.get_repo_set(_query, [1, 2, 3]) is None
+
+    _cache_repo(cm, 3, 1)
+    df, ready, partial = cm.grabm_partial(_query, [1, 2, 3], partial)
+    assert len(df) == 6
+    assert ready == 1.0
+    assert cm.get_repo_set(_query, [3, 2, 1]) is not None
+
+
+def test_grabm_partial_reads_cached_set(fake_redis):
+    cm = _cache(fake_redis)
+    _cache_repo(cm, 1, 2)
+    _cache_repo(cm, 2, 3)
+    cm.grabm(_query, [1, 2])
+
+    df, ready, partial = cm.grabm_partial(_query, [2, 1, 1])
+    assert len(df) == 5
+    assert ready == 1.0
+    assert partial is None
+
+
+def test_grabm_partial_without_repos_is_ready(fake_redis):
+    df, ready, _ = _cache(fake_redis).grabm_partial(_query, [])
+    assert df.empty
+    assert ready == 1.0
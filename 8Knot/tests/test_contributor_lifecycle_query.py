@@ -0,0 +1,82 @@
+import pandas as pd
+from queries.contributor_lifecycle_query import ACTIONS, contributor_lifecycle_query, merge_repos
+
+
+def _actions(rows):
+    # rows of 'contributors_query': repo, contributor, action, time and rank from the latest action.
+    df = pd.DataFrame(rows, columns=["id", "cntrb_id", "Action", "created_at", "rank"])
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+    return df
+
+
+def test_lifecycle_of_each_contributor():
+    df = _actions(
+        [
+            (1, "a", "PR Opened", "2022-03-01 12:00", 3),
+            (1, "a", "Commit", "2022-01-05 18:30", 4),
+            (1, "a", "PR Merged", "2022-04-01 09:00", 1),
+            (1, "b", "Issue Opened", "2022-02-01 00:00", 1),
+            (2, "a", "Issue Comment", "2021-12-01 00:00", 1),
+        ]
+    )
+    summary = contributor_lifecycle_query(df).set_index(["id", "cntrb_id"])
+
+    a = summary.loc[(1, "a")]
+    assert a["first_seen"] == pd.Timestamp("2022-01-05", tz="UTC")
+    assert a["last_seen"] == pd.Timestamp("2022-04-01", tz="UTC")
+    assert a["first_action"] == "Commit"
+    assert a["contributions"] == 3
+    assert a[ACTIONS].to_dict() == {c: int(c in ["Commit", "PR Opened", "PR Merged"]) for c in ACTIONS}
+
+    assert summary.loc[(1, "b"), "first_action"] == "Issue Opened"
+    assert summary.loc[(2, "a"), "contributions"] == 1
+    assert len(summary) == 3
+
+
+def test_first_action_of_actions_at_the_same_time():
+    # the higher rank is the earlier action.
+    df = _actions(
+        [
+            (1, "a", "PR Merged", "2022-01-01 10:00", 1),
+            (1, "a", "PR Opened", "2022-01-01 10:00", 2),
+        ]
+    )
+    assert contributor_lifecycle_query(df)["first_action"].tolist() == ["PR Opened"]
+
+
+def test_merge_repos():
+    df = _actions(
+        [
+            (1, "a", "PR Opened", "2022-03-01", 2),
+            (1, "a", "Commit", "2022-06-01", 1),
+            (2, "a", "Issue Opened", "2022-01-01", 2),
+            (2, "a", "Issue Opened", "2022-02-01", 1),
+            (2, "b", "Commit", "2022-05-01", 1),
+        ]
+    )
+    merged = merge_repos(contributor_lifecycle_query(df)).set_index("cntrb_id")
+
+    a = merged.loc["a"]
+    assert a["first_seen"] == pd.Timestamp("2022-01-01", tz="UTC")
+    assert a["last_seen"] == pd.Timestamp("2022-06-01", tz="UTC")
+    # the first action of the repo that the contributor was first seen in.
+    assert a["first_action"] == "Issue Opened"
+    assert a["contributions"] == 4
+    assert (a["Issue Opened"], a["PR Opened"], a["Commit"]) == (2, 1, 1)
+    assert merged.loc["b", "contributions"] == 1
+    assert len(merged) == 2
+
+
+def test_merge_repos_matches_lifecycle_of_all_rows():
+    df = _actions(
+        [
+            (repo, f"c{(repo * 7 + i) % 5}", ACTIONS[(repo + i) % len(ACTIONS)], f"2022-{1 + i % 12:02d}-{1 + repo}", i)
+            for repo in range(3)
+            for i in range(30)
+        ]
+    )
+    merged = merge_repos(contributor_lifecycle_query(df)).set_index("cntrb_id").sort_index()
+    whole = contributor_lifecycle_query(df.assign(id=0)).drop(columns="id").set_index("cntrb_id").sort_index()
+
+    cols = ["first_seen", "last_seen", "contributions"] + ACTIONS
+    pd.testing.assert_frame_equal(merged[cols], whole[cols], check_dtype=False)
@@ -0,0 +1,81 @@
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from cache_manager import blobs
+from cache_manager.cache_manager import CacheManager
+from metrics_manager import metrics
+from pages.utils import job_utils
+
+
+def _query():
+    pass
+
+
+@pytest.fixture
+def cache(fake_redis, monkeypatch):
+    cm = CacheManager.__new__(CacheManager)
+    cm._redis = fake_redis
+    monkeypatch.setattr(job_utils, "cm", lambda: cm)
+    monkeypatch.setattr(metrics, "get_cache_client", lambda *args, **kwargs: fake_redis)
+    return cm
+
+
+def _cache_repo(cm, repo):
+    cm.set(_query, repo, blobs.to_blob(pd.DataFrame({"id": [repo], "n": [repo]}), {}))
+
+
+def _arrivals(cm, monkeypatch, arrivals):
+    # each sleep of wait_for_data caches the repos of the next step.
+    steps = iter(arrivals)
+
+    def sleep(seconds):
+        for repo in next(steps):
+            _cache_repo(cm, repo)
+
+    monkeypatch.setattr(job_utils.time, "sleep", sleep)
+
+
+def test_wait_for_data_draws_only_when_more_repos_are_ready(cache, monkeypatch):
+    _cache_repo(cache, 1)
+    _arrivals(cache, monkeypatch, [[], [], [2], [], [3]])
+
+    renders, progress = [], []
+
+    def render(df):
+        renders.append(sorted(df["id"]))
+        return go.Figure([go.Bar(x=df["id"], y=df["n"])])
+
+    df = job_utils.wait_for_data(_query, [1, 2, 3], progress.append, render)
+
+    assert sorted(df["id"]) == [1, 2, 3]
+    # the complete selection is drawn by the callback, not as a partial figure.
+    assert renders == [[1], [1, 2]]
+    assert [p[1:] for p in progress] == [[{"display": "block"}, {"display": "none"}]] * 2
+    assert progress[-1][0].layout.title.text == "Loading: 67% of repos ready"
+
+
+def test_wait_for_data_skips_figures_that_fail(cache, monkeypatch):
+    _cache_repo(cache, 1)
+    _arrivals(cache, monkeypatch, [[2]])
+    progress = []
+
+    def render(df):
+        raise KeyError("column")
+
+    df = job_utils.wait_for_data(_query, [1, 2], progress.append, render)
+
+    assert len(df) == 2
+    assert progress == []
+
+
+def test_wait_for_data_without_progress_waits_for_all(cache, monkeypatch):
+    _arrivals(cache, monkeypatch, [[1], [2]])
+    assert sorted(job_utils.wait_for_data(_query, [1, 2])["id"]) == [1, 2]
+
+
+def test_partial_progress_resets_graphs():
+    args = job_utils.partial_progress("page-viz")
+
+    assert [str(o) for o in args["progress"]] == ["page-viz-partial.figure", "page-viz-partial.style", "page-viz.style"]
+    assert args["progress_default"][1:] == [{"display": "none"}, {"display": "block"}]
+    assert job_utils.partial_graph("page-viz").style == {"display": "none"}
@@ -0,0 +1,65 @@
+import pytest
+from metrics_manager import metrics
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def client(decode_responses=False):
+        return fakeredis.FakeRedis(server=server, decode_responses=decode_responses)
+
+    monkeypatch.setattr(metrics, "get_cache_client", client)
+    return client(decode_responses=True)
+
+
+def test_label_string_is_sorted():
+    assert metrics._label_string({"viz": "a", "phase": "wait"}) == 'phase="wait",viz="a"'
+    assert metrics._label_string({}) == ""
+
+
+def test_sample_without_labels():
+    assert metrics._sample("m", "", 3) == "m 3"
+    assert metrics._sample("m", 'q="a"', 3) == 'm{q="a"} 3'
+
+
+def test_render_histogram_is_cumulative():
+    samples = {
+        'bucket|0.5|viz="a"': "1",
+        'bucket|1.0|viz="a"': "2",
+        'sum||viz="a"': "1.25",
+        'count||viz="a"': "3",
+    }
+    lines = metrics._render_histogram("h", samples)
+
+    assert len(lines) == len(metrics.BUCKETS) + 3
+    assert 'h_bucket{viz="a",le="0.25"} 0' in lines
+    assert 'h_bucket{viz="a",le="1.0"} 2' in lines
+    assert lines[-3:] == ['h_bucket{viz="a",le="+Inf"} 3', 'h_sum{viz="a"} 1.25', 'h_count{viz="a"} 3']
+
+
+def test_render_histogram_without_labels():
+    lines = metrics._render_histogram("h", {"count||": "1", "sum||": "2.0"})
+    assert lines[-3:] == ['h_bucket{le="+Inf"} 1', "h_sum 2.0", "h_count 1"]
+
+
+def test_render_metrics(redis):
+    metrics.observe("eightknot_grabm_wait_seconds", 0.3, query="q")
+    metrics.observe("eightknot_grabm_wait_seconds", 700, query="q")
+    metrics.inc("eightknot_cache_requests_total", 2, query="q", result="hit")
+    redis.rpush("data", "t1", "t2")
+    redis.rpush("data:3", "t3")
+
+    lines = metrics.render_metrics().splitlines()
+
+    assert "# TYPE eightknot_grabm_wait_seconds histogram" in lines
+    assert 'eightknot_grabm_wait_seconds_bucket{query="q",le="0.25"} 0' in lines
+    assert 'eightknot_grabm_wait_seconds_bucket{query="q",le="0.5"} 1' in lines
+    assert 'eightknot_grabm_wait_seconds_bucket{query="q",le="600.0"} 1' in lines
+    assert 'eightknot_grabm_wait_seconds_bucket{query="q",le="+Inf"} 2' in lines
+    assert 'eightknot_grabm_wait_seconds_count{query="q"} 2' in lines
+    assert 'eightknot_cache_requests_total{query="q",result="hit"} 2' in lines
+    # prioritized tasks are in lists of their own.
+    assert 'eightknot_celery_queue_length{queue="data"} 3' in lines
+    assert 'eightknot_celery_queue_length{queue="celery"} 0' in lines
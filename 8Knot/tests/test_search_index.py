@@ -0,0 +1,57 @@
+import random
+from db_manager.search_index import SearchIndex
+
+OPTIONS = [
+    {"label": "chaoss/augur", "value": 1},
+    {"label": "chaoss/grimoirelab", "value": 2},
+    {"label": "oss-aspen/8Knot", "value": 3},
+    {"label": "chaoss", "value": "chaoss"},
+    {"label": "oss-aspen", "value": "oss-aspen"},
+]
+
+
+def _scan(options, query, limit=100):
+    # ranking of the search bar before the index: every label is checked.
+    matches = [o for o in options if query.lower() in o["label"].lower()]
+    return sorted(matches, key=lambda o: (len(o["label"]), o["label"]))[:limit]
+
+
+def test_search_ranks_shortest_label_first():
+    index = SearchIndex(OPTIONS)
+    assert [o["value"] for o in index.search("chaoss")] == ["chaoss", 1, 2]
+
+
+def test_search_ignores_case():
+    index = SearchIndex(OPTIONS)
+    assert [o["value"] for o in index.search("8kNOT")] == [3]
+    assert [o["value"] for o in index.search("OSS-")] == ["oss-aspen", 3]
+
+
+def test_search_short_queries():
+    index = SearchIndex(OPTIONS)
+    assert [o["value"] for o in index.search("os")] == ["chaoss", "oss-aspen", 1, 3, 2]
+    assert [o["value"] for o in index.search("")] == ["chaoss", "oss-aspen", 1, 3, 2]
+
+
+def test_search_limit_and_no_match():
+    index = SearchIndex(OPTIONS)
+    assert [o["value"] for o in index.search("s", limit=2)] == ["chaoss", "oss-aspen"]
+    assert index.search("kubernetes") == []
+
+
+def test_search_matches_a_scan_of_all_labels():
+    rng = random.Random(0)
+    alphabet = "abc/-"
+    options = [{"label": "".join(rng.choices(alphabet, k=rng.randint(1, 12))), "value": i} for i in range(500)]
+    index = SearchIndex(options)
+
+    for _ in range(200):
+        query = "".join(rng.choices(alphabet, k=rng.randint(1, 5)))
+        assert index.search(query, limit=20) == _scan(options, query, limit=20)
+
+
+def test_get():
+    index = SearchIndex(OPTIONS)
+    assert index.get(3)["label"] == "oss-aspen/8Knot"
+    assert index.get("chaoss")["label"] == "chaoss"
+    assert index.get(4) is None
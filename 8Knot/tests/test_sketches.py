@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from cache_manager.sketches import REGISTERS, hll_estimate, hll_registers, hll_sketches
+from queries.contributor_sketches_query import contributor_sketches_query
+
+
+def _ids(n, prefix="c"):
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def test_registers_are_deterministic_and_in_range():
+    values = pd.Series(_ids(1000))
+    registers, ranks = hll_registers(values)
+
+    assert registers.min() >= 0 and registers.max() < REGISTERS
+    assert ranks.min() >= 1
+    np.testing.assert_array_equal(hll_registers(values.copy())[0], registers)
+
+
+def test_sketches_skip_nulls_and_keep_empty_groups():
+    df = pd.DataFrame({"k": ["a", "a", "a", "b"], "v": ["x", "x", None, None]})
+    sketches = hll_sketches(df, ["k"], "v").set_index("k")
+
+    assert len(sketches.loc["a", "registers"]) == 1
+    assert sketches.loc["a", "registers"].dtype == np.int16
+    assert sketches.loc["a", "ranks"].dtype == np.int8
+    assert len(sketches.loc["b", "registers"]) == 0
+
+    estimate = hll_estimate(sketches.reset_index(), ["k"])
+    assert estimate.to_dict() == {"a": 1, "b": 0}
+
+
+def test_small_counts_are_exact():
+    df = pd.DataFrame({"k": np.repeat(["a", "b"], 100), "v": _ids(50) * 4})
+    estimate = hll_estimate(hll_sketches(df, ["k"], "v"), ["k"])
+    assert estimate.to_dict() == {"a": 50, "b": 50}
+
+
+def test_large_counts_are_within_error():
+    n = 50_000
+    df = pd.DataFrame({"k": 1, "v": _ids(n)})
+    estimate = hll_estimate(hll_sketches(df, ["k"], "v"), ["k"]).iloc[0]
+
+    # the standard error is 1.6%.
+    assert abs(estimate - n) / n < 0.05
+
+
+def test_merged_sketches_estimate_the_union():
+    # repos share half of their contributors.
+    df = pd.DataFrame(
+        {
+            "repo": np.repeat([1, 2, 3], 2000),
+            "month": np.tile(np.repeat(["2022-01", "2022-02"], 1000), 3),
+            "v": _ids(2000, "a") + _ids(1000, "a") + _ids(1000, "b") + _ids(2000, "b"),
+        }
+    )
+    sketches = hll_sketches(df, ["repo", "month"], "v")
+
+    # merging sketches gives the sketch of the union of their rows.
+    merged = hll_estimate(sketches.assign(all=0), ["all"]).iloc[0]
+    whole = hll_estimate(hll_sketches(df.assign(all=0), ["all"], "v"), ["all"]).iloc[0]
+    assert merged == whole
+    assert abs(merged - 4000) / 4000 < 0.05
+
+    by_month = hll_estimate(sketches, ["month"])
+    exact = df.groupby("month")["v"].nunique()
+    assert list(by_month.index) == list(exact.index)
+    assert ((by_month - exact).abs() / exact < 0.05).all()
+
+
+def test_contributor_sketches_query():
+    df = pd.DataFrame(
+        {
+            "id": 1,
+            "repo_name": "augur",
+            "Action": ["Commit", "Commit", "Commit", "PR Opened"],
+            "cntrb_id": ["a", "a", "b", "a"],
+            "created_at": pd.to_datetime(["2022-01-31 23:00", "2022-01-01", "2022-02-01", "2022-01-10"], utc=True),
+        }
+    )
+    sketches = contributor_sketches_query(df)
+    estimate = hll_estimate(sketches, ["month", "Action"])
+
+    assert sketches["actions"].sum() == 4
+    assert estimate.to_dict() == {
+        (pd.Timestamp("2022-01-01", tz="UTC"), "Commit"): 1,
+        (pd.Timestamp("2022-01-01", tz="UTC"), "PR Opened"): 1,
+        (pd.Timestamp("2022-02-01", tz="UTC"), "Commit"): 1,
+    }
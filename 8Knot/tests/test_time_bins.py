@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.utils.time_bins import count_by_interval, floor_times
+
+PERIODS = {"D": "D", "W": "W", "M": "M", "Y": "Y"}
+
+
+def _times():
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(
+        pd.Timestamp("2019-12-25").value // 10**9, pd.Timestamp("2023-01-05").value // 10**9, 1000
+    )
+    times = pd.Series(pd.to_datetime(seconds, unit="s", utc=True))
+    times.iloc[::50] = pd.NaT
+    return times
+
+
+@pytest.mark.parametrize("interval", ["D", "W", "M", "Y"])
+def test_floor_times_matches_periods(interval):
+    times = _times()
+    expected = times.dt.tz_localize(None).dt.to_period(PERIODS[interval]).dt.start_time
+
+    floored = pd.Series(floor_times(times, interval))
+    pd.testing.assert_series_equal(floored, expected, check_names=False)
+
+
+def test_weeks_start_on_monday():
+    # 2023-01-01 is a Sunday, 2023-01-02 a Monday.
+    times = pd.Series(pd.to_datetime(["2023-01-01 23:00", "2023-01-02 01:00", "2023-01-08"]))
+    assert list(pd.DatetimeIndex(floor_times(times, "W"))) == list(
+        pd.to_datetime(["2022-12-26", "2023-01-02", "2023-01-02"])
+    )
+
+
+def test_count_by_interval_is_dense():
+    df = pd.DataFrame(
+        {
+            "opened": pd.to_datetime(["2022-01-15", "2022-01-20", "2022-04-01"], utc=True),
+            "closed": pd.to_datetime(["2022-02-01", None, "2022-04-30"], utc=True),
+        }
+    )
+    counts = count_by_interval(df, ["opened", "closed"], "M")
+
+    assert counts["Date"].tolist() == list(pd.to_datetime(["2022-01-01", "2022-02-01", "2022-03-01", "2022-04-01"]))
+    assert counts["opened"].tolist() == [2, 0, 0, 1]
+    assert counts["closed"].tolist() == [0, 1, 0, 1]
+
+
+@pytest.mark.parametrize("interval", ["D", "W", "M", "Y"])
+def test_count_by_interval_matches_periods(interval):
+    times = _times()
+    counts = count_by_interval(pd.DataFrame({"t": times}), ["t"], interval)
+
+    periods = times.dt.tz_localize(None).dt.to_period(PERIODS[interval]).value_counts()
+    full = pd.period_range(periods.index.min(), periods.index.max(), freq=PERIODS[interval])
+    expected = periods.reindex(full, fill_value=0)
+
+    assert counts["Date"].tolist() == list(full.start_time)
+    assert counts["t"].tolist() == expected.tolist()
+    assert counts["t"].sum() == times.notna().sum()
+
+
+def test_count_by_interval_without_times():
+    df = pd.DataFrame({"t": pd.Series([pd.NaT, pd.NaT], dtype="datetime64[ns, UTC]")})
+    counts = count_by_interval(df, ["t"], "W")
+
+    assert counts.empty
+    assert list(counts.columns) == ["Date", "t"]
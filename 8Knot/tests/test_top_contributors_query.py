@@ -0,0 +1,56 @@
+import pandas as pd
+from cache_manager.sketches import top_n_sketches, top_values
+from queries.top_contributors_query import top_contributors_query
+
+
+def _counts(rows):
+    return pd.DataFrame(rows, columns=["repo", "cntrb_id", "actions"])
+
+
+def test_top_n_sketches_keep_n_and_sum_the_rest():
+    counts = _counts([(1, "a", 5), (1, "b", 9), (1, "c", 1), (1, "d", 5), (2, "a", 2)])
+    sketches = top_n_sketches(counts, ["repo"], ["cntrb_id"], "actions", 2)
+
+    kept = sketches[sketches["cntrb_id"].notna()]
+    # ties by value.
+    assert kept.values.tolist() == [[1, "b", 9], [1, "a", 5], [2, "a", 2]]
+
+    rest = sketches[sketches["cntrb_id"].isna()]
+    assert rest[["repo", "actions"]].values.tolist() == [[1, 6]]
+    # totals stay exact.
+    assert sketches.groupby("repo")["actions"].sum().to_dict() == {1: 20, 2: 2}
+
+
+def test_top_values_merges_sketches():
+    counts = _counts([(1, "a", 5), (1, "b", 4), (1, "c", 3), (2, "c", 4), (2, "b", 1), (2, "d", 1)])
+    sketches = top_n_sketches(counts, ["repo"], ["cntrb_id"], "actions", 2)
+
+    assert top_values(sketches, "cntrb_id", "actions", 2).values.tolist() == [["a", 5], ["b", 5]]
+
+    # counts of values in the remainder of a sketch are lower bounds, remainder rows aren't values.
+    assert top_values(counts, "cntrb_id", "actions", 10).values.tolist() == [["c", 7], ["a", 5], ["b", 5], ["d", 1]]
+    assert top_values(sketches, "cntrb_id", "actions", 10).values.tolist() == [["a", 5], ["b", 5], ["c", 4]]
+
+
+def test_top_contributors_query():
+    df = pd.DataFrame(
+        {
+            "id": 1,
+            "repo_name": "augur",
+            "Action": ["Commit"] * 4 + ["PR Opened"],
+            "cntrb_id": ["a", "a", "b", "None", "a"],
+            "login": ["al", "al", None, None, "al"],
+            "created_at": pd.to_datetime(
+                ["2022-01-01", "2022-01-02", "2022-01-03", "2022-02-01", "2022-01-04"], utc=True
+            ),
+        }
+    )
+    top = top_contributors_query(df)
+
+    jan = pd.Timestamp("2022-01-01", tz="UTC")
+    commits = top[(top["month"] == jan) & (top["Action"] == "Commit")]
+    # a contributor without a login is kept.
+    assert commits[["cntrb_id", "actions"]].values.tolist() == [["a", 2], ["b", 1]]
+    assert commits["login"].isna().tolist() == [False, True]
+    assert top["actions"].sum() == 5
+    assert top.loc[top["month"] == pd.Timestamp("2022-02-01", tz="UTC"), "cntrb_id"].tolist() == ["None"]
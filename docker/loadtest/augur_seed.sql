@@ -0,0 +1,213 @@
+/*
+Synthetic Augur database for load tests.
+
+Only the tables and columns that 8Knot reads are created. The explorer_* materialized
+views are plain tables here, filled directly, so MV_REFRESH_INTERVAL should be 0.
+
+psql variables (set by seed_augur.sh):
+    orgs          number of repo groups
+    repos         number of repos
+    years         years of history per repo
+    events        rows per repo per year in each activity table
+    contributors  number of distinct contributors
+*/
+
+CREATE SCHEMA IF NOT EXISTS augur_data;
+SET search_path TO augur_data;
+
+CREATE TABLE repo_groups (
+    repo_group_id bigint PRIMARY KEY,
+    rg_name text NOT NULL
+);
+
+CREATE TABLE repo (
+    repo_id bigint PRIMARY KEY,
+    repo_group_id bigint NOT NULL REFERENCES repo_groups,
+    repo_git text NOT NULL,
+    repo_name text NOT NULL
+);
+
+CREATE TABLE contributors (
+    cntrb_id uuid PRIMARY KEY,
+    cntrb_login text,
+    cntrb_company text
+);
+
+CREATE TABLE contributors_aliases (
+    cntrb_id uuid NOT NULL,
+    alias_email text NOT NULL
+);
+
+CREATE TABLE commits (
+    cmt_id bigserial PRIMARY KEY,
+    repo_id bigint NOT NULL,
+    cmt_commit_hash varchar(80) NOT NULL,
+    cmt_author_email text,
+    cmt_author_date varchar(10),
+    cmt_author_timestamp timestamptz,
+    cmt_committer_timestamp timestamptz,
+    cmt_added int,
+    cmt_removed int,
+    cmt_filename text,
+    cmt_ght_author_id uuid
+);
+
+CREATE TABLE issues (
+    issue_id bigint PRIMARY KEY,
+    repo_id bigint NOT NULL,
+    reporter_id uuid,
+    gh_issue_number bigint,
+    gh_issue_id bigint,
+    created_at timestamp,
+    closed_at timestamp,
+    pull_request bigint,
+    pull_request_id bigint
+);
+
+CREATE TABLE pull_requests (
+    pull_request_id bigint PRIMARY KEY,
+    repo_id bigint NOT NULL,
+    pr_src_number bigint,
+    pr_created_at timestamp,
+    pr_closed_at timestamp,
+    pr_merged_at timestamp,
+    pr_augur_contributor_id uuid
+);
+
+CREATE TABLE explorer_contributor_actions (
+    cntrb_id uuid,
+    created_at timestamptz,
+    repo_id bigint,
+    action text,
+    repo_name text,
+    login text,
+    rank bigint
+);
+
+CREATE TABLE explorer_commits (
+    repo_id bigint,
+    cmt_commit_hash varchar(80),
+    cmt_author_email text,
+    cmt_author_date varchar(10),
+    cmt_author_timestamp timestamptz,
+    cmt_committer_timestamp timestamptz,
+    files_changed bigint,
+    lines_added bigint,
+    lines_removed bigint
+);
+
+CREATE TABLE explorer_issue_assignments (
+    issue_id bigint,
+    id bigint,
+    created timestamp,
+    closed timestamp,
+    assign_date timestamp,
+    assignment_action text,
+    assignee uuid
+);
+
+CREATE TABLE explorer_pr_assignments (
+    pull_request_id bigint,
+    id bigint,
+    created timestamp,
+    closed timestamp,
+    assign_date timestamp,
+    assignment_action text,
+    assignee uuid
+);
+
+-- contributor ids are derived from an index so that tables can refer to them without a join.
+-- power(random(), 3) skews activity: a few contributors do most of the work.
+CREATE FUNCTION seed_cntrb(i int) RETURNS uuid LANGUAGE sql IMMUTABLE AS $$ SELECT md5('cntrb' || i)::uuid $$;
+CREATE FUNCTION seed_active_cntrb(n int) RETURNS int LANGUAGE sql VOLATILE AS $$ SELECT floor(n * power(random(), 3))::int $$;
+CREATE FUNCTION seed_ts(years int) RETURNS timestamp LANGUAGE sql VOLATILE AS
+    $$ SELECT (now() - interval '1 day' - random() * make_interval(years => years))::timestamp $$;
+
+INSERT INTO repo_groups
+SELECT g, 'loadtest-org-' || g
+FROM generate_series(1, :orgs) g;
+
+INSERT INTO repo
+SELECT r, 1 + r % :orgs, 'https://github.com/loadtest-org-' || (1 + r % :orgs) || '/repo-' || r, 'repo-' || r
+FROM generate_series(1, :repos) r;
+
+INSERT INTO contributors
+SELECT seed_cntrb(c), 'login' || c, (ARRAY['Red Hat', '@redhat', 'IBM', 'Microsoft', 'Google', NULL])[1 + c % 6]
+FROM generate_series(0, :contributors - 1) c;
+
+INSERT INTO contributors_aliases
+SELECT seed_cntrb(c), 'dev' || c || '@' || (ARRAY['gmail.com', 'redhat.com', 'ibm.com', 'apache.org'])[1 + c % 4]
+FROM generate_series(0, :contributors - 1) c;
+
+-- one row per file of each commit, 1 to 3 files.
+INSERT INTO commits (repo_id, cmt_commit_hash, cmt_author_email, cmt_author_date, cmt_author_timestamp,
+                     cmt_committer_timestamp, cmt_added, cmt_removed, cmt_filename, cmt_ght_author_id)
+SELECT c.repo_id, c.hash, 'dev' || c.author || '@gmail.com', to_char(c.ts, 'YYYY-MM-DD'), c.ts, c.ts,
+       floor(random() * 200)::int, floor(random() * 100)::int, 'file' || f || '.py', seed_cntrb(c.author)
+FROM (
+    SELECT 1 + i % :repos AS repo_id, md5('commit' || i) AS hash, seed_active_cntrb(:contributors) AS author,
+           seed_ts(:years) AS ts, i
+    FROM generate_series(1, :repos * :years * :events) i
+) c
+CROSS JOIN LATERAL generate_series(1, 1 + c.i % 3) f;
+
+INSERT INTO explorer_commits
+SELECT repo_id, cmt_commit_hash, min(cmt_author_email), min(cmt_author_date), min(cmt_author_timestamp),
+       min(cmt_committer_timestamp), count(*), sum(cmt_added), sum(cmt_removed)
+FROM commits
+GROUP BY repo_id, cmt_commit_hash;
+
+INSERT INTO issues
+SELECT i, 1 + i % :repos, seed_cntrb(seed_active_cntrb(:contributors)), i % 5000, 1000000000 + i, ts,
+       CASE WHEN random() < 0.75 THEN ts + random() * interval '200 days' END, NULL, NULL
+FROM (SELECT i, seed_ts(:years) AS ts FROM generate_series(1, :repos * :years * :events) i) s;
+
+INSERT INTO pull_requests
+SELECT i, 1 + i % :repos, i % 5000, ts, closed, CASE WHEN random() < 0.7 THEN closed END,
+       seed_cntrb(seed_active_cntrb(:contributors))
+FROM (
+    SELECT i, ts, CASE WHEN random() < 0.85 THEN ts + random() * interval '60 days' END AS closed
+    FROM (SELECT i, seed_ts(:years) AS ts FROM generate_series(1, :repos * :years * :events) i) s
+) p;
+
+INSERT INTO explorer_contributor_actions
+SELECT a.cntrb_id, a.created_at, a.repo_id, a.action, 'repo-' || a.repo_id, 'login' || a.c,
+       row_number() OVER (PARTITION BY a.cntrb_id, a.repo_id ORDER BY a.created_at DESC)
+FROM (
+    SELECT seed_cntrb(c) AS cntrb_id, c, seed_ts(:years) AS created_at, 1 + i % :repos AS repo_id,
+           (ARRAY['commit', 'commit', 'commit', 'issue_opened', 'issue_closed', 'issue_comment', 'issue_comment',
+                  'pull_request_open', 'pull_request_closed', 'pull_request_merged', 'pull_request_comment',
+                  'pull_request_review_COMMENTED', 'pull_request_review_APPROVED'])[1 + floor(random() * 13)::int] AS action
+    FROM (SELECT i, seed_active_cntrb(:contributors) AS c FROM generate_series(1, :repos * :years * :events) i) s
+) a;
+
+-- half of the issues/PRs get assigned, some of those get unassigned again.
+INSERT INTO explorer_issue_assignments
+SELECT i.issue_id, i.repo_id, i.created_at, i.closed_at, e.assign_date, e.action, e.assignee
+FROM issues i
+LEFT JOIN LATERAL (
+    SELECT i.created_at + random() * interval '30 days' AS assign_date, a.action,
+           seed_cntrb(seed_active_cntrb(:contributors)) AS assignee
+    FROM unnest(ARRAY['assigned', 'unassigned']) WITH ORDINALITY a(action, n)
+    WHERE i.issue_id % 2 = 0 AND (a.n = 1 OR i.issue_id % 6 = 0)
+) e ON true;
+
+INSERT INTO explorer_pr_assignments
+SELECT p.pull_request_id, p.repo_id, p.pr_created_at, p.pr_closed_at, e.assign_date, e.action, e.assignee
+FROM pull_requests p
+LEFT JOIN LATERAL (
+    SELECT p.pr_created_at + random() * interval '30 days' AS assign_date, a.action,
+           seed_cntrb(seed_active_cntrb(:contributors)) AS assignee
+    FROM unnest(ARRAY['assigned', 'unassigned']) WITH ORDINALITY a(action, n)
+    WHERE p.pull_request_id % 2 = 0 AND (a.n = 1 OR p.pull_request_id % 6 = 0)
+) e ON true;
+
+CREATE INDEX ON commits (repo_id);
+CREATE INDEX ON issues (repo_id);
+CREATE INDEX ON pull_requests (repo_id);
+CREATE INDEX ON explorer_commits (repo_id);
+CREATE INDEX ON explorer_contributor_actions (repo_id);
+CREATE INDEX ON explorer_issue_assignments (id);
+CREATE INDEX ON explorer_pr_assignments (id);
+
+ANALYZE;
@@ -0,0 +1,18 @@
+#!/bin/sh
+# Seeds the load-test database on the first start of the augur-db container.
+# Scale is set with SEED_ORGS, SEED_REPOS, SEED_YEARS and SEED_EVENTS (rows per repo per year).
+set -e
+
+SEED_ORGS=${SEED_ORGS:-20}
+SEED_REPOS=${SEED_REPOS:-200}
+SEED_YEARS=${SEED_YEARS:-3}
+SEED_EVENTS=${SEED_EVENTS:-500}
+SEED_CONTRIBUTORS=$(( SEED_REPOS * SEED_EVENTS / 20 + 50 ))
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" \
+    -v orgs="$SEED_ORGS" \
+    -v repos="$SEED_REPOS" \
+    -v years="$SEED_YEARS" \
+    -v events="$SEED_EVENTS" \
+    -v contributors="$SEED_CONTRIBUTORS" \
+    -f /seed/augur_seed.sql
@@ -0,0 +1,19 @@
+/* This is the SQL query that populates the explorer_commits materialized view*/
+/* The commits table has one row per file of a commit, this view has one row per commit of a repo. */
+/* The author and the timestamps are the same on every file of a commit. */
+
+SELECT
+    c.repo_id,
+    c.cmt_commit_hash,
+    min(c.cmt_author_email) AS cmt_author_email,
+    min(c.cmt_author_date) AS cmt_author_date,
+    min(c.cmt_author_timestamp) AS cmt_author_timestamp,
+    min(c.cmt_committer_timestamp) AS cmt_committer_timestamp,
+    count(*) AS files_changed,
+    sum(c.cmt_added) AS lines_added,
+    sum(c.cmt_removed) AS lines_removed
+FROM
+    augur_data.commits c
+GROUP BY
+    c.repo_id,
+    c.cmt_commit_hash